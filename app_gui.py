@@ -8,9 +8,7 @@ from pathlib import Path
 from time import perf_counter
 from tkinter import filedialog, messagebox, ttk
 
-from krx_backtest import BacktestConfig, create_market_comparison_report, write_backtest_report
 from app_runtime import CONFIG_PATH, LOG_PATH, load_config, save_config, setup_file_logging
-from krx_value_service import get_tatsuro_small_mid_value_top10
 
 DIV_POLICIES = ("zero", "exclude")
 
@@ -40,6 +38,15 @@ DEFAULT_CAP_MAX_EOK = 10000
 DEFAULT_TOP_N = 10
 DEFAULT_PER_MAX = ""
 DEFAULT_PBR_MAX = ""
+DEFAULT_QUERY_DEADLINE_SEC = 8.0
+
+
+def _cache_label(stats: dict[str, int]) -> str:
+    if stats.get("stale"):
+        return "지연-이전 스냅샷"
+    if stats.get("cache_hit"):
+        return "캐시사용"
+    return "사전계산" if stats.get("history_hit") else "신규조회"
 
 
 class KrxValueApp(tk.Tk):
@@ -53,6 +60,10 @@ class KrxValueApp(tk.Tk):
         except Exception as exc:
             self._config = {}
             self._logger.exception("설정값 로드 실패: %s", exc)
+        try:
+            self._query_deadline_sec = float(self._config.get("query_deadline_sec", DEFAULT_QUERY_DEADLINE_SEC))
+        except (TypeError, ValueError):
+            self._query_deadline_sec = DEFAULT_QUERY_DEADLINE_SEC
 
         self.title("Tatsuro KRX 중소형 가치주")
         self.geometry("1220x760")
@@ -84,6 +95,20 @@ class KrxValueApp(tk.Tk):
         self._build_ui()
         self.protocol("WM_DELETE_WINDOW", self._on_close)
         self._logger.info("앱 시작 | config=%s | log=%s", CONFIG_PATH, LOG_PATH)
+        self.after(100, self._start_preload)
+
+    def _start_preload(self):
+        threading.Thread(target=self._preload_worker, daemon=True).start()
+
+    def _preload_worker(self):
+        started_at = perf_counter()
+        try:
+            import krx_backtest  # noqa: F401
+            import krx_value_service  # noqa: F401
+        except Exception as exc:
+            self._logger.exception("데이터 모듈 사전 로드 실패: %s", exc)
+            return
+        self._logger.info("데이터 모듈 사전 로드 완료 | %.2fs", perf_counter() - started_at)
 
     def _build_ui(self):
         top_frame = ttk.Frame(self, padding=12)
@@ -100,7 +125,7 @@ class KrxValueApp(tk.Tk):
         self.market_combo = ttk.Combobox(
             top_frame,
             textvariable=self.market_var,
-            values=("KOSPI", "KOSDAQ"),
+            values=("KOSPI", "KOSDAQ", "ALL"),
             state="readonly",
             width=10,
         )
@@ -290,6 +315,10 @@ class KrxValueApp(tk.Tk):
 
     def _fetch_data_worker(self):
         try:
+            import krx_fetch
+            from krx_value_service import get_tatsuro_small_mid_value_top10
+
+            fetch_before = krx_fetch.get_fetch_stats()
             cap_min, cap_max, top_n, per_max, pbr_max, div_policy = self._query_params
             df, used_date, stats, logs = get_tatsuro_small_mid_value_top10(
                 market=self.market_var.get(),
@@ -300,6 +329,13 @@ class KrxValueApp(tk.Tk):
                 per_max=per_max,
                 pbr_max=pbr_max,
                 div_policy=div_policy,
+                deadline_sec=self._query_deadline_sec if self._query_deadline_sec > 0 else None,
+            )
+            fetch_after = krx_fetch.get_fetch_stats()
+            stats = dict(
+                stats,
+                upstream_calls=fetch_after["calls"] - fetch_before["calls"],
+                disk_cache_hits=fetch_after["cache_hits"] - fetch_before["cache_hits"],
             )
             elapsed = perf_counter() - self._fetch_started_at
             self.after(0, self._render_table, df, used_date, stats, logs, elapsed)
@@ -313,7 +349,7 @@ class KrxValueApp(tk.Tk):
         self.result_header_var.set(f"결과 헤더 | 시장: {self.market_var.get()} | 기준일: {used_date}")
 
         if df.empty:
-            cache_text = "캐시사용" if stats.get("cache_hit") else "신규조회"
+            cache_text = _cache_label(stats)
             self.status_var.set(
                 f"조건 통과 종목이 없습니다 | 전체: {stats['total']} | 조건통과: {stats['filtered']} | 최종: 0 | {cache_text} | {elapsed_sec:.2f}s"
             )
@@ -323,11 +359,12 @@ class KrxValueApp(tk.Tk):
             return
 
         for _, row in df.iterrows():
+            name = f"{row['종목명']} ({row['시장']})" if "시장" in df.columns else row["종목명"]
             self.tree.insert(
                 "",
                 "end",
                 values=(
-                    row["종목명"],
+                    name,
                     f"{row['시가총액(조)']:.3f}",
                     f"{row['PER']:.2f}" if row["PER"] == row["PER"] else "-",
                     f"{row['PBR']:.2f}" if row["PBR"] == row["PBR"] else "-",
@@ -339,13 +376,30 @@ class KrxValueApp(tk.Tk):
                 ),
             )
 
-        cache_text = "캐시사용" if stats.get("cache_hit") else "신규조회"
+        cache_text = _cache_label(stats)
         backtrack_summary = logs[-1] if logs else "백트래킹 로그 없음"
         self.status_var.set(
             f"조회 완료 | 전체: {stats['total']} | 조건통과: {stats['filtered']} | 최종: {stats['final']} | {cache_text} | {elapsed_sec:.2f}s | {backtrack_summary}"
         )
         self._save_current_config()
-        self._logger.info("목록 조회 완료 | final=%s | cache=%s | used_date=%s", stats["final"], cache_text, used_date)
+        self._logger.info(
+            "목록 조회 완료 | final=%s | cache=%s | used_date=%s",
+            stats["final"],
+            cache_text,
+            used_date,
+            extra={
+                "event": "screen_done",
+                "elapsed_sec": round(elapsed_sec, 3),
+                "used_date": used_date,
+                "total": stats["total"],
+                "filtered": stats["filtered"],
+                "final": stats["final"],
+                "cache_hit": stats.get("cache_hit", 0),
+                "stale": stats.get("stale", 0),
+                "disk_cache_hits": stats.get("disk_cache_hits", 0),
+                "upstream_calls": stats.get("upstream_calls", 0),
+            },
+        )
         self.fetch_button.config(state="normal")
         self.reset_button.config(state="normal")
         self.save_button.config(state="normal")
@@ -355,16 +409,16 @@ class KrxValueApp(tk.Tk):
             cap_min, cap_max, top_n, per_max, pbr_max, div_policy = self._validate_inputs()
             start_date = self._parse_date(self.backtest_start_var.get())
             end_date = self._parse_date(self.backtest_end_var.get())
-            self._backtest_config = BacktestConfig(
-                start_date=start_date,
-                end_date=end_date,
-                top_n=top_n,
-                cap_min=cap_min,
-                cap_max=cap_max,
-                per_max=per_max,
-                pbr_max=pbr_max,
-                div_policy=div_policy,
-            )
+            self._backtest_params = {
+                "start_date": start_date,
+                "end_date": end_date,
+                "top_n": top_n,
+                "cap_min": cap_min,
+                "cap_max": cap_max,
+                "per_max": per_max,
+                "pbr_max": pbr_max,
+                "div_policy": div_policy,
+            }
         except ValueError as exc:
             messagebox.showwarning("입력값 확인", str(exc))
             return
@@ -385,7 +439,10 @@ class KrxValueApp(tk.Tk):
 
     def _run_backtest_worker(self, markets: tuple[str, ...]):
         try:
-            summary_df, market_results = create_market_comparison_report(config=self._backtest_config, markets=markets)
+            from krx_backtest import BacktestConfig, create_market_comparison_report
+
+            config = BacktestConfig(**self._backtest_params)
+            summary_df, market_results = create_market_comparison_report(config=config, markets=markets)
             elapsed = perf_counter() - self._backtest_started_at
             self.after(0, self._render_backtest_result, summary_df, market_results, elapsed)
         except Exception as exc:
@@ -415,7 +472,11 @@ class KrxValueApp(tk.Tk):
         self.backtest_save_button.config(state="normal")
         self.status_var.set(f"백테스트 완료 | 시장 수: {len(summary_df)} | 소요: {elapsed_sec:.2f}s")
         self._save_current_config()
-        self._logger.info("백테스트 완료 | markets=%s", len(summary_df))
+        self._logger.info(
+            "백테스트 완료 | markets=%s",
+            len(summary_df),
+            extra={"event": "backtest_done", "elapsed_sec": round(elapsed_sec, 3), "markets": len(summary_df)},
+        )
 
     def save_backtest_report(self):
         if self._latest_backtest_summary_df is None or self._latest_backtest_summary_df.empty:
@@ -428,6 +489,8 @@ class KrxValueApp(tk.Tk):
             return
 
         try:
+            from krx_backtest import write_backtest_report
+
             report_path = write_backtest_report(
                 output_dir=output_dir,
                 summary_df=self._latest_backtest_summary_df,
@@ -495,6 +558,7 @@ class KrxValueApp(tk.Tk):
             "backtest_start_date": self.backtest_start_var.get().strip(),
             "backtest_end_date": self.backtest_end_var.get().strip(),
             "backtest_scope": self.backtest_scope_var.get().strip(),
+            "query_deadline_sec": self._query_deadline_sec,
         }
 
     def _save_current_config(self):
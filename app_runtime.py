@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import atexit
+import copy
 import json
 import logging
+import os
+import queue
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 APP_HOME_DIR = Path.home() / ".tatsurolist-krx"
 CONFIG_PATH = APP_HOME_DIR / "config.json"
 LOG_PATH = APP_HOME_DIR / "app.log"
+CACHE_DIR = APP_HOME_DIR / "cache"
+
+LOG_FORMAT_ENV_VAR = "TATSUROLIST_LOG_FORMAT"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+LOG_TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
 
 DEFAULT_CONFIG: dict[str, Any] = {
     "market": "KOSPI",
@@ -22,27 +33,99 @@ DEFAULT_CONFIG: dict[str, Any] = {
     "backtest_start_date": "",
     "backtest_end_date": "",
     "backtest_scope": "all",
+    "query_deadline_sec": 8.0,
 }
 
 
-def setup_file_logging(log_path: Path = LOG_PATH) -> Path:
+_RESERVED_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+_LISTENERS: dict[str, tuple[QueueHandler, QueueListener]] = {}
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_RECORD_FIELDS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RecordQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _build_file_handler(log_path: Path, max_bytes: int, backup_count: int, rotate_when: Optional[str]) -> logging.Handler:
+    if rotate_when:
+        return TimedRotatingFileHandler(log_path, when=rotate_when, backupCount=backup_count, encoding="utf-8")
+    return RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+
+def setup_file_logging(
+    log_path: Path = LOG_PATH,
+    json_format: Optional[bool] = None,
+    max_bytes: int = LOG_MAX_BYTES,
+    backup_count: int = LOG_BACKUP_COUNT,
+    rotate_when: Optional[str] = None,
+) -> Path:
     log_path.parent.mkdir(parents=True, exist_ok=True)
 
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
     abs_log_path = str(log_path.resolve())
-    for handler in logger.handlers:
-        if isinstance(handler, logging.FileHandler) and handler.baseFilename == abs_log_path:
-            return log_path
+    if abs_log_path in _LISTENERS:
+        return log_path
+
+    if json_format is None:
+        json_format = os.environ.get(LOG_FORMAT_ENV_VAR, "").lower() == "json"
+
+    file_handler = _build_file_handler(log_path, max_bytes, backup_count, rotate_when)
+    file_handler.setFormatter(JsonLineFormatter() if json_format else logging.Formatter(LOG_TEXT_FORMAT))
 
-    file_handler = logging.FileHandler(log_path, encoding="utf-8")
-    file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
-    logger.addHandler(file_handler)
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = RecordQueueHandler(log_queue)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    logger.addHandler(queue_handler)
+    _LISTENERS[abs_log_path] = (queue_handler, listener)
 
     return log_path
 
 
+def shutdown_file_logging(log_path: Optional[Path] = None) -> None:
+    targets = [str(log_path.resolve())] if log_path is not None else list(_LISTENERS)
+    logger = logging.getLogger()
+    for abs_log_path in targets:
+        entry = _LISTENERS.pop(abs_log_path, None)
+        if entry is None:
+            continue
+        queue_handler, listener = entry
+        logger.removeHandler(queue_handler)
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(shutdown_file_logging)
+
+
 def load_config(config_path: Path = CONFIG_PATH) -> dict[str, Any]:
     if not config_path.exists():
         return dict(DEFAULT_CONFIG)
@@ -1,28 +1,129 @@
 from __future__ import annotations
 
 import argparse
-
-from krx_backtest import BacktestConfig, create_market_comparison_report, write_backtest_report
+import logging
+from pathlib import Path
+from time import perf_counter
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="KRX 월간 리밸런싱 백테스트 실행")
-    parser.add_argument("--start-date", required=True, help="시작일 (YYYYMMDD 또는 YYYY-MM-DD)")
-    parser.add_argument("--end-date", required=True, help="종료일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    parser.add_argument("--start-date", default=None, help="시작일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    parser.add_argument("--end-date", default=None, help="종료일 (YYYYMMDD 또는 YYYY-MM-DD)")
     parser.add_argument("--top-n", type=int, default=10)
     parser.add_argument("--cap-min", type=int, default=500_000_000_000)
     parser.add_argument("--cap-max", type=int, default=1_000_000_000_000)
     parser.add_argument("--per-max", type=float, default=None)
     parser.add_argument("--pbr-max", type=float, default=None)
     parser.add_argument("--div-policy", choices=("zero", "exclude"), default="zero")
+    parser.add_argument(
+        "--rebalance-freq",
+        choices=("D", "W", "2W", "M", "Q"),
+        default="M",
+        help="리밸런싱 주기(D: 매 영업일, W: 주간, 2W: 격주, M: 월말, Q: 분기말). 영업일 기준으로 보정",
+    )
+    parser.add_argument(
+        "--score-expression",
+        default=None,
+        help="점수식(기본: inv(PER) + inv(PBR) + DIV / 100). 사용 가능 함수: inv, clip, rank, zscore, log, abs",
+    )
+    parser.add_argument("--rebalance-dates", default=None, help="사용자 지정 리밸런싱일 목록(쉼표 구분, 지정 시 주기 무시)")
+    parser.add_argument("--commission-rate", type=float, default=0.0, help="매수/매도 수수료율(거래대금 대비, 예: 0.00015)")
+    parser.add_argument("--tax-rate", type=float, default=0.0, help="매도 거래세율(예: 0.0018)")
+    parser.add_argument("--slippage-rate", type=float, default=0.0, help="매수/매도 슬리피지율")
     parser.add_argument("--output-dir", default="reports")
+    parser.add_argument("--rolling-window", type=int, default=None, help="롤링 윈도우 길이(리밸런싱 기간 수, 선택)")
+    parser.add_argument("--rolling-step", type=int, default=1, help="롤링 윈도우 이동 간격(기간 수)")
+    parser.add_argument("--bootstrap-samples", type=int, default=0, help="초과수익 부트스트랩 표본 수(0이면 생략)")
+    parser.add_argument("--block-size", type=int, default=1, help="블록 부트스트랩 블록 길이(1이면 단순 부트스트랩)")
+    parser.add_argument("--seed", type=int, default=None, help="부트스트랩 난수 시드")
+    parser.add_argument("--rate-limit", type=float, default=None, help="KRX 초당 요청 수 상한(프로세스 전체)")
+    parser.add_argument("--pool-size", type=int, default=None, help="KRX keep-alive 연결 풀 크기")
+    parser.add_argument("--cache-dir", default=None, help="데이터 캐시 디렉터리(기본: ~/.tatsurolist-krx/cache)")
+    parser.add_argument("--offline", action="store_true", help="KRX에 접속하지 않고 로컬 캐시만 사용")
+    parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="단계별 메모리 사용량(tracemalloc)과 캐시 크기를 측정해 memory_profile.json으로 저장",
+    )
+    parser.add_argument("--log-file", default=None, help="실행 로그 파일 경로(크기 기준 회전, 백그라운드 스레드 기록)")
+    parser.add_argument(
+        "--log-format",
+        choices=("text", "json"),
+        default="text",
+        help="로그 형식(json: 소요 시간/캐시 적중/호출 수 필드를 포함한 JSON Lines)",
+    )
+    parser.add_argument("--store-dir", default=None, help="실행 결과를 누적 저장할 Parquet 저장소 경로(선택)")
+    parser.add_argument(
+        "--sensitivity-cap-bands",
+        default=None,
+        help="시총 구간 민감도 분석(억원 단위, 예: 1000-3000,3000-5000,5000-10000). 지정 시 구간 × Top N 히트맵만 생성",
+    )
+    parser.add_argument("--sensitivity-top-n", default="5,10,20", help="민감도 분석 Top N 목록(쉼표 구분)")
+    parser.add_argument("--manifest", default=None, help="배치 작업 매니페스트(JSON) 경로. 지정 시 매니페스트의 작업을 일괄 실행")
+    parser.add_argument("--workers", type=int, default=None, help="배치 실행 프로세스 수(매니페스트 값보다 우선)")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="기간별 결과를 계산 즉시 output-dir의 월별 CSV에 추가 기록(중단 후 같은 설정으로 다시 실행하면 이어서 계산)",
+    )
+    parser.add_argument("--no-resume", action="store_true", help="배치/스트리밍 실행 시 완료된 작업/기간도 다시 실행")
     return parser
 
 
+def run_manifest(args: argparse.Namespace) -> None:
+    from krx_batch import load_manifest, run_batch
+
+    manifest = load_manifest(args.manifest)
+    if args.rate_limit is not None:
+        manifest["rate_limit"] = args.rate_limit
+
+    def report_progress(name: str, entry: dict) -> None:
+        detail = entry.get("report") if entry["status"] == "done" else entry.get("error")
+        print(f"[{entry['status']}] {name} ({entry['elapsed_sec']:.1f}s) {detail}")
+
+    index = run_batch(manifest, workers=args.workers, resume=not args.no_resume, on_job_done=report_progress)
+    done = sum(1 for entry in index.values() if entry.get("status") == "done")
+    print("[완료] 배치 백테스트 실행")
+    print(f"- jobs: {done}/{len(manifest['jobs'])} 완료")
+    print(f"- index: {Path(manifest['output_root']) / 'batch_index.json'}")
+
+
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
+    import krx_cache
+    import krx_fetch
+
+    if args.log_file:
+        from app_runtime import setup_file_logging
+
+        setup_file_logging(Path(args.log_file), json_format=args.log_format == "json")
+    if args.cache_dir:
+        krx_cache.configure_cache_dir(args.cache_dir)
+    if args.offline:
+        krx_fetch.configure_fetch(offline=True)
+    if args.memory_profile:
+        import krx_memory
+
+        krx_memory.configure_memory_profiling(True)
+    if args.manifest:
+        run_manifest(args)
+        return
+    if not args.start_date or not args.end_date:
+        parser.error("--start-date and --end-date are required unless --manifest is given")
+
+    from krx_backtest import (
+        BacktestConfig,
+        CostModel,
+        compute_rolling_window_metrics,
+        create_market_comparison_report,
+        write_backtest_report,
+    )
+
+    krx_fetch.configure_fetch(rate_per_sec=args.rate_limit, pool_size=args.pool_size)
+
     config = BacktestConfig(
         start_date=args.start_date,
         end_date=args.end_date,
@@ -32,14 +133,131 @@ def main() -> None:
         per_max=args.per_max,
         pbr_max=args.pbr_max,
         div_policy=args.div_policy,
+        score_expression=args.score_expression,
+        rebalance_freq=args.rebalance_freq,
+        rebalance_dates=[d for d in args.rebalance_dates.split(",") if d.strip()] if args.rebalance_dates else None,
+        cost_model=CostModel(
+            commission_rate=args.commission_rate,
+            tax_rate=args.tax_rate,
+            slippage_rate=args.slippage_rate,
+        ),
     )
 
-    summary_df, market_results = create_market_comparison_report(config=config)
-    report_path = write_backtest_report(args.output_dir, summary_df, market_results)
+    if args.sensitivity_cap_bands:
+        from krx_sensitivity import parse_cap_bands, run_sensitivity_analysis, write_sensitivity_report
+
+        cap_bands = parse_cap_bands(args.sensitivity_cap_bands)
+        top_ns = [int(n) for n in args.sensitivity_top_n.split(",") if n.strip()]
+        market_grids = {
+            market: run_sensitivity_analysis(market, config, cap_bands, top_ns) for market in ("KOSPI", "KOSDAQ")
+        }
+        report_path = write_sensitivity_report(args.output_dir, market_grids)
+        print("[완료] 시총 구간 × Top N 민감도 분석")
+        print(f"- report: {report_path}")
+        print(f"- grid: {len(cap_bands)} bands x {len(top_ns)} top-n")
+        return
+
+    started_at = perf_counter()
+    if args.stream:
+        from krx_backtest import run_streaming_backtest
+
+        def print_period(row: dict, metrics: dict[str, float]) -> None:
+            print(
+                f"[period] {row['market']} {row['rebalance_date']}~{row['next_rebalance_date']} | "
+                f"return {row['portfolio_return'] * 100:.2f}% | cumulative {row['portfolio_cumulative'] * 100:.2f}% | "
+                f"mdd {metrics['portfolio_mdd'] * 100:.2f}% | sharpe {metrics['portfolio_sharpe']:.2f} | "
+                f"hit {metrics['hit_rate'] * 100:.0f}%"
+            )
+
+        summary_df, market_results = run_streaming_backtest(
+            args.output_dir, config, resume=not args.no_resume, on_metrics=print_period
+        )
+    else:
+        summary_df, market_results = create_market_comparison_report(config=config)
+    if args.store_dir:
+        from krx_results_store import append_backtest_run, render_backtest_report
+
+        run_id = append_backtest_run(args.store_dir, config, summary_df, market_results)
+        report_path = render_backtest_report(
+            args.store_dir,
+            run_id,
+            args.output_dir,
+            rolling_window=args.rolling_window,
+            rolling_step=args.rolling_step,
+            bootstrap_samples=args.bootstrap_samples,
+            block_size=args.block_size,
+            seed=args.seed,
+        )
+    else:
+        rolling_results = None
+        if args.rolling_window:
+            rolling_results = {
+                market: compute_rolling_window_metrics(market_df, args.rolling_window, args.rolling_step)
+                for market, market_df in market_results.items()
+                if not market_df.empty
+            }
+        significance_df = None
+        if args.bootstrap_samples:
+            from krx_bootstrap import create_significance_report
+
+            significance_df = create_significance_report(
+                market_results,
+                n_samples=args.bootstrap_samples,
+                block_size=args.block_size,
+                seed=args.seed,
+            )
+        report_path = write_backtest_report(
+            args.output_dir,
+            summary_df,
+            market_results,
+            rolling_results=rolling_results,
+            significance_df=significance_df,
+        )
 
     print("[완료] 백테스트 리포트 생성")
     print(f"- report: {report_path}")
+    if args.store_dir:
+        print(f"- run_id: {run_id}")
     print(f"- summary rows: {len(summary_df)}")
+    fetch_stats = krx_fetch.get_fetch_stats()
+    logging.getLogger(__name__).info(
+        "백테스트 완료 | markets=%s | elapsed=%.2fs",
+        len(summary_df),
+        perf_counter() - started_at,
+        extra={
+            "event": "backtest_done",
+            "elapsed_sec": round(perf_counter() - started_at, 3),
+            "markets": len(summary_df),
+            "upstream_calls": fetch_stats["calls"],
+            "upstream_errors": fetch_stats["errors"],
+            "cache_hits": fetch_stats["cache_hits"],
+            "queue_wait_sec": round(fetch_stats["queue_wait_sec"], 3),
+        },
+    )
+    print(
+        f"- upstream calls: {fetch_stats['calls']} (errors {fetch_stats['errors']}) | "
+        f"queue wait: total {fetch_stats['queue_wait_sec']:.2f}s, max {fetch_stats['max_queue_wait_sec']:.2f}s"
+    )
+    if args.memory_profile:
+        write_memory_profile(args.output_dir)
+
+
+def write_memory_profile(output_dir: str) -> None:
+    import json
+
+    import krx_memory
+    from krx_backtest import backtest_caches
+
+    memory_stats = krx_memory.get_memory_stats(caches=backtest_caches())
+    profile_path = Path(output_dir) / "memory_profile.json"
+    profile_path.parent.mkdir(parents=True, exist_ok=True)
+    profile_path.write_text(json.dumps(memory_stats, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"- memory: traced peak {memory_stats['traced_peak_kb'] / 1024:.1f} MiB | max RSS {memory_stats['max_rss_kb']} KB")
+    for name, entry in sorted(memory_stats["stages"].items(), key=lambda item: -item[1]["peak_kb"])[:5]:
+        print(f"  - stage {name}: peak {entry['peak_kb']:.1f} KB ({entry['calls']} calls)")
+    for name, usage in memory_stats["caches"].items():
+        print(f"  - cache {name}: {usage['entries']} entries, {usage['size_kb']:.1f} KB")
+    print(f"- memory profile: {profile_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+from time import perf_counter
+from typing import Optional
+
+PROJECT_DIR = Path(__file__).resolve().parent
+
+FIRST_WINDOW_SNIPPET = """
+from time import perf_counter
+started_at = perf_counter()
+import app_gui
+app = app_gui.KrxValueApp()
+app.update()
+print(f"{perf_counter() - started_at:.6f}")
+app.destroy()
+"""
+
+
+def parse_importtime(stderr: str) -> list[dict[str, object]]:
+    entries: list[dict[str, object]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            entries.append(
+                {
+                    "module": name.strip(),
+                    "depth": (len(name) - len(name.lstrip())) // 2,
+                    "self_ms": int(self_us) / 1000,
+                    "cumulative_ms": int(cumulative_us) / 1000,
+                }
+            )
+        except ValueError:
+            continue
+    return entries
+
+
+def _run(args: list[str]) -> tuple[float, subprocess.CompletedProcess]:
+    started_at = perf_counter()
+    completed = subprocess.run(args, cwd=PROJECT_DIR, capture_output=True, text=True)
+    return perf_counter() - started_at, completed
+
+
+def measure_import(module: str) -> tuple[float, list[dict[str, object]]]:
+    elapsed, completed = _run([sys.executable, "-X", "importtime", "-c", f"import {module}"])
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr}")
+    return elapsed, parse_importtime(completed.stderr)
+
+
+def measure_command(args: list[str]) -> float:
+    elapsed, completed = _run([sys.executable, *args])
+    if completed.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{completed.stderr}")
+    return elapsed
+
+
+def measure_first_window() -> Optional[float]:
+    _, completed = _run([sys.executable, "-c", FIRST_WINDOW_SNIPPET])
+    if completed.returncode != 0:
+        return None
+    try:
+        return float(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return None
+
+
+def format_import_breakdown(entries: list[dict[str, object]], top: int = 15, max_depth: int = 1) -> list[str]:
+    top_level = [entry for entry in entries if entry["depth"] <= max_depth]
+    ranked = sorted(top_level, key=lambda entry: entry["cumulative_ms"], reverse=True)[:top]
+    lines = [f"  {'module':<40} {'cumulative_ms':>14} {'self_ms':>10}"]
+    for entry in ranked:
+        lines.append(f"  {entry['module']:<40} {entry['cumulative_ms']:>14.1f} {entry['self_ms']:>10.1f}")
+    return lines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="GUI/CLI 시작 시간 및 import 시간 측정")
+    parser.add_argument("--modules", nargs="+", default=["app_gui", "backtest_cli", "krx_value_service", "krx_backtest"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", default=None, help="결과를 저장할 텍스트 파일 경로(선택)")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    lines = ["# startup benchmark", ""]
+    help_elapsed = measure_command(["backtest_cli.py", "--help"])
+    lines.append(f"backtest_cli.py --help: {help_elapsed:.3f}s")
+
+    window_elapsed = measure_first_window()
+    if window_elapsed is None:
+        lines.append("app_gui first window: 측정 불가(디스플레이 없음)")
+    else:
+        lines.append(f"app_gui first window: {window_elapsed:.3f}s")
+
+    for module in args.modules:
+        elapsed, entries = measure_import(module)
+        lines.extend(["", f"import {module}: {elapsed:.3f}s (process)"])
+        lines.extend(format_import_breakdown(entries, top=args.top))
+
+    text = "\n".join(lines)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="KRX 데이터 캐시 번들 내보내기/가져오기(오프라인 실행용)")
+    parser.add_argument("--cache-dir", default=None, help="캐시 디렉터리(기본: ~/.tatsurolist-krx/cache)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="기간 내 캐시를 압축 번들(.tar.gz)로 내보내기")
+    export_parser.add_argument("bundle", help="생성할 번들 파일 경로")
+    export_parser.add_argument("--start-date", default=None, help="시작일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    export_parser.add_argument("--end-date", default=None, help="종료일 (YYYYMMDD 또는 YYYY-MM-DD)")
+
+    import_parser = subparsers.add_parser("import", help="번들의 체크섬 검증 후 캐시에 가져오기")
+    import_parser.add_argument("bundle", help="가져올 번들 파일 경로")
+    import_parser.add_argument("--overwrite", action="store_true", help="이미 있는 캐시 파일도 덮어쓰기")
+
+    info_parser = subparsers.add_parser("info", help="번들 매니페스트 요약 출력")
+    info_parser.add_argument("bundle", help="번들 파일 경로")
+
+    negative_parser = subparsers.add_parser("negative", help="음성 캐시(빈 결과/조회 실패 기록) 조회/삭제")
+    negative_parser.add_argument("action", choices=("list", "clear"))
+    negative_parser.add_argument("--kind", default=None, help="대상 종류(snapshot, close_snapshot, ticker_range 등, 기본: 전체)")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+
+    if args.command == "negative":
+        import krx_cache
+
+        if args.cache_dir:
+            krx_cache.configure_cache_dir(args.cache_dir)
+        negative_cache = krx_cache.get_negative_cache()
+        if args.action == "clear":
+            removed = negative_cache.invalidate(args.kind)
+            print(f"[완료] 음성 캐시 삭제: {removed}건")
+            return
+        for key, entry in sorted(negative_cache.entries().items()):
+            if args.kind is None or key.startswith(f"{args.kind}|"):
+                print(f"{key} | {entry['reason']} | {entry['recorded_at']} | 만료: {entry.get('expires_at') or '-'}")
+        return
+
+    from krx_cache_bundle import export_cache_bundle, import_cache_bundle, read_bundle_manifest
+
+    if args.command == "export":
+        result = export_cache_bundle(args.bundle, args.start_date, args.end_date, cache_dir=args.cache_dir)
+        print("[완료] 캐시 번들 생성")
+        print(f"- bundle: {result['path']}")
+        print(f"- files: {result['files']} ({result['bytes'] / 1_048_576:.1f} MiB)")
+        print(f"- negative cache entries: {result['negative_entries']}")
+    elif args.command == "import":
+        result = import_cache_bundle(args.bundle, cache_dir=args.cache_dir, overwrite=args.overwrite)
+        print("[완료] 캐시 번들 가져오기")
+        print(f"- period: {result['start_date'] or '-'} ~ {result['end_date'] or '-'}")
+        print(f"- imported: {result['imported']} | skipped(existing): {result['skipped']}")
+        print(f"- negative cache entries: {result['negative_entries']}")
+    else:
+        manifest = read_bundle_manifest(args.bundle)
+        counts: dict[str, int] = {}
+        for name in manifest["files"]:
+            kind = name.split("/")[1] if "/" in name else name
+            counts[kind] = counts.get(kind, 0) + 1
+        print(f"created_at: {manifest['created_at']}")
+        print(f"period: {manifest['start_date'] or '-'} ~ {manifest['end_date'] or '-'}")
+        for kind, count in sorted(counts.items()):
+            print(f"- {kind}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from time import perf_counter
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="거래일별 Top N 순위 사전 계산 저장소 생성/조회")
+    parser.add_argument("--cache-dir", default=None, help="데이터 캐시 디렉터리(기본: ~/.tatsurolist-krx/cache)")
+    parser.add_argument("--history-dir", default=None, help="사전 계산 저장소 경로(기본: <cache-dir>/history)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    precompute_parser = subparsers.add_parser("build", help="기간 내 모든 거래일 × 시장 × 표준 프로필 순위 사전 계산")
+    precompute_parser.add_argument("--start-date", default=None, help="시작일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    precompute_parser.add_argument("--end-date", default=None, help="종료일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    precompute_parser.add_argument("--dates", default=None, help="날짜 목록(쉼표 구분, 지정 시 기간 무시)")
+    precompute_parser.add_argument("--markets", default="KOSPI,KOSDAQ", help="시장 목록(쉼표 구분)")
+    precompute_parser.add_argument("--profiles", default=None, help="표준 프로필 이름 목록(쉼표 구분, 기본: 전체)")
+    precompute_parser.add_argument("--depth", type=int, default=None, help="날짜별 저장 순위 수(기본: 50)")
+    precompute_parser.add_argument("--workers", type=int, default=4)
+    precompute_parser.add_argument("--rate-limit", type=float, default=None, help="KRX 초당 요청 수 상한")
+    precompute_parser.add_argument("--overwrite", action="store_true", help="이미 계산된 날짜도 다시 계산")
+    precompute_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="시장별로 날짜 순서대로 전일 대비 바뀐 종목만 다시 점수 계산(병렬 대신 순차 실행)",
+    )
+
+    show_parser = subparsers.add_parser("show", help="저장소에서 특정 날짜의 Top N 조회")
+    show_parser.add_argument("--market", default="KOSPI")
+    show_parser.add_argument("--date", required=True, help="조회일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    show_parser.add_argument("--profile", default="default", help="표준 프로필 이름")
+    show_parser.add_argument("--top-n", type=int, default=10)
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+
+    import krx_cache
+    import krx_history
+
+    if args.cache_dir:
+        krx_cache.configure_cache_dir(args.cache_dir)
+    if args.history_dir:
+        krx_history.configure_history_dir(args.history_dir)
+    profiles = {profile.name: profile for profile in krx_history.STANDARD_PROFILES}
+
+    if args.command == "show":
+        from krx_backtest import _to_yyyymmdd
+
+        if args.profile not in profiles:
+            parser.error(f"unknown profile: {args.profile} (choices: {', '.join(profiles)})")
+        hit = krx_history.lookup_top_n(
+            args.market.strip().upper(),
+            _to_yyyymmdd(args.date),
+            args.top_n,
+            **profiles[args.profile].screen_kwargs(),
+        )
+        if hit is None:
+            print("[없음] 사전 계산 결과가 없습니다.")
+            return
+        frame, used_date, stats = hit
+        print(f"기준일: {used_date} | 전체: {stats['total']} | 조건통과: {stats['filtered']}")
+        print(frame.to_string())
+        return
+
+    if not args.dates and not (args.start_date and args.end_date):
+        parser.error("--dates or both --start-date and --end-date are required")
+    selected = list(profiles.values())
+    if args.profiles:
+        names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+        unknown = [name for name in names if name not in profiles]
+        if unknown:
+            parser.error(f"unknown profile: {', '.join(unknown)} (choices: {', '.join(profiles)})")
+        selected = [profiles[name] for name in names]
+
+    import krx_fetch
+
+    krx_fetch.configure_fetch(rate_per_sec=args.rate_limit)
+    started_at = perf_counter()
+    summary = krx_history.precompute_history(
+        start_date=args.start_date,
+        end_date=args.end_date,
+        dates=args.dates.split(",") if args.dates else None,
+        markets=[market for market in args.markets.split(",") if market.strip()],
+        profiles=selected,
+        depth=args.depth or krx_history.HISTORY_DEPTH,
+        workers=args.workers,
+        overwrite=args.overwrite,
+        incremental=args.incremental,
+        on_done=lambda profile, result: print(
+            f"[{'done' if result.ok else 'failed'}] {profile.name} {result.market} {result.date}"
+        ),
+    )
+    print("[완료] Top N 순위 사전 계산")
+    print(f"- store: {Path(krx_history.get_history_dir())}")
+    print(f"- written: {summary['written']} | skipped(existing): {summary['skipped']} | failed: {len(summary['failed'])}")
+    print(f"- elapsed: {perf_counter() - started_at:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,35 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import csv
+import json
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
-from pykrx import stock
 
-from krx_value_service import get_tatsuro_small_mid_value_top10
+import krx_cache
+import krx_fetch
+import krx_memory
+from krx_metrics import BacktestMetrics, infer_periods_per_year
+from krx_factor import compile_factor_expression
+from krx_value_service import get_screening_result, normalize_market, service_caches
+
+
+@dataclass
+class CostModel:
+    commission_rate: float = 0.0
+    tax_rate: float = 0.0
+    slippage_rate: float = 0.0
+
+    def buy_cost_rate(self) -> float:
+        return self.commission_rate + self.slippage_rate
+
+    def sell_cost_rate(self) -> float:
+        return self.commission_rate + self.tax_rate + self.slippage_rate
 
 
 @dataclass
@@ -21,6 +42,15 @@ class BacktestConfig:
     per_max: Optional[float] = None
     pbr_max: Optional[float] = None
     div_policy: str = "zero"
+    cost_model: CostModel = field(default_factory=CostModel)
+    rebalance_freq: str = "M"
+    rebalance_dates: Optional[list[str]] = None
+    score_expression: Optional[str] = None
+
+    def __post_init__(self):
+        if isinstance(self.cost_model, dict):
+            self.cost_model = CostModel(**self.cost_model)
+        compile_factor_expression(self.score_expression)
 
 
 def _to_yyyymmdd(value: str) -> str:
@@ -46,17 +76,91 @@ def generate_month_end_dates(start_date: str, end_date: str) -> list[str]:
     return dates
 
 
-def _calculate_mdd(return_series: pd.Series) -> float:
-    cumulative = (1 + return_series.fillna(0.0)).cumprod()
-    peak = cumulative.cummax()
-    drawdown = cumulative / peak - 1
-    return float(drawdown.min()) if not drawdown.empty else 0.0
+REBALANCE_FREQUENCIES = {
+    "D": "B",
+    "W": "W-FRI",
+    "2W": "2W-FRI",
+    "M": "ME",
+    "Q": "QE",
+}
+CALENDAR_INDEX_TICKER = "1001"
+INCREMENTAL_SCREEN_FREQUENCIES = ("D", "W")
 
+INDEX_CLOSE_CACHE_SIZE = 8
+CLOSE_SNAPSHOT_CACHE_SIZE = 64
+ADJUSTMENT_CHECK_RETURN = 0.3
 
-def _calculate_total_return(return_series: pd.Series) -> float:
-    if return_series.empty:
-        return 0.0
-    return float((1 + return_series.fillna(0.0)).prod() - 1)
+_INDEX_CLOSE_CACHE: OrderedDict[str, tuple[str, str, pd.Series]] = OrderedDict()
+_CLOSE_SNAPSHOT_CACHE: OrderedDict[tuple[str, str], pd.DataFrame] = OrderedDict()
+
+
+def _index_close_series(index_ticker: str, start_date: str, end_date: str) -> pd.Series:
+    cached = _INDEX_CLOSE_CACHE.get(index_ticker)
+    if cached is not None and cached[0] <= start_date and end_date <= cached[1]:
+        _INDEX_CLOSE_CACHE.move_to_end(index_ticker)
+        return cached[2].loc[start_date:end_date]
+
+    fetch_start = min(start_date, cached[0]) if cached else start_date
+    fetch_end = max(end_date, cached[1]) if cached else end_date
+    prices = krx_fetch.get_index_ohlcv_by_date(fetch_start, fetch_end, index_ticker)
+    if prices.empty:
+        closes = pd.Series(dtype=float)
+    else:
+        closes = prices["종가"].astype(float)
+        closes.index = pd.DatetimeIndex(closes.index).strftime("%Y%m%d")
+        closes = closes.sort_index()
+    _INDEX_CLOSE_CACHE[index_ticker] = (fetch_start, fetch_end, closes)
+    _INDEX_CLOSE_CACHE.move_to_end(index_ticker)
+    while len(_INDEX_CLOSE_CACHE) > INDEX_CLOSE_CACHE_SIZE:
+        _INDEX_CLOSE_CACHE.popitem(last=False)
+    return closes.loc[start_date:end_date]
+
+
+def get_trading_calendar(start_date: str, end_date: str) -> list[str]:
+    closes = _index_close_series(CALENDAR_INDEX_TICKER, _to_yyyymmdd(start_date), _to_yyyymmdd(end_date))
+    return closes.index.tolist()
+
+
+def snap_to_trading_days(dates: Iterable[str], calendar: list[str]) -> list[str]:
+    if not calendar:
+        return list(dict.fromkeys(dates))
+    trading_days = np.asarray(calendar)
+    snapped: list[str] = []
+    for date in dates:
+        position = int(np.searchsorted(trading_days, date, side="right")) - 1
+        if position >= 0:
+            snapped.append(str(trading_days[position]))
+    return list(dict.fromkeys(snapped))
+
+
+def generate_rebalance_dates(
+    start_date: str,
+    end_date: str,
+    freq: str = "M",
+    custom_dates: Optional[Iterable[str]] = None,
+    calendar: Optional[list[str]] = None,
+) -> list[str]:
+    start = _to_yyyymmdd(start_date)
+    end = _to_yyyymmdd(end_date)
+    if start > end:
+        raise ValueError("start_date must be earlier than or equal to end_date")
+
+    if custom_dates is not None:
+        dates = sorted({_to_yyyymmdd(d) for d in custom_dates})
+        dates = [d for d in dates if start <= d <= end]
+    else:
+        normalized_freq = freq.strip().upper()
+        if normalized_freq not in REBALANCE_FREQUENCIES:
+            raise ValueError("freq must be one of: D, W, 2W, M, Q")
+        if normalized_freq == "M":
+            dates = generate_month_end_dates(start, end)
+        else:
+            scheduled = pd.date_range(start=pd.Timestamp(start), end=pd.Timestamp(end), freq=REBALANCE_FREQUENCIES[normalized_freq])
+            dates = [d.strftime("%Y%m%d") for d in scheduled] or [end]
+
+    if calendar is None:
+        return dates
+    return [d for d in snap_to_trading_days(dates, calendar) if d >= start] or dates[-1:]
 
 
 def _build_rebalance_pairs(rebalance_dates: Iterable[str]) -> list[tuple[str, str]]:
@@ -64,103 +168,551 @@ def _build_rebalance_pairs(rebalance_dates: Iterable[str]) -> list[tuple[str, st
     return [(dates[i], dates[i + 1]) for i in range(len(dates) - 1)]
 
 
-def _portfolio_monthly_return(tickers: list[str], buy_date: str, sell_date: str) -> float:
+def _close_snapshot(market: str, date: str) -> pd.DataFrame:
+    key = (market, date)
+    if key in _CLOSE_SNAPSHOT_CACHE:
+        _CLOSE_SNAPSHOT_CACHE.move_to_end(key)
+        return _CLOSE_SNAPSHOT_CACHE[key]
+
+    empty = pd.DataFrame(columns=["종가", "상장주식수"], dtype=float)
+    negative_cache = krx_cache.get_negative_cache()
+    if negative_cache.lookup("close_snapshot", market, date) is not None:
+        return empty
+    try:
+        prices = krx_fetch.get_market_ohlcv_by_ticker(date, market=market)
+    except Exception:
+        return empty
+    if prices.empty:
+        negative_cache.record(
+            "close_snapshot", market, date, reason="빈 결과", as_of_date=date, ttl=krx_cache.empty_result_ttl(date)
+        )
+        return empty
+    try:
+        shares = krx_fetch.get_market_cap_by_ticker(date, market=market)["상장주식수"]
+    except Exception:
+        shares = pd.Series(dtype=float)
+    snapshot = pd.DataFrame({"종가": prices["종가"].astype(float)})
+    snapshot["상장주식수"] = shares.reindex(snapshot.index).astype(float)
+    snapshot = snapshot[snapshot["종가"] > 0]
+    _CLOSE_SNAPSHOT_CACHE[key] = snapshot
+    while len(_CLOSE_SNAPSHOT_CACHE) > CLOSE_SNAPSHOT_CACHE_SIZE:
+        _CLOSE_SNAPSHOT_CACHE.popitem(last=False)
+    return snapshot
+
+
+def _ticker_range_return(ticker: str, buy_date: str, sell_date: str, delisted: bool = False) -> Optional[float]:
+    negative_cache = krx_cache.get_negative_cache()
+    if negative_cache.lookup("ticker_range", ticker, buy_date, sell_date) is not None:
+        return None
+
+    try:
+        prices = krx_fetch.get_market_ohlcv_by_date(buy_date, sell_date, ticker)
+    except Exception as exc:
+        if not krx_cache.is_transient_error(exc):
+            negative_cache.record(
+                "ticker_range",
+                ticker,
+                buy_date,
+                sell_date,
+                reason=f"예외: {type(exc).__name__}",
+                as_of_date=sell_date,
+                ttl=krx_cache.ERROR_TTL,
+            )
+        return None
+
+    ttl = None
+    if prices.empty:
+        reason = "빈 결과" if delisted else "빈 결과(매도일 시세 확인 전)"
+        ttl = None if delisted else krx_cache.ERROR_TTL
+    else:
+        buy_price = float(prices.iloc[0]["종가"])
+        sell_price = float(prices.iloc[-1]["종가"])
+        if buy_price > 0:
+            return sell_price / buy_price - 1
+        reason = "매수가 0 이하"
+
+    negative_cache.record("ticker_range", ticker, buy_date, sell_date, reason=reason, as_of_date=sell_date, ttl=ttl)
+    return None
+
+
+def _ticker_period_returns(tickers: list[str], buy_date: str, sell_date: str, market: str = "ALL") -> pd.Series:
     if not tickers:
-        return 0.0
+        return pd.Series(dtype=float)
+
+    sell_snapshot = _close_snapshot(market, sell_date)
+    buy = _close_snapshot(market, buy_date).reindex(tickers)
+    sell = sell_snapshot.reindex(tickers)
+    returns = sell["종가"] / buy["종가"] - 1
+    share_changed = buy["상장주식수"].notna() & sell["상장주식수"].notna() & (buy["상장주식수"] != sell["상장주식수"])
+    needs_adjusted = returns.isna() | share_changed | (returns.abs() >= ADJUSTMENT_CHECK_RETURN)
+
+    for ticker in returns.index[needs_adjusted]:
+        delisted = not sell_snapshot.empty and ticker not in sell_snapshot.index
+        adjusted = _ticker_range_return(ticker, buy_date, sell_date, delisted=delisted)
+        if adjusted is not None:
+            returns[ticker] = adjusted
+        elif share_changed[ticker]:
+            returns[ticker] = np.nan
+    returns = returns.dropna()
+    return returns.reindex([t for t in tickers if t in returns.index]).astype(float)
+
+
+def build_weights_matrix(held_tickers: list[list[str]]) -> pd.DataFrame:
+    columns = sorted({ticker for tickers in held_tickers for ticker in tickers})
+    weights = np.zeros((len(held_tickers), len(columns)))
+    position = {ticker: i for i, ticker in enumerate(columns)}
+    for row, tickers in enumerate(held_tickers):
+        if tickers:
+            weights[row, [position[ticker] for ticker in tickers]] = 1.0 / len(tickers)
+    return pd.DataFrame(weights, columns=columns)
+
+
+def apply_weights_and_costs(
+    weights_df: pd.DataFrame,
+    returns_df: pd.DataFrame,
+    cost_model: CostModel,
+) -> pd.DataFrame:
+    weights = weights_df.to_numpy(dtype=float)
+    returns = returns_df.reindex(columns=weights_df.columns).fillna(0.0).to_numpy(dtype=float)
+
+    gross = (weights * returns).sum(axis=1)
+
+    drifted = np.zeros_like(weights)
+    if len(weights) > 1:
+        grown = weights[:-1] * (1 + returns[:-1])
+        totals = grown.sum(axis=1, keepdims=True)
+        drifted[1:] = np.divide(grown, totals, out=np.zeros_like(grown), where=totals > 0)
+
+    delta = weights - drifted
+    buys = np.clip(delta, 0, None).sum(axis=1)
+    sells = np.clip(-delta, 0, None).sum(axis=1)
+    cost = buys * cost_model.buy_cost_rate() + sells * cost_model.sell_cost_rate()
+
+    return pd.DataFrame(
+        {
+            "gross_return": gross,
+            "turnover": (buys + sells) / 2,
+            "transaction_cost": cost,
+            "net_return": gross - cost,
+        },
+        index=weights_df.index,
+    )
+
+
+def weights_from_results(result_df: pd.DataFrame) -> pd.DataFrame:
+    held = [
+        [ticker for ticker in str(value).split(",") if ticker] if isinstance(value, str) else []
+        for value in result_df.get("held_tickers", result_df.get("selected_tickers", pd.Series(dtype=object)))
+    ]
+    weights_df = build_weights_matrix(held)
+    if "rebalance_date" in result_df.columns:
+        weights_df.index = result_df["rebalance_date"].to_numpy()
+        weights_df.index.name = "rebalance_date"
+    return weights_df
 
-    returns: list[float] = []
-    for ticker in tickers:
-        try:
-            prices = stock.get_market_ohlcv_by_date(buy_date, sell_date, ticker)
-            if prices.empty:
-                continue
-            buy_price = float(prices.iloc[0]["종가"])
-            sell_price = float(prices.iloc[-1]["종가"])
-            if buy_price <= 0:
-                continue
-            returns.append(sell_price / buy_price - 1)
-        except Exception:
-            continue
 
-    if not returns:
-        return 0.0
-    return float(sum(returns) / len(returns))
+BENCHMARK_INDEX_TICKERS = {"KOSPI": "1001", "KOSDAQ": "2001"}
 
 
-def _benchmark_monthly_return(market: str, buy_date: str, sell_date: str) -> float:
-    index_ticker = "1001" if market == "KOSPI" else "2001"
-    prices = stock.get_index_ohlcv_by_date(buy_date, sell_date, index_ticker)
-    if prices.empty:
+def _index_period_return(index_ticker: str, buy_date: str, sell_date: str) -> float:
+    closes = _index_close_series(index_ticker, buy_date, sell_date)
+    if closes.empty:
         return 0.0
-    buy_price = float(prices.iloc[0]["종가"])
-    sell_price = float(prices.iloc[-1]["종가"])
+    buy_price = float(closes.iloc[0])
+    sell_price = float(closes.iloc[-1])
     if buy_price <= 0:
         return 0.0
     return float(sell_price / buy_price - 1)
 
 
-def run_monthly_rebalance_backtest(market: str, config: BacktestConfig) -> pd.DataFrame:
-    rebalance_dates = generate_month_end_dates(config.start_date, config.end_date)
-    pairs = _build_rebalance_pairs(rebalance_dates)
+def _benchmark_index_tickers(market: str) -> list[str]:
+    normalized = market.strip().upper()
+    if normalized == "ALL":
+        return list(BENCHMARK_INDEX_TICKERS.values())
+    return [BENCHMARK_INDEX_TICKERS.get(normalized, "2001")]
 
-    rows: list[dict] = []
-    for buy_date, sell_date in pairs:
-        selected_df, used_date, _, _ = get_tatsuro_small_mid_value_top10(
-            market=market,
-            date=buy_date,
-            cap_min=config.cap_min,
-            cap_max=config.cap_max,
-            top_n=config.top_n,
-            per_max=config.per_max,
-            pbr_max=config.pbr_max,
-            div_policy=config.div_policy,
+
+def _benchmark_monthly_return(market: str, buy_date: str, sell_date: str) -> float:
+    returns = [
+        _index_period_return(index_ticker, buy_date, sell_date)
+        for index_ticker in _benchmark_index_tickers(market)
+    ]
+    return float(sum(returns) / len(returns))
+
+
+RESULT_COLUMNS = [
+    "market",
+    "rebalance_date",
+    "next_rebalance_date",
+    "selected_count",
+    "selected_tickers",
+    "held_tickers",
+    "gross_return",
+    "turnover",
+    "transaction_cost",
+    "portfolio_return",
+    "benchmark_return",
+    "excess_return",
+    "portfolio_cumulative",
+    "benchmark_cumulative",
+    "excess_cumulative",
+]
+
+
+def backtest_caches() -> dict[str, dict]:
+    caches = service_caches()
+    caches["close_snapshot_cache"] = _CLOSE_SNAPSHOT_CACHE
+    caches["index_close_cache"] = _INDEX_CLOSE_CACHE
+    return caches
+
+
+def _period_gross_and_costs(
+    prev_tickers: list[str],
+    prev_returns: pd.Series,
+    tickers: list[str],
+    returns: pd.Series,
+    cost_model: CostModel,
+) -> tuple[float, float, float]:
+    weights_df = build_weights_matrix([prev_tickers, tickers])
+    returns_df = pd.DataFrame([prev_returns, returns], index=weights_df.index)
+    period = apply_weights_and_costs(weights_df, returns_df, cost_model).iloc[-1]
+    return float(period["gross_return"]), float(period["turnover"]), float(period["transaction_cost"])
+
+
+def _split_tickers(value) -> list[str]:
+    return [ticker for ticker in value.split(",") if ticker] if isinstance(value, str) else []
+
+
+def _rebalance_screener(market: str, config: BacktestConfig) -> Callable[[str], tuple[list[str], str]]:
+    if config.rebalance_dates or config.rebalance_freq.strip().upper() not in INCREMENTAL_SCREEN_FREQUENCIES:
+
+        def screen(date: str) -> tuple[list[str], str]:
+            screening = get_screening_result(
+                market=market,
+                date=date,
+                cap_min=config.cap_min,
+                cap_max=config.cap_max,
+                top_n=config.top_n,
+                per_max=config.per_max,
+                pbr_max=config.pbr_max,
+                div_policy=config.div_policy,
+                score_expression=config.score_expression,
+            )
+            return screening.tickers, screening.used_date
+
+        return screen
+
+    from krx_incremental import IncrementalScreener
+
+    screener = IncrementalScreener(
+        cap_min=config.cap_min,
+        cap_max=config.cap_max,
+        per_max=config.per_max,
+        pbr_max=config.pbr_max,
+        div_policy=config.div_policy,
+        score_expression=config.score_expression,
+    )
+    normalized_market = normalize_market(market)
+
+    def screen_incrementally(date: str) -> tuple[list[str], str]:
+        used_date, _ = screener.load(normalized_market, date)
+        return screener.top(config.top_n).index.tolist(), used_date
+
+    return screen_incrementally
+
+
+def iter_monthly_rebalance_backtest(
+    market: str,
+    config: BacktestConfig,
+    completed: Optional[pd.DataFrame] = None,
+    metrics: Optional[BacktestMetrics] = None,
+) -> Iterator[dict]:
+    with krx_memory.stage("backtest.calendar"):
+        calendar = get_trading_calendar(config.start_date, config.end_date)
+        rebalance_dates = generate_rebalance_dates(
+            config.start_date,
+            config.end_date,
+            freq=config.rebalance_freq,
+            custom_dates=config.rebalance_dates,
+            calendar=calendar,
         )
+        pairs = _build_rebalance_pairs(rebalance_dates)
 
-        tickers = selected_df.index.tolist()
-        portfolio_ret = _portfolio_monthly_return(tickers=tickers, buy_date=used_date, sell_date=sell_date)
-        benchmark_ret = _benchmark_monthly_return(market=market, buy_date=used_date, sell_date=sell_date)
-
-        rows.append(
-            {
-                "market": market,
-                "rebalance_date": used_date,
-                "next_rebalance_date": sell_date,
-                "selected_count": len(tickers),
-                "portfolio_return": portfolio_ret,
-                "benchmark_return": benchmark_ret,
-                "excess_return": portfolio_ret - benchmark_ret,
-            }
+    metrics = metrics if metrics is not None else BacktestMetrics()
+    if metrics.periods_per_year is None:
+        metrics.periods_per_year = infer_periods_per_year(
+            [buy_date for buy_date, _ in pairs], [sell_date for _, sell_date in pairs]
         )
+    prev_held: list[str] = []
+    prev_returns = pd.Series(dtype=float)
+    if completed is not None and not completed.empty:
+        metrics.extend(completed.to_dict(orient="records"))
+        last = completed.iloc[-1]
+        done_until = str(last["next_rebalance_date"])
+        pairs = [pair for pair in pairs if pair[1] > done_until]
+        prev_tickers = _split_tickers(last["held_tickers"])
+        if pairs and prev_tickers:
+            prev_held = prev_tickers
+            prev_returns = _ticker_period_returns(
+                prev_tickers, buy_date=str(last["rebalance_date"]), sell_date=done_until, market=market
+            )
+
+    if pairs:
+        for index_ticker in _benchmark_index_tickers(market):
+            _index_close_series(index_ticker, pairs[0][0], pairs[-1][1])
+
+    screen = _rebalance_screener(market, config)
+    for buy_date, sell_date in pairs:
+        with krx_memory.stage("backtest.screen"):
+            tickers, used_date = screen(buy_date)
+
+        with krx_memory.stage("backtest.returns"):
+            ticker_returns = _ticker_period_returns(
+                tickers=tickers,
+                buy_date=used_date,
+                sell_date=sell_date,
+                market=market,
+            )
+        with krx_memory.stage("backtest.benchmark"):
+            benchmark_ret = _benchmark_monthly_return(market=market, buy_date=used_date, sell_date=sell_date)
+        with krx_memory.stage("backtest.weights"):
+            held = list(ticker_returns.index)
+            gross, turnover, cost = _period_gross_and_costs(
+                prev_held, prev_returns, held, ticker_returns, config.cost_model
+            )
+
+        portfolio_ret = gross - cost
+        row = {
+            "market": market,
+            "rebalance_date": used_date,
+            "next_rebalance_date": sell_date,
+            "selected_count": len(tickers),
+            "selected_tickers": ",".join(tickers),
+            "held_tickers": ",".join(held),
+            "gross_return": gross,
+            "turnover": turnover,
+            "transaction_cost": cost,
+            "portfolio_return": portfolio_ret,
+            "benchmark_return": benchmark_ret,
+            "excess_return": portfolio_ret - benchmark_ret,
+        }
+        metrics.update(row)
+        row["portfolio_cumulative"] = metrics.portfolio.total_return
+        row["benchmark_cumulative"] = metrics.benchmark.total_return
+        row["excess_cumulative"] = metrics.portfolio.nav - metrics.benchmark.nav
+        yield row
+        prev_held = held
+        prev_returns = ticker_returns
+
 
-    result_df = pd.DataFrame(rows)
+def _finalize_results(result_df: pd.DataFrame, config: BacktestConfig) -> pd.DataFrame:
     if result_df.empty:
         return result_df
+    result_df.attrs["weights"] = weights_from_results(result_df)
+    result_df.attrs["cost_model"] = asdict(config.cost_model)
+    return result_df
+
 
-    result_df["portfolio_cumulative"] = (1 + result_df["portfolio_return"]).cumprod() - 1
-    result_df["benchmark_cumulative"] = (1 + result_df["benchmark_return"]).cumprod() - 1
-    result_df["excess_cumulative"] = result_df["portfolio_cumulative"] - result_df["benchmark_cumulative"]
+def run_monthly_rebalance_backtest(market: str, config: BacktestConfig) -> pd.DataFrame:
+    rows = list(iter_monthly_rebalance_backtest(market, config))
+    if not rows:
+        return pd.DataFrame()
+
+    result_df = _finalize_results(pd.DataFrame(rows, columns=RESULT_COLUMNS), config)
+    if krx_memory.is_enabled():
+        memory_stats = krx_memory.get_memory_stats(caches=backtest_caches())
+        krx_memory.log_memory_stats(memory_stats, f"백테스트 {market}")
+        result_df.attrs["memory"] = memory_stats
     return result_df
 
 
+class BacktestRowSink:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._handle = None
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _repair_tail(self) -> None:
+        if not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            self.path.write_bytes(data[: data.rfind(b"\n") + 1])
+
+    def read(self) -> pd.DataFrame:
+        self._repair_tail()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+        return pd.read_csv(
+            self.path,
+            dtype={
+                "market": str,
+                "rebalance_date": str,
+                "next_rebalance_date": str,
+                "selected_tickers": str,
+                "held_tickers": str,
+            },
+            encoding="utf-8-sig",
+        )
+
+    def __enter__(self) -> "BacktestRowSink":
+        self._repair_tail()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_header = not self.path.exists() or self.path.stat().st_size == 0
+        self._handle = self.path.open("a", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._handle, fieldnames=RESULT_COLUMNS, lineterminator="\n")
+        if write_header:
+            self._writer.writeheader()
+            self._handle.flush()
+        return self
+
+    def append(self, row: dict) -> None:
+        self._writer.writerow(row)
+        self._handle.flush()
+
+    def __exit__(self, *exc_info) -> None:
+        self._handle.close()
+        self._handle = None
+        self._writer = None
+
+
+STREAM_STATE_FILE = "backtest_stream_state.json"
+
+
+def _monthly_results_path(output_dir: Path, market: str) -> Path:
+    return output_dir / f"backtest_{market.lower()}_monthly.csv"
+
+
+def run_streaming_backtest(
+    output_dir: str,
+    config: BacktestConfig,
+    markets: Iterable[str] = ("KOSPI", "KOSDAQ"),
+    resume: bool = True,
+    on_row: Optional[Callable[[dict], None]] = None,
+    on_metrics: Optional[Callable[[dict, dict[str, float]], None]] = None,
+) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
+    target_dir = Path(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    markets = list(markets)
+    state_path = target_dir / STREAM_STATE_FILE
+    fingerprint = json.dumps(asdict(config), sort_keys=True, default=str)
+
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    if not resume or state.get("config") != fingerprint or state.get("columns") != RESULT_COLUMNS:
+        for market in markets:
+            _monthly_results_path(target_dir, market).unlink(missing_ok=True)
+    state_path.write_text(json.dumps({"config": fingerprint, "columns": RESULT_COLUMNS}, ensure_ascii=False), encoding="utf-8")
+
+    market_results: dict[str, pd.DataFrame] = {}
+    summaries: dict[str, dict[str, float]] = {}
+    for market in markets:
+        sink = BacktestRowSink(_monthly_results_path(target_dir, market))
+        completed = sink.read()
+        metrics = BacktestMetrics()
+        with sink:
+            for row in iter_monthly_rebalance_backtest(market, config, completed=completed, metrics=metrics):
+                sink.append(row)
+                if on_row is not None:
+                    on_row(row)
+                if on_metrics is not None:
+                    on_metrics(row, metrics.summary())
+        market_df = sink.read()
+        market_results[market] = _finalize_results(market_df, config) if not market_df.empty else pd.DataFrame()
+        summaries[market] = metrics.summary()
+
+    return _summary_frame(market_results, summaries), market_results
+
+
 def summarize_backtest(result_df: pd.DataFrame) -> dict[str, float]:
-    if result_df.empty:
-        return {
-            "periods": 0,
-            "portfolio_cumulative_return": 0.0,
-            "benchmark_cumulative_return": 0.0,
-            "portfolio_mdd": 0.0,
-            "benchmark_mdd": 0.0,
+    periods_per_year = None
+    if {"rebalance_date", "next_rebalance_date"}.issubset(result_df.columns):
+        periods_per_year = infer_periods_per_year(result_df["rebalance_date"], result_df["next_rebalance_date"])
+    metrics = BacktestMetrics(periods_per_year=periods_per_year)
+    return metrics.extend(result_df.to_dict(orient="records")).summary()
+
+
+ROLLING_COLUMNS = [
+    "window_start",
+    "window_end",
+    "periods",
+    "portfolio_cumulative_return",
+    "benchmark_cumulative_return",
+    "excess_cumulative_return",
+    "portfolio_mdd",
+    "benchmark_mdd",
+]
+
+
+def _rolling_total_and_mdd(returns: np.ndarray, window_periods: int, step_periods: int) -> tuple[np.ndarray, np.ndarray]:
+    windows = np.lib.stride_tricks.sliding_window_view(returns, window_periods)[::step_periods]
+    cumulative = np.cumprod(1 + windows, axis=1)
+    peak = np.maximum.accumulate(cumulative, axis=1)
+    drawdown = cumulative / peak - 1
+    return cumulative[:, -1] - 1, drawdown.min(axis=1)
+
+
+def compute_rolling_window_metrics(
+    result_df: pd.DataFrame,
+    window_periods: int,
+    step_periods: int = 1,
+) -> pd.DataFrame:
+    if window_periods < 1 or step_periods < 1:
+        raise ValueError("window_periods and step_periods must be at least 1")
+    if len(result_df) < window_periods:
+        return pd.DataFrame(columns=ROLLING_COLUMNS)
+
+    portfolio_returns = result_df["portfolio_return"].fillna(0.0).to_numpy(dtype=float)
+    benchmark_returns = result_df["benchmark_return"].fillna(0.0).to_numpy(dtype=float)
+    portfolio_total, portfolio_mdd = _rolling_total_and_mdd(portfolio_returns, window_periods, step_periods)
+    benchmark_total, benchmark_mdd = _rolling_total_and_mdd(benchmark_returns, window_periods, step_periods)
+
+    starts = np.arange(0, len(result_df) - window_periods + 1, step_periods)
+    ends = starts + window_periods - 1
+    return pd.DataFrame(
+        {
+            "window_start": result_df["rebalance_date"].to_numpy()[starts],
+            "window_end": result_df["next_rebalance_date"].to_numpy()[ends],
+            "periods": window_periods,
+            "portfolio_cumulative_return": portfolio_total,
+            "benchmark_cumulative_return": benchmark_total,
+            "excess_cumulative_return": portfolio_total - benchmark_total,
+            "portfolio_mdd": portfolio_mdd,
+            "benchmark_mdd": benchmark_mdd,
         }
+    )
 
-    portfolio_returns = result_df["portfolio_return"]
-    benchmark_returns = result_df["benchmark_return"]
 
+def run_rolling_window_backtest(
+    market: str,
+    config: BacktestConfig,
+    window_periods: int = 36,
+    step_periods: int = 1,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    result_df = run_monthly_rebalance_backtest(market=market, config=config)
+    if result_df.empty:
+        return result_df, pd.DataFrame(columns=ROLLING_COLUMNS)
+    return result_df, compute_rolling_window_metrics(result_df, window_periods, step_periods)
+
+
+def summarize_rolling_windows(rolling_df: pd.DataFrame) -> dict[str, float]:
+    if rolling_df.empty:
+        return {
+            "windows": 0,
+            "outperform_ratio": 0.0,
+            "median_excess_return": 0.0,
+            "worst_excess_return": 0.0,
+            "worst_portfolio_mdd": 0.0,
+        }
+    excess = rolling_df["excess_cumulative_return"]
     return {
-        "periods": int(len(result_df)),
-        "portfolio_cumulative_return": _calculate_total_return(portfolio_returns),
-        "benchmark_cumulative_return": _calculate_total_return(benchmark_returns),
-        "portfolio_mdd": _calculate_mdd(portfolio_returns),
-        "benchmark_mdd": _calculate_mdd(benchmark_returns),
+        "windows": int(len(rolling_df)),
+        "outperform_ratio": float((excess > 0).mean()),
+        "median_excess_return": float(excess.median()),
+        "worst_excess_return": float(excess.min()),
+        "worst_portfolio_mdd": float(rolling_df["portfolio_mdd"].min()),
     }
 
 
@@ -168,17 +720,23 @@ def create_market_comparison_report(
     config: BacktestConfig,
     markets: Iterable[str] = ("KOSPI", "KOSDAQ"),
 ) -> tuple[pd.DataFrame, dict[str, pd.DataFrame]]:
-    summaries: list[dict] = []
     market_results: dict[str, pd.DataFrame] = {}
-
     for market in markets:
-        market_df = run_monthly_rebalance_backtest(market=market, config=config)
-        market_results[market] = market_df
-        summary = summarize_backtest(market_df)
+        market_results[market] = run_monthly_rebalance_backtest(market=market, config=config)
+    return _summary_frame(market_results), market_results
+
+
+def _summary_frame(
+    market_results: dict[str, pd.DataFrame],
+    summaries: Optional[dict[str, dict[str, float]]] = None,
+) -> pd.DataFrame:
+    rows: list[dict] = []
+    for market, market_df in market_results.items():
+        summary = dict(summaries[market]) if summaries and market in summaries else summarize_backtest(market_df)
         summary["market"] = market
-        summaries.append(summary)
+        rows.append(summary)
 
-    summary_df = pd.DataFrame(summaries)[
+    return pd.DataFrame(rows)[
         [
             "market",
             "periods",
@@ -186,28 +744,69 @@ def create_market_comparison_report(
             "benchmark_cumulative_return",
             "portfolio_mdd",
             "benchmark_mdd",
+            "average_turnover",
+            "total_transaction_cost",
+            "portfolio_volatility",
+            "portfolio_sharpe",
+            "hit_rate",
         ]
     ]
-    return summary_df, market_results
 
 
-def write_backtest_report(output_dir: str, summary_df: pd.DataFrame, market_results: dict[str, pd.DataFrame]) -> Path:
+def write_backtest_report(
+    output_dir: str,
+    summary_df: pd.DataFrame,
+    market_results: dict[str, pd.DataFrame],
+    rolling_results: Optional[dict[str, pd.DataFrame]] = None,
+    significance_df: Optional[pd.DataFrame] = None,
+) -> Path:
     target_dir = Path(output_dir)
     target_dir.mkdir(parents=True, exist_ok=True)
 
     summary_path = target_dir / "backtest_summary.csv"
     summary_df.to_csv(summary_path, index=False, encoding="utf-8-sig")
 
+    cost_model: Optional[dict] = None
     for market, market_df in market_results.items():
         market_df.to_csv(target_dir / f"backtest_{market.lower()}_monthly.csv", index=False, encoding="utf-8-sig")
+        if "selected_tickers" in market_df.columns:
+            weights_df = market_df.attrs.get("weights")
+            if weights_df is None:
+                weights_df = weights_from_results(market_df)
+            weights_df.to_csv(target_dir / f"backtest_{market.lower()}_weights.csv", encoding="utf-8-sig")
+        cost_model = cost_model or market_df.attrs.get("cost_model")
 
     md_path = target_dir / "backtest_report.md"
     lines = ["# Monthly Rebalance Backtest Report", "", "## Summary", ""]
-    header = "| " + " | ".join(summary_df.columns) + " |"
-    separator = "| " + " | ".join(["---"] * len(summary_df.columns)) + " |"
-    lines.extend([header, separator])
-    for row in summary_df.itertuples(index=False):
-        lines.append("| " + " | ".join(str(v) for v in row) + " |")
+    lines.extend(_markdown_table(summary_df))
+
+    if cost_model is not None:
+        lines.extend(["", "## Cost Model", ""])
+        lines.extend(_markdown_table(pd.DataFrame([cost_model])))
+
+    if rolling_results:
+        rolling_summary_rows: list[dict] = []
+        for market, rolling_df in rolling_results.items():
+            rolling_df.to_csv(target_dir / f"backtest_{market.lower()}_rolling.csv", index=False, encoding="utf-8-sig")
+            rolling_summary = summarize_rolling_windows(rolling_df)
+            rolling_summary_rows.append({"market": market, **rolling_summary})
+        lines.extend(["", "## Rolling Windows", ""])
+        lines.extend(_markdown_table(pd.DataFrame(rolling_summary_rows)))
+
+    if significance_df is not None and not significance_df.empty:
+        significance_df.to_csv(target_dir / "backtest_significance.csv", index=False, encoding="utf-8-sig")
+        lines.extend(["", "## Excess Return Significance (Bootstrap)", ""])
+        lines.extend(_markdown_table(significance_df))
+
     md_path.write_text("\n".join(lines), encoding="utf-8")
 
     return md_path
+
+
+def _markdown_table(df: pd.DataFrame) -> list[str]:
+    header = "| " + " | ".join(str(col) for col in df.columns) + " |"
+    separator = "| " + " | ".join(["---"] * len(df.columns)) + " |"
+    lines = [header, separator]
+    for row in df.itertuples(index=False):
+        lines.append("| " + " | ".join(str(v) for v in row) + " |")
+    return lines
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+import krx_cache
+import krx_fetch
+
+INDEX_FILE = "batch_index.json"
+DEFAULT_MARKETS = ("KOSPI", "KOSDAQ")
+
+
+def load_manifest(manifest_path: str) -> dict[str, Any]:
+    path = Path(manifest_path)
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ValueError("manifest must be an object with a 'jobs' list")
+
+    output_root = Path(manifest.get("output_root") or path.parent / "batch_reports")
+    seen: set[str] = set()
+    jobs: list[dict[str, Any]] = []
+    for i, raw in enumerate(manifest["jobs"]):
+        if not isinstance(raw, dict):
+            raise ValueError(f"job #{i} must be an object")
+        name = str(raw.get("name") or f"job_{i:03d}")
+        if name in seen:
+            raise ValueError(f"duplicate job name: {name}")
+        seen.add(name)
+        if not raw.get("start_date") or not raw.get("end_date"):
+            raise ValueError(f"job {name}: start_date and end_date are required")
+        markets = raw.get("markets", DEFAULT_MARKETS)
+        if isinstance(markets, str):
+            markets = [markets]
+        elif not isinstance(markets, (list, tuple)) or not all(isinstance(m, str) for m in markets):
+            raise ValueError(f"job {name}: markets must be a string or a list of strings")
+        jobs.append(
+            {
+                "name": name,
+                "markets": [m.strip().upper() for m in markets],
+                "start_date": raw["start_date"],
+                "end_date": raw["end_date"],
+                "config": dict(raw.get("config", {})),
+                "output_dir": str(raw.get("output_dir") or output_root / name),
+            }
+        )
+
+    return {
+        "jobs": jobs,
+        "output_root": str(output_root),
+        "workers": int(manifest.get("workers", 2)),
+        "rate_limit": manifest.get("rate_limit"),
+        "cache_dir": manifest.get("cache_dir"),
+        "offline": bool(manifest.get("offline", False)),
+    }
+
+
+def job_fingerprint(job: dict[str, Any]) -> str:
+    payload = json.dumps(job, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def load_batch_index(output_root: str) -> dict[str, dict[str, Any]]:
+    path = Path(output_root) / INDEX_FILE
+    if not path.exists():
+        return {}
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return raw if isinstance(raw, dict) else {}
+
+
+def _save_batch_index(output_root: str, index: dict[str, dict[str, Any]]) -> None:
+    root = Path(output_root)
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_path = root / f"{INDEX_FILE}.tmp"
+    tmp_path.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path.replace(root / INDEX_FILE)
+
+
+def _is_completed(job: dict[str, Any], entry: Optional[dict[str, Any]]) -> bool:
+    if not entry or entry.get("status") != "done":
+        return False
+    if entry.get("fingerprint") != job_fingerprint(job):
+        return False
+    return Path(entry.get("report", "")).exists()
+
+
+def _init_worker(
+    cache_dir: Optional[str],
+    limiter: Optional[krx_fetch.TokenBucket],
+    offline: bool = False,
+) -> None:
+    if cache_dir:
+        krx_cache.configure_cache_dir(cache_dir)
+    krx_fetch.configure_fetch(offline=offline, limiter=limiter)
+
+
+def run_job(job: dict[str, Any]) -> dict[str, Any]:
+    from krx_backtest import BacktestConfig, create_market_comparison_report, write_backtest_report
+
+    config_fields = {f.name for f in fields(BacktestConfig)}
+    unknown = set(job["config"]) - config_fields
+    started_at = perf_counter()
+    entry: dict[str, Any] = {"fingerprint": job_fingerprint(job), "output_dir": job["output_dir"]}
+    try:
+        if unknown:
+            raise ValueError(f"unknown config fields: {', '.join(sorted(unknown))}")
+        config = BacktestConfig(start_date=job["start_date"], end_date=job["end_date"], **job["config"])
+        krx_fetch.reset_fetch_stats()
+        summary_df, market_results = create_market_comparison_report(config=config, markets=job["markets"])
+        report_path = write_backtest_report(job["output_dir"], summary_df, market_results)
+        fetch_stats = krx_fetch.get_fetch_stats()
+        entry.update(
+            status="done",
+            report=str(report_path),
+            summary=summary_df.to_dict(orient="records"),
+            upstream_calls=fetch_stats["calls"],
+            cache_hits=fetch_stats["cache_hits"],
+            queue_wait_sec=round(fetch_stats["queue_wait_sec"], 3),
+        )
+    except Exception as exc:
+        entry.update(status="failed", error=f"{type(exc).__name__}: {exc}")
+    entry["elapsed_sec"] = round(perf_counter() - started_at, 3)
+    entry["finished_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return entry
+
+
+def run_batch(
+    manifest: dict[str, Any],
+    workers: Optional[int] = None,
+    resume: bool = True,
+    on_job_done: Optional[Callable[[str, dict[str, Any]], None]] = None,
+) -> dict[str, dict[str, Any]]:
+    output_root = manifest["output_root"]
+    index = load_batch_index(output_root) if resume else {}
+    pending = [job for job in manifest["jobs"] if not _is_completed(job, index.get(job["name"]))]
+
+    worker_count = max(1, min(workers or manifest["workers"], len(pending) or 1))
+    rate_limit = manifest.get("rate_limit") or krx_fetch.DEFAULT_RATE_PER_SEC
+
+    if pending:
+        limiter = krx_fetch.SharedTokenBucket(rate_limit, burst=1)
+        with ProcessPoolExecutor(
+            max_workers=worker_count,
+            initializer=_init_worker,
+            initargs=(
+                manifest.get("cache_dir") or str(krx_cache.get_cache_dir()),
+                limiter,
+                bool(manifest.get("offline")) or krx_fetch.is_offline(),
+            ),
+        ) as executor:
+            futures = {executor.submit(run_job, job): job["name"] for job in pending}
+            for future in as_completed(futures):
+                name = futures[future]
+                index[name] = future.result()
+                _save_batch_index(output_root, index)
+                if on_job_done is not None:
+                    on_job_done(name, index[name])
+    else:
+        _save_batch_index(output_root, index)
+
+    return index
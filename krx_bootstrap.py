@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+MAX_CHUNK_ELEMENTS = 4_000_000
+
+SIGNIFICANCE_COLUMNS = [
+    "market",
+    "periods",
+    "observed_cumulative_excess",
+    "cumulative_excess_ci_low",
+    "cumulative_excess_ci_high",
+    "cumulative_excess_p_value",
+    "observed_excess_mdd",
+    "excess_mdd_ci_low",
+    "excess_mdd_ci_high",
+    "excess_mdd_p_value",
+    "n_samples",
+    "block_size",
+]
+
+
+def bootstrap_indices(n_periods: int, n_samples: int, block_size: int, rng: np.random.Generator) -> np.ndarray:
+    if block_size <= 1:
+        return rng.integers(0, n_periods, size=(n_samples, n_periods))
+    n_blocks = -(-n_periods // block_size)
+    starts = rng.integers(0, n_periods, size=(n_samples, n_blocks))
+    indices = (starts[:, :, None] + np.arange(block_size)) % n_periods
+    return indices.reshape(n_samples, n_blocks * block_size)[:, :n_periods]
+
+
+def _path_metrics(samples: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    cumulative = np.cumprod(1 + samples, axis=1)
+    peak = np.maximum.accumulate(cumulative, axis=1)
+    return cumulative[:, -1] - 1, (cumulative / peak - 1).min(axis=1)
+
+
+def bootstrap_excess_returns(
+    excess_returns: pd.Series,
+    n_samples: int = 10_000,
+    block_size: int = 1,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> dict[str, float]:
+    if n_samples < 1:
+        raise ValueError("n_samples must be at least 1")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1")
+
+    returns = pd.Series(excess_returns).fillna(0.0).to_numpy(dtype=float)
+    n_periods = len(returns)
+    result = {
+        "periods": n_periods,
+        "n_samples": n_samples,
+        "block_size": block_size,
+    }
+    if n_periods == 0:
+        result.update(
+            observed_cumulative_excess=0.0,
+            cumulative_excess_ci_low=0.0,
+            cumulative_excess_ci_high=0.0,
+            cumulative_excess_p_value=1.0,
+            observed_excess_mdd=0.0,
+            excess_mdd_ci_low=0.0,
+            excess_mdd_ci_high=0.0,
+            excess_mdd_p_value=1.0,
+        )
+        return result
+
+    observed_total, observed_mdd = _path_metrics(returns[None, :])
+    centered = returns - returns.mean()
+
+    rng = np.random.default_rng(seed)
+    sample_totals = np.empty(n_samples)
+    sample_mdds = np.empty(n_samples)
+    null_totals = np.empty(n_samples)
+    null_mdds = np.empty(n_samples)
+    chunk = max(1, MAX_CHUNK_ELEMENTS // n_periods)
+    for start in range(0, n_samples, chunk):
+        stop = min(start + chunk, n_samples)
+        indices = bootstrap_indices(n_periods, stop - start, block_size, rng)
+        sample_totals[start:stop], sample_mdds[start:stop] = _path_metrics(returns[indices])
+        null_totals[start:stop], null_mdds[start:stop] = _path_metrics(centered[indices])
+
+    alpha = (1 - confidence) / 2
+    total_low, total_high = np.quantile(sample_totals, [alpha, 1 - alpha])
+    mdd_low, mdd_high = np.quantile(sample_mdds, [alpha, 1 - alpha])
+
+    result.update(
+        observed_cumulative_excess=float(observed_total[0]),
+        cumulative_excess_ci_low=float(total_low),
+        cumulative_excess_ci_high=float(total_high),
+        cumulative_excess_p_value=float((np.sum(null_totals >= observed_total[0]) + 1) / (n_samples + 1)),
+        observed_excess_mdd=float(observed_mdd[0]),
+        excess_mdd_ci_low=float(mdd_low),
+        excess_mdd_ci_high=float(mdd_high),
+        excess_mdd_p_value=float((np.sum(null_mdds <= observed_mdd[0]) + 1) / (n_samples + 1)),
+    )
+    return result
+
+
+def create_significance_report(
+    market_results: dict[str, pd.DataFrame],
+    n_samples: int = 10_000,
+    block_size: int = 1,
+    confidence: float = 0.95,
+    seed: Optional[int] = None,
+) -> pd.DataFrame:
+    rows: list[dict] = []
+    for market, market_df in market_results.items():
+        excess = market_df["excess_return"] if "excess_return" in market_df.columns else pd.Series(dtype=float)
+        row = bootstrap_excess_returns(
+            excess,
+            n_samples=n_samples,
+            block_size=block_size,
+            confidence=confidence,
+            seed=seed,
+        )
+        row["market"] = market
+        rows.append(row)
+    return pd.DataFrame(rows, columns=SIGNIFICANCE_COLUMNS)
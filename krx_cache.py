@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import pandas as pd
+
+from app_runtime import CACHE_DIR
+
+NEGATIVE_CACHE_FILE = "negative_cache.json"
+DATA_CACHE_DIR = "data"
+VOLATILE_TTL = timedelta(minutes=10)
+ERROR_TTL = timedelta(hours=1)
+IN_PROGRESS_SUFFIX = ".inprogress"
+LOCK_SUFFIX = ".lock"
+STALE_MARKER_SEC = 300.0
+LOCK_STALE_SEC = 10.0
+LOCK_TIMEOUT_SEC = 30.0
+MARKER_POLL_SEC = 0.2
+
+
+def is_transient_error(exc: BaseException) -> bool:
+    return isinstance(exc, (OSError, TimeoutError))
+
+
+def empty_result_ttl(as_of_date: str) -> Optional[timedelta]:
+    return None if datetime.strptime(as_of_date, "%Y%m%d").weekday() >= 5 else ERROR_TTL
+
+
+def write_atomic(path: Path, write: Callable[[Path], None]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def try_create_marker(path: Path) -> bool:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as handle:
+        handle.write(json.dumps({"pid": os.getpid(), "created_at": time.time()}))
+    return True
+
+
+def marker_owner_alive(path: Path) -> Optional[bool]:
+    try:
+        pid = int(json.loads(path.read_text(encoding="utf-8"))["pid"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+def is_stale_marker(path: Path, stale_sec: float = STALE_MARKER_SEC) -> bool:
+    if marker_owner_alive(path) is False:
+        return True
+    try:
+        return time.time() - path.stat().st_mtime > stale_sec
+    except FileNotFoundError:
+        return True
+
+
+@contextmanager
+def file_lock(path: Path, timeout: float = LOCK_TIMEOUT_SEC, stale_sec: float = LOCK_STALE_SEC) -> Iterator[None]:
+    deadline = time.monotonic() + timeout
+    while not try_create_marker(path):
+        if is_stale_marker(path, stale_sec):
+            path.unlink(missing_ok=True)
+            continue
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"cache lock timeout: {path}")
+        time.sleep(MARKER_POLL_SEC / 4)
+    try:
+        yield
+    finally:
+        path.unlink(missing_ok=True)
+
+
+class NegativeCache:
+    def __init__(self, path: Path, clock: Callable[[], datetime] = datetime.now):
+        self.path = Path(path)
+        self._clock = clock
+        self._entries: Optional[dict[str, dict[str, Any]]] = None
+        self._signature: Optional[tuple[int, int]] = None
+        self._lock = threading.Lock()
+        self._lock_path = self.path.with_name(f"{self.path.name}{LOCK_SUFFIX}")
+
+    @staticmethod
+    def _key(kind: str, parts: tuple[str, ...]) -> str:
+        return "|".join((kind, *parts))
+
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        signature = self._file_signature()
+        if self._entries is None or signature != self._signature:
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                raw = {}
+            self._entries = raw if isinstance(raw, dict) else {}
+            self._signature = signature
+        return self._entries
+
+    def _save(self) -> None:
+        payload = json.dumps(self._entries, ensure_ascii=False, indent=0)
+        write_atomic(self.path, lambda tmp: tmp.write_text(payload, encoding="utf-8"))
+        self._signature = self._file_signature()
+
+    @contextmanager
+    def _update(self) -> Iterator[dict[str, dict[str, Any]]]:
+        with self._lock, file_lock(self._lock_path):
+            yield self._load()
+
+    def _is_expired(self, entry: dict[str, Any]) -> bool:
+        if entry.get("expires_at"):
+            return self._clock() > datetime.strptime(entry["expires_at"], "%Y-%m-%d %H:%M:%S")
+        if not entry.get("volatile"):
+            return False
+        recorded_at = datetime.strptime(entry["recorded_at"], "%Y-%m-%d %H:%M:%S")
+        return self._clock() - recorded_at > VOLATILE_TTL
+
+    def lookup(self, kind: str, *parts: str) -> Optional[dict[str, Any]]:
+        key = self._key(kind, parts)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            if not self._is_expired(entry):
+                return dict(entry)
+        with self._update() as entries:
+            entry = entries.get(key)
+            if entry is not None and self._is_expired(entry):
+                del entries[key]
+                self._save()
+        return None
+
+    def record(
+        self,
+        kind: str,
+        *parts: str,
+        reason: str,
+        as_of_date: str,
+        ttl: Optional[timedelta] = None,
+    ) -> None:
+        now = self._clock()
+        entry = {
+            "reason": reason,
+            "recorded_at": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "volatile": as_of_date >= now.strftime("%Y%m%d"),
+        }
+        if ttl is not None:
+            entry["expires_at"] = (now + ttl).strftime("%Y-%m-%d %H:%M:%S")
+        with self._update() as entries:
+            entries[self._key(kind, parts)] = entry
+            self._save()
+
+    def invalidate(self, kind: Optional[str] = None) -> int:
+        with self._update() as entries:
+            keys = [key for key in entries if kind is None or key.startswith(f"{kind}|")]
+            for key in keys:
+                del entries[key]
+            self._save()
+        return len(keys)
+
+    def entries(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._load().items()}
+
+    def merge(self, entries: dict[str, dict[str, Any]]) -> int:
+        with self._update() as current:
+            added = [key for key in entries if key not in current]
+            for key in added:
+                current[key] = dict(entries[key])
+            if added:
+                self._save()
+        return len(added)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+class DiskCache:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _path(self, kind: str, parts: tuple[str, ...], suffix: str) -> Path:
+        return self.root / kind / f"{'_'.join(parts)}{suffix}"
+
+    def get_frame(self, kind: str, *parts: str) -> Optional[pd.DataFrame]:
+        path = self._path(kind, parts, ".parquet")
+        try:
+            return pd.read_parquet(path)
+        except (OSError, ValueError):
+            return None
+
+    def put_frame(self, kind: str, *parts: str, frame: pd.DataFrame) -> None:
+        write_atomic(self._path(kind, parts, ".parquet"), lambda tmp: frame.to_parquet(tmp))
+
+    def list_parts(self, kind: str, prefix: str = "") -> list[str]:
+        return sorted(path.stem for path in (self.root / kind).glob(f"{prefix}*.parquet"))
+
+    def get_value(self, kind: str, *parts: str) -> Optional[Any]:
+        path = self._path(kind, parts, ".json")
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))["value"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put_value(self, kind: str, *parts: str, value: Any) -> None:
+        payload = json.dumps({"value": value}, ensure_ascii=False)
+        write_atomic(self._path(kind, parts, ".json"), lambda tmp: tmp.write_text(payload, encoding="utf-8"))
+
+    def marker_path(self, kind: str, *parts: str) -> Path:
+        return self._path(kind, parts, IN_PROGRESS_SUFFIX)
+
+    def get_or_fill_frame(
+        self,
+        kind: str,
+        *parts: str,
+        fetch: Callable[[], pd.DataFrame],
+        stale_sec: float = STALE_MARKER_SEC,
+    ) -> tuple[pd.DataFrame, bool]:
+        marker = self.marker_path(kind, *parts)
+        while True:
+            cached = self.get_frame(kind, *parts)
+            if cached is not None:
+                return cached, True
+            if try_create_marker(marker):
+                break
+            if is_stale_marker(marker, stale_sec):
+                marker.unlink(missing_ok=True)
+                continue
+            time.sleep(MARKER_POLL_SEC)
+
+        try:
+            cached = self.get_frame(kind, *parts)
+            if cached is not None:
+                return cached, True
+            frame = fetch()
+            if not frame.empty:
+                self.put_frame(kind, *parts, frame=frame)
+            return frame, False
+        finally:
+            marker.unlink(missing_ok=True)
+
+
+_CACHE_DIR = CACHE_DIR
+_DISK_CACHE_ENABLED = True
+_NEGATIVE_CACHE: Optional[NegativeCache] = None
+_DISK_CACHE: Optional[DiskCache] = None
+_CONFIG_LOCK = threading.Lock()
+
+
+def configure_cache_dir(cache_dir, disk_cache_enabled: Optional[bool] = None) -> Path:
+    global _CACHE_DIR, _NEGATIVE_CACHE, _DISK_CACHE, _DISK_CACHE_ENABLED
+    with _CONFIG_LOCK:
+        _CACHE_DIR = Path(cache_dir)
+        if disk_cache_enabled is not None:
+            _DISK_CACHE_ENABLED = disk_cache_enabled
+        _NEGATIVE_CACHE = None
+        _DISK_CACHE = None
+    return _CACHE_DIR
+
+
+def is_historical(as_of_date: str) -> bool:
+    return as_of_date < datetime.now().strftime("%Y%m%d")
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    global _DISK_CACHE
+    with _CONFIG_LOCK:
+        if not _DISK_CACHE_ENABLED:
+            return None
+        if _DISK_CACHE is None:
+            _DISK_CACHE = DiskCache(_CACHE_DIR / DATA_CACHE_DIR)
+        return _DISK_CACHE
+
+
+def get_cache_dir() -> Path:
+    return _CACHE_DIR
+
+
+def get_negative_cache() -> NegativeCache:
+    global _NEGATIVE_CACHE
+    with _CONFIG_LOCK:
+        if _NEGATIVE_CACHE is None:
+            _NEGATIVE_CACHE = NegativeCache(_CACHE_DIR / NEGATIVE_CACHE_FILE)
+        return _NEGATIVE_CACHE
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+from datetime import datetime
+from pathlib import Path, PurePosixPath
+from typing import Any, Optional
+
+import krx_cache
+
+BUNDLE_FORMAT_VERSION = 1
+MANIFEST_NAME = "bundle_manifest.json"
+CHUNK_SIZE = 1024 * 1024
+_DATE_TOKEN = re.compile(r"^\d{8}$")
+
+
+def _normalize_bound(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    normalized = value.strip().replace("-", "")
+    if not _DATE_TOKEN.match(normalized):
+        raise ValueError("date must be YYYYMMDD or YYYY-MM-DD")
+    return normalized
+
+
+def _in_range(tokens: list[str], start_date: Optional[str], end_date: Optional[str]) -> bool:
+    dates = [token for token in tokens if _DATE_TOKEN.match(token)]
+    if not dates:
+        return True
+    first, last = min(dates), max(dates)
+    if start_date and last < start_date:
+        return False
+    if end_date and first > end_date:
+        return False
+    return True
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _file_digest(path: Path) -> tuple[str, int]:
+    digest = hashlib.sha256()
+    size = 0
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+class _HashingReader:
+    def __init__(self, handle):
+        self._handle = handle
+        self.digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._handle.read(size)
+        self.digest.update(chunk)
+        return chunk
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(datetime.now().timestamp())
+    tar.addfile(info, io.BytesIO(data))
+
+
+def _add_file(tar: tarfile.TarFile, name: str, path: Path, meta: dict[str, Any]) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = meta["size"]
+    info.mtime = int(datetime.now().timestamp())
+    with open(path, "rb") as handle:
+        reader = _HashingReader(handle)
+        tar.addfile(info, reader)
+    if reader.digest.hexdigest() != meta["sha256"]:
+        raise ValueError(f"cache file changed during export: {name}")
+
+
+def export_cache_bundle(
+    bundle_path: str,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+) -> dict[str, Any]:
+    start_date = _normalize_bound(start_date)
+    end_date = _normalize_bound(end_date)
+    root = Path(cache_dir) if cache_dir else krx_cache.get_cache_dir()
+    data_root = root / krx_cache.DATA_CACHE_DIR
+
+    files: dict[str, dict[str, Any]] = {}
+    sources: dict[str, Path] = {}
+    if data_root.exists():
+        for path in sorted(data_root.rglob("*")):
+            if not path.is_file() or path.suffix not in (".parquet", ".json"):
+                continue
+            if not _in_range(path.stem.split("_"), start_date, end_date):
+                continue
+            name = path.relative_to(root).as_posix()
+            sha256, size = _file_digest(path)
+            files[name] = {"sha256": sha256, "size": size}
+            sources[name] = path
+
+    negative_cache = krx_cache.NegativeCache(root / krx_cache.NEGATIVE_CACHE_FILE)
+    negative_entries = {
+        key: entry
+        for key, entry in negative_cache.entries().items()
+        if not entry.get("volatile") and _in_range(key.split("|")[1:], start_date, end_date)
+    }
+    negative_payload = json.dumps(negative_entries, ensure_ascii=False).encode("utf-8")
+    if negative_entries:
+        files[krx_cache.NEGATIVE_CACHE_FILE] = {"sha256": _sha256(negative_payload), "size": len(negative_payload)}
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "start_date": start_date,
+        "end_date": end_date,
+        "negative_entries": len(negative_entries),
+        "files": files,
+    }
+
+    output = Path(bundle_path)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f"{output.name}.{os.getpid()}.tmp")
+    try:
+        with tarfile.open(tmp_path, "w:gz") as tar:
+            _add_bytes(tar, MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+            for name, path in sources.items():
+                _add_file(tar, name, path, files[name])
+            if negative_entries:
+                _add_bytes(tar, krx_cache.NEGATIVE_CACHE_FILE, negative_payload)
+        os.replace(tmp_path, output)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+    return {
+        "path": str(output),
+        "files": len(files) - int(bool(negative_entries)),
+        "bytes": sum(entry["size"] for entry in files.values()),
+        "negative_entries": len(negative_entries),
+    }
+
+
+def _is_safe_member(name: str) -> bool:
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts:
+        return False
+    return name == krx_cache.NEGATIVE_CACHE_FILE or path.parts[0] == krx_cache.DATA_CACHE_DIR
+
+
+def read_bundle_manifest(bundle_path: str) -> dict[str, Any]:
+    with tarfile.open(bundle_path, "r:gz") as tar:
+        member = tar.extractfile(MANIFEST_NAME)
+        if member is None:
+            raise ValueError(f"bundle manifest missing: {bundle_path}")
+        manifest = json.loads(member.read().decode("utf-8"))
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"unsupported bundle format_version: {manifest.get('format_version')}")
+    return manifest
+
+
+def import_cache_bundle(
+    bundle_path: str,
+    cache_dir: Optional[str] = None,
+    overwrite: bool = False,
+) -> dict[str, Any]:
+    manifest = read_bundle_manifest(bundle_path)
+    expected = manifest["files"]
+    unsafe = [name for name in expected if not _is_safe_member(name)]
+    if unsafe:
+        raise ValueError(f"unsafe paths in bundle: {', '.join(unsafe)}")
+
+    root = Path(cache_dir) if cache_dir else krx_cache.get_cache_dir()
+    root.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{root.name}-import-", dir=root.parent))
+    try:
+        staged: dict[str, Path] = {}
+        with tarfile.open(bundle_path, "r|gz") as tar:
+            for member in tar:
+                meta = expected.get(member.name)
+                if meta is None or member.name in staged:
+                    continue
+                source = tar.extractfile(member)
+                if source is None:
+                    raise ValueError(f"bundle file missing: {member.name}")
+                staged_path = staging / f"{len(staged)}.part"
+                digest = hashlib.sha256()
+                size = 0
+                with open(staged_path, "wb") as handle:
+                    for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        handle.write(chunk)
+                if size != meta["size"] or digest.hexdigest() != meta["sha256"]:
+                    raise ValueError(f"checksum mismatch: {member.name}")
+                staged[member.name] = staged_path
+        missing = [name for name in expected if name not in staged]
+        if missing:
+            raise ValueError(f"bundle file missing: {missing[0]}")
+
+        imported = 0
+        skipped = 0
+        negative_added = 0
+        for name, staged_path in staged.items():
+            if name == krx_cache.NEGATIVE_CACHE_FILE:
+                entries = json.loads(staged_path.read_text(encoding="utf-8"))
+                if root == krx_cache.get_cache_dir():
+                    negative_added = krx_cache.get_negative_cache().merge(entries)
+                else:
+                    negative_added = krx_cache.NegativeCache(root / name).merge(entries)
+                continue
+            target = root / name
+            if target.exists() and not overwrite:
+                skipped += 1
+                continue
+            krx_cache.write_atomic(target, lambda tmp, source=staged_path: shutil.move(source, tmp))
+            imported += 1
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return {
+        "imported": imported,
+        "skipped": skipped,
+        "negative_entries": negative_added,
+        "start_date": manifest.get("start_date"),
+        "end_date": manifest.get("end_date"),
+    }
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import ast
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_EXPRESSION = "inv(PER) + inv(PBR) + DIV / 100"
+SCORE_COLUMN = "TAT"
+
+ArrayFn = Callable[[dict[str, np.ndarray]], Union[np.ndarray, float]]
+
+
+def _inv(values):
+    return np.where(values > 0, 1 / values, 0.0)
+
+
+def _clip(values, lower, upper):
+    return np.clip(values, lower, upper)
+
+
+def _rank(values):
+    return pd.Series(np.atleast_1d(values)).rank(pct=True).to_numpy()
+
+
+def _zscore(values):
+    std = np.nanstd(values)
+    if not np.isfinite(std) or std == 0:
+        return np.zeros_like(values, dtype=float)
+    return (values - np.nanmean(values)) / std
+
+
+def _log(values):
+    return np.where(values > 0, np.log(np.where(values > 0, values, 1.0)), np.nan)
+
+
+FUNCTIONS: dict[str, tuple[Callable, int]] = {
+    "inv": (_inv, 1),
+    "clip": (_clip, 3),
+    "rank": (_rank, 1),
+    "zscore": (_zscore, 1),
+    "log": (_log, 1),
+    "abs": (np.abs, 1),
+}
+
+CROSS_SECTIONAL_FUNCTIONS = {"rank", "zscore"}
+
+_BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+
+
+@dataclass(frozen=True)
+class FactorTerm:
+    label: str
+    source: str
+    evaluate: ArrayFn
+
+    @property
+    def column(self) -> str:
+        return f"{self.label} 기여"
+
+
+@dataclass(frozen=True)
+class FactorExpression:
+    source: str
+    terms: tuple[FactorTerm, ...]
+    fields: tuple[str, ...]
+    cross_sectional: bool = False
+
+    @property
+    def contribution_columns(self) -> list[str]:
+        return [term.column for term in self.terms]
+
+    def contribution_values(self, df: pd.DataFrame) -> np.ndarray:
+        missing = [name for name in self.fields if name not in df.columns]
+        if missing:
+            raise ValueError(f"unknown fields in score expression: {', '.join(missing)}")
+
+        env = {name: pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float) for name in self.fields}
+        values = np.empty((len(df), len(self.terms)))
+        with np.errstate(all="ignore"):
+            for i, term in enumerate(self.terms):
+                term_values = np.broadcast_to(np.asarray(term.evaluate(env), dtype=float), (len(df),))
+                values[:, i] = np.where(np.isfinite(term_values), term_values, 0.0)
+        return values
+
+    def contributions(self, df: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(self.contribution_values(df), index=df.index, columns=self.contribution_columns)
+
+    def apply(self, df: pd.DataFrame, score_column: str = SCORE_COLUMN) -> pd.DataFrame:
+        values = self.contribution_values(df)
+        result_df = df.copy()
+        result_df[self.contribution_columns] = values
+        result_df[score_column] = values.sum(axis=1)
+        return result_df
+
+    def top(self, df: pd.DataFrame, n: int, score_column: str = SCORE_COLUMN) -> pd.DataFrame:
+        values = self.contribution_values(df)
+        scores = values.sum(axis=1)
+        by_ticker = np.argsort(df.index.astype(str).to_numpy(), kind="stable")
+        selected = by_ticker[np.argsort(-scores[by_ticker], kind="stable")][:n]
+        result_df = df.iloc[selected].copy()
+        result_df[self.contribution_columns] = values[selected]
+        result_df[score_column] = scores[selected]
+        return result_df
+
+
+def _compile_node(node: ast.AST, fields: list[str]) -> ArrayFn:
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        value = float(node.value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in FUNCTIONS:
+            raise ValueError(f"function used as a field in score expression: {name}")
+        if name not in fields:
+            fields.append(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        operand = _compile_node(node.operand, fields)
+        if isinstance(node.op, ast.USub):
+            return lambda env: -operand(env)
+        return operand
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        op = _BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left, fields)
+        right = _compile_node(node.right, fields)
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id not in FUNCTIONS:
+            raise ValueError(f"unknown function in score expression: {node.func.id}")
+        func, arity = FUNCTIONS[node.func.id]
+        if node.keywords or len(node.args) != arity:
+            raise ValueError(f"{node.func.id}() takes {arity} positional argument(s)")
+        args = [_compile_node(arg, fields) for arg in node.args]
+        return lambda env: func(*(arg(env) for arg in args))
+
+    raise ValueError(f"unsupported syntax in score expression: {ast.unparse(node)}")
+
+
+def _split_terms(node: ast.AST, negative: bool = False) -> list[tuple[bool, ast.AST]]:
+    if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.Add, ast.Sub)):
+        right_negative = negative if isinstance(node.op, ast.Add) else not negative
+        return _split_terms(node.left, negative) + _split_terms(node.right, right_negative)
+    return [(negative, node)]
+
+
+def compile_factor_expression(expression: Optional[str] = None) -> FactorExpression:
+    return _compile_source((expression or DEFAULT_EXPRESSION).strip())
+
+
+@lru_cache(maxsize=64)
+def _compile_source(source: str) -> FactorExpression:
+    try:
+        tree = ast.parse(source, mode="eval")
+    except SyntaxError as exc:
+        raise ValueError(f"invalid score expression: {exc.msg}") from exc
+
+    fields: list[str] = []
+    compiled: list[tuple[str, list[str], ArrayFn]] = []
+    for negative, node in _split_terms(tree.body):
+        term_fields: list[str] = []
+        evaluate = _compile_node(node, term_fields)
+        if negative:
+            evaluate = (lambda inner: lambda env: -inner(env))(evaluate)
+        term_source = f"-{ast.unparse(node)}" if negative else ast.unparse(node)
+        compiled.append((term_source, term_fields, evaluate))
+        fields.extend(name for name in term_fields if name not in fields)
+
+    field_usage = {name: sum(name in term_fields for _, term_fields, _ in compiled) for name in fields}
+    terms: list[FactorTerm] = []
+    used_labels: set[str] = set()
+    for term_source, term_fields, evaluate in compiled:
+        if len(term_fields) == 1 and field_usage[term_fields[0]] == 1:
+            label = term_fields[0]
+        else:
+            label = term_source
+        if label in used_labels:
+            raise ValueError(f"duplicate term in score expression: {term_source}")
+        used_labels.add(label)
+        terms.append(FactorTerm(label=label, source=term_source, evaluate=evaluate))
+
+    cross_sectional = any(
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in CROSS_SECTIONAL_FUNCTIONS
+        for node in ast.walk(tree)
+    )
+    return FactorExpression(source=source, terms=tuple(terms), fields=tuple(fields), cross_sectional=cross_sectional)
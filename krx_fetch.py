@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+import pandas as pd
+
+import krx_cache
+
+DEFAULT_RATE_PER_SEC = 2.0
+DEFAULT_BURST = 4
+DEFAULT_POOL_SIZE = 8
+SLOW_QUEUE_LOG_SEC = 1.0
+OFFLINE_ENV_VAR = "TATSUROLIST_KRX_OFFLINE"
+
+_logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate_per_sec <= 0:
+            raise ValueError("rate_per_sec must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate_per_sec = float(rate_per_sec)
+        self.burst = int(burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        with self._lock:
+            wait_sec = self._reserve(self._clock())
+
+        if wait_sec > 0:
+            self._sleep(wait_sec)
+        return wait_sec
+
+    def _reserve(self, now: float) -> float:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate_per_sec)
+        self._updated_at = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_sec
+
+
+class SharedTokenBucket(TokenBucket):
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: int = 1,
+        state=None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__(rate_per_sec, burst, clock, sleep)
+        self.state = state if state is not None else multiprocessing.Array("d", [float(self.burst), self._updated_at])
+        self._lock = self.state.get_lock()
+
+    def _reserve(self, now: float) -> float:
+        tokens = min(self.burst, self.state[0] + (now - self.state[1]) * self.rate_per_sec) - 1
+        self.state[0] = tokens
+        self.state[1] = now
+        return 0.0 if tokens >= 0 else -tokens / self.rate_per_sec
+
+
+class OfflineError(ConnectionError):
+    pass
+
+
+class _PooledRequests:
+    def __init__(self, requests_module, session):
+        self._requests = requests_module
+        self._session = session
+
+    def Session(self):
+        return self._session
+
+    def get(self, url, **kwargs):
+        return self._session.get(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._session.post(url, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._requests, name)
+
+
+class _MountedRequests(_PooledRequests):
+    def Session(self):
+        session = self._requests.Session()
+        _mount_adapter(session, _POOL_SIZE)
+        return session
+
+
+_LIMITER = TokenBucket(DEFAULT_RATE_PER_SEC, DEFAULT_BURST)
+_POOL_SIZE = DEFAULT_POOL_SIZE
+_OFFLINE = os.environ.get(OFFLINE_ENV_VAR, "") == "1"
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+_STATS_LOCK = threading.Lock()
+_STATS: dict[str, Any] = {
+    "calls": 0,
+    "cache_hits": 0,
+    "errors": 0,
+    "queue_wait_sec": 0.0,
+    "max_queue_wait_sec": 0.0,
+    "by_endpoint": {},
+}
+
+
+def configure_fetch(
+    rate_per_sec: Optional[float] = None,
+    burst: Optional[int] = None,
+    pool_size: Optional[int] = None,
+    offline: Optional[bool] = None,
+    limiter: Optional[TokenBucket] = None,
+) -> None:
+    global _LIMITER, _POOL_SIZE, _SESSION, _OFFLINE
+    if offline is not None:
+        _OFFLINE = offline
+    if limiter is not None:
+        _LIMITER = limiter
+    elif rate_per_sec is not None or burst is not None:
+        _LIMITER = TokenBucket(
+            rate_per_sec if rate_per_sec is not None else _LIMITER.rate_per_sec,
+            burst if burst is not None else _LIMITER.burst,
+        )
+    if pool_size is not None and pool_size != _POOL_SIZE:
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        with _SESSION_LOCK:
+            _POOL_SIZE = pool_size
+            if _SESSION is not None:
+                _mount_adapter(_SESSION, pool_size)
+                _mount_auth_session(pool_size)
+
+
+def _mount_adapter(session, pool_size: int) -> None:
+    from requests.adapters import HTTPAdapter
+
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def _mount_auth_session(pool_size: int) -> None:
+    try:
+        from pykrx.website.comm import auth
+    except ImportError:
+        return
+    auth_session = getattr(auth, "_auth_session", None)
+    if auth_session is not None:
+        _mount_adapter(auth_session.session, pool_size)
+
+
+def get_http_session():
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            import requests
+
+            session = requests.Session()
+            _mount_adapter(session, _POOL_SIZE)
+            try:
+                from pykrx.website.comm import auth, webio
+
+                webio.requests = _PooledRequests(requests, session)
+                auth.requests = _MountedRequests(requests, session)
+                _mount_auth_session(_POOL_SIZE)
+            except (ImportError, AttributeError) as exc:
+                _logger.warning("pykrx 세션 풀 연결 실패, 기본 요청 경로 사용: %s", exc)
+            _SESSION = session
+        return _SESSION
+
+
+def get_fetch_stats() -> dict[str, Any]:
+    with _STATS_LOCK:
+        stats = dict(_STATS)
+        stats["by_endpoint"] = dict(_STATS["by_endpoint"])
+    stats["avg_queue_wait_sec"] = stats["queue_wait_sec"] / stats["calls"] if stats["calls"] else 0.0
+    return stats
+
+
+def reset_fetch_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.update(calls=0, cache_hits=0, errors=0, queue_wait_sec=0.0, max_queue_wait_sec=0.0, by_endpoint={})
+
+
+def _record_call(endpoint: str, wait_sec: float, failed: bool) -> None:
+    with _STATS_LOCK:
+        _STATS["calls"] += 1
+        _STATS["errors"] += int(failed)
+        _STATS["queue_wait_sec"] += wait_sec
+        _STATS["max_queue_wait_sec"] = max(_STATS["max_queue_wait_sec"], wait_sec)
+        _STATS["by_endpoint"][endpoint] = _STATS["by_endpoint"].get(endpoint, 0) + 1
+
+
+def is_offline() -> bool:
+    return _OFFLINE
+
+
+def call_upstream(endpoint: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+    if _OFFLINE:
+        _record_call(endpoint, 0.0, failed=True)
+        raise OfflineError(f"offline mode: {endpoint} is not in the local cache")
+    get_http_session()
+    wait_sec = _LIMITER.acquire()
+    if wait_sec >= SLOW_QUEUE_LOG_SEC:
+        _logger.info(
+            "KRX 요청 대기 | endpoint=%s | wait=%.2fs",
+            endpoint,
+            wait_sec,
+            extra={"event": "upstream_wait", "endpoint": endpoint, "queue_wait_sec": round(wait_sec, 3)},
+        )
+    try:
+        result = func(*args, **kwargs)
+    except Exception:
+        _record_call(endpoint, wait_sec, failed=True)
+        raise
+    _record_call(endpoint, wait_sec, failed=False)
+    return result
+
+
+def _stock():
+    from pykrx import stock
+
+    return stock
+
+
+def _record_cache_hit() -> None:
+    with _STATS_LOCK:
+        _STATS["cache_hits"] += 1
+
+
+def _cached_frame(kind: str, parts: tuple[str, ...], as_of_date: str, fetch: Callable[[], Any]):
+    disk_cache = krx_cache.get_disk_cache() if krx_cache.is_historical(as_of_date) else None
+    if disk_cache is None:
+        return call_upstream(kind, fetch)
+
+    frame, hit = disk_cache.get_or_fill_frame(kind, *parts, fetch=lambda: call_upstream(kind, fetch))
+    if hit:
+        _record_cache_hit()
+    return frame
+
+
+def _covering_range_frame(disk_cache, kind: str, ticker: str, fromdate: str, todate: str):
+    ranges = []
+    for part in disk_cache.list_parts(kind, prefix=f"{ticker}_"):
+        cached_ticker, start, end = part.rsplit("_", 2)
+        if cached_ticker != ticker:
+            continue
+        if (start, end) == (fromdate, todate):
+            return None
+        if start <= fromdate and todate <= end:
+            ranges.append((start, end))
+    for start, end in sorted(ranges, key=lambda item: int(item[1]) - int(item[0])):
+        frame = disk_cache.get_frame(kind, ticker, start, end)
+        if frame is None:
+            continue
+        dates = pd.to_datetime(frame.index).strftime("%Y%m%d")
+        return frame[(dates >= fromdate) & (dates <= todate)]
+    return None
+
+
+def _cached_range(kind: str, ticker: str, fromdate: str, todate: str, fetch: Callable[[], Any]):
+    disk_cache = krx_cache.get_disk_cache() if krx_cache.is_historical(todate) else None
+    if disk_cache is not None:
+        covering = _covering_range_frame(disk_cache, kind, ticker, fromdate, todate)
+        if covering is not None:
+            _record_cache_hit()
+            return covering
+    return _cached_frame(kind, (ticker, fromdate, todate), todate, fetch)
+
+
+def get_market_cap_by_ticker(date: str, market: str):
+    return _cached_frame(
+        "market_cap",
+        (market, date),
+        date,
+        lambda: _stock().get_market_cap_by_ticker(date, market=market),
+    )
+
+
+def get_market_fundamental_by_ticker(date: str, market: str):
+    return _cached_frame(
+        "market_fundamental",
+        (market, date),
+        date,
+        lambda: _stock().get_market_fundamental_by_ticker(date, market=market),
+    )
+
+
+def get_cached_ticker_name(ticker: str) -> Optional[str]:
+    disk_cache = krx_cache.get_disk_cache()
+    return disk_cache.get_value("ticker_name", ticker) if disk_cache is not None else None
+
+
+def get_market_ticker_name(ticker: str) -> str:
+    cached = get_cached_ticker_name(ticker)
+    if cached is not None:
+        _record_cache_hit()
+        return cached
+
+    name = call_upstream("ticker_name", lambda: _stock().get_market_ticker_name(ticker))
+    disk_cache = krx_cache.get_disk_cache()
+    if disk_cache is not None and isinstance(name, str) and name:
+        disk_cache.put_value("ticker_name", ticker, value=name)
+    return name
+
+
+def get_market_ohlcv_by_ticker(date: str, market: str):
+    return _cached_frame(
+        "ohlcv_by_ticker",
+        (market, date),
+        date,
+        lambda: _stock().get_market_ohlcv_by_ticker(date, market=market),
+    )
+
+
+def get_market_ohlcv_by_date(fromdate: str, todate: str, ticker: str):
+    return _cached_range(
+        "ohlcv_by_date",
+        ticker,
+        fromdate,
+        todate,
+        lambda: _stock().get_market_ohlcv_by_date(fromdate, todate, ticker),
+    )
+
+
+def get_index_ohlcv_by_date(fromdate: str, todate: str, ticker: str):
+    return _cached_range(
+        "index_ohlcv_by_date",
+        ticker,
+        fromdate,
+        todate,
+        lambda: _stock().get_index_ohlcv_by_date(fromdate, todate, ticker),
+    )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from itertools import chain
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+import pandas as pd
+
+import krx_cache
+from krx_factor import compile_factor_expression
+
+HISTORY_DIR = "history"
+HISTORY_DEPTH = 50
+
+
+@dataclass(frozen=True)
+class ScreenProfile:
+    name: str
+    cap_min: int = 500_000_000_000
+    cap_max: int = 1_000_000_000_000
+    per_max: Optional[float] = None
+    pbr_max: Optional[float] = None
+    div_policy: str = "zero"
+    score_expression: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return profile_key(
+            self.cap_min, self.cap_max, self.per_max, self.pbr_max, self.div_policy, self.score_expression
+        )
+
+    def screen_kwargs(self) -> dict[str, Any]:
+        params = asdict(self)
+        params.pop("name")
+        return params
+
+
+STANDARD_PROFILES = (
+    ScreenProfile("small", cap_min=100_000_000_000, cap_max=500_000_000_000),
+    ScreenProfile("default"),
+    ScreenProfile("mid", cap_min=1_000_000_000_000, cap_max=2_000_000_000_000),
+)
+
+_HISTORY_DIR: Optional[Path] = None
+
+
+def profile_key(
+    cap_min: int,
+    cap_max: int,
+    per_max: Optional[float],
+    pbr_max: Optional[float],
+    div_policy: str,
+    score_expression: Optional[str],
+) -> str:
+    payload = json.dumps(
+        [
+            int(cap_min),
+            int(cap_max),
+            None if per_max is None else float(per_max),
+            None if pbr_max is None else float(pbr_max),
+            div_policy.strip().lower(),
+            compile_factor_expression(score_expression).source,
+        ]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def configure_history_dir(history_dir) -> Path:
+    global _HISTORY_DIR
+    _HISTORY_DIR = Path(history_dir) if history_dir is not None else None
+    return get_history_dir()
+
+
+def get_history_dir() -> Path:
+    return _HISTORY_DIR if _HISTORY_DIR is not None else krx_cache.get_cache_dir() / HISTORY_DIR
+
+
+def _entry_path(root: Path, key: str, market: str, date: str) -> Path:
+    return root / key / market / f"{date}.parquet"
+
+
+def write_history_entry(
+    key: str,
+    market: str,
+    date: str,
+    frame: pd.DataFrame,
+    used_date: str,
+    stats: dict[str, int],
+    depth: int,
+    history_dir: Optional[Path] = None,
+) -> Path:
+    root = Path(history_dir) if history_dir is not None else get_history_dir()
+    path = _entry_path(root, key, market, date)
+    stored = frame.copy()
+    stored.attrs = {
+        "used_date": used_date,
+        "total": int(stats.get("total", 0)),
+        "filtered": int(stats.get("filtered", 0)),
+        "depth": int(depth),
+    }
+    krx_cache.write_atomic(path, lambda tmp: stored.to_parquet(tmp))
+    return path
+
+
+def lookup_top_n(
+    market: str,
+    date: str,
+    top_n: int,
+    cap_min: int,
+    cap_max: int,
+    per_max: Optional[float] = None,
+    pbr_max: Optional[float] = None,
+    div_policy: str = "zero",
+    score_expression: Optional[str] = None,
+    history_dir: Optional[Path] = None,
+) -> Optional[tuple[pd.DataFrame, str, dict[str, int]]]:
+    root = Path(history_dir) if history_dir is not None else get_history_dir()
+    key = profile_key(cap_min, cap_max, per_max, pbr_max, div_policy, score_expression)
+    path = _entry_path(root, key, market, date)
+    try:
+        stored = pd.read_parquet(path)
+    except (OSError, ValueError):
+        return None
+
+    meta = stored.attrs
+    if top_n > int(meta.get("depth", 0)) and len(stored) < int(meta.get("filtered", 0)):
+        return None
+    frame = stored.head(top_n).copy()
+    frame.attrs = {}
+    stats = {
+        "total": int(meta.get("total", 0)),
+        "filtered": int(meta.get("filtered", 0)),
+        "final": len(frame),
+    }
+    return frame, str(meta.get("used_date", date)), stats
+
+
+def precompute_history(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[Iterable[str]] = None,
+    markets: Iterable[str] = ("KOSPI", "KOSDAQ"),
+    profiles: Iterable[ScreenProfile] = STANDARD_PROFILES,
+    depth: int = HISTORY_DEPTH,
+    workers: int = 4,
+    overwrite: bool = False,
+    history_dir: Optional[Path] = None,
+    on_done: Optional[Callable[[ScreenProfile, Any], None]] = None,
+    incremental: bool = False,
+) -> dict[str, Any]:
+    from krx_incremental import iter_incremental_screen_results
+    from krx_screening import iter_screen_results, resolve_screen_dates
+    from krx_value_service import clear_query_caches, normalize_market
+
+    if depth < 1:
+        raise ValueError("depth must be positive")
+    root = Path(history_dir) if history_dir is not None else get_history_dir()
+    resolved_dates = [date for date in resolve_screen_dates(start_date, end_date, dates) if krx_cache.is_historical(date)]
+    markets = [normalize_market(market) for market in markets]
+
+    summary: dict[str, Any] = {"written": 0, "skipped": 0, "failed": []}
+    for profile in profiles:
+        key = profile.key
+        pending_dates = resolved_dates
+        if not overwrite:
+            pending_dates = [
+                date
+                for date in resolved_dates
+                if not all(_entry_path(root, key, market, date).exists() for market in markets)
+            ]
+            summary["skipped"] += (len(resolved_dates) - len(pending_dates)) * len(markets)
+
+        if incremental:
+            results = chain.from_iterable(
+                iter_incremental_screen_results(market, pending_dates, top_n=depth, **profile.screen_kwargs())
+                for market in markets
+            )
+        else:
+            results = iter_screen_results(
+                markets, pending_dates, workers=workers, top_n=depth, use_history=False, **profile.screen_kwargs()
+            )
+        for result in results:
+            if on_done is not None:
+                on_done(profile, result)
+            if not result.ok:
+                summary["failed"].append(f"{profile.name} {result.market} {result.date}: {result.error}")
+                continue
+            write_history_entry(
+                key, result.market, result.date, result.frame, result.used_date, result.stats, depth, history_dir=root
+            )
+            summary["written"] += 1
+
+        clear_query_caches()
+        manifest_path = root / key / "profile.json"
+        manifest = {"name": profile.name, **profile.screen_kwargs(), "depth": depth}
+        krx_cache.write_atomic(
+            manifest_path,
+            lambda tmp, payload=json.dumps(manifest, ensure_ascii=False, indent=2): tmp.write_text(payload, encoding="utf-8"),
+        )
+    return summary
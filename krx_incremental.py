@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from krx_factor import SCORE_COLUMN, compile_factor_expression
+from krx_screening import ScreenResult
+from krx_value_service import (
+    BASE_COLUMNS,
+    ScreeningResult,
+    _factor_columns,
+    _load_market_data,
+    _normalize_div_policy,
+    add_ticker_names,
+    normalize_date,
+    normalize_market,
+)
+
+
+@dataclass
+class UniverseDiff:
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    rebuilt: bool = False
+
+    @property
+    def touched(self) -> int:
+        return self.added + self.removed + self.changed
+
+
+class IncrementalScreener:
+    def __init__(
+        self,
+        cap_min: int = 500_000_000_000,
+        cap_max: int = 1_000_000_000_000,
+        per_max: Optional[float] = None,
+        pbr_max: Optional[float] = None,
+        div_policy: str = "zero",
+        score_expression: Optional[str] = None,
+    ):
+        self.cap_min = cap_min
+        self.cap_max = cap_max
+        self.per_max = per_max
+        self.pbr_max = pbr_max
+        self.div_policy = _normalize_div_policy(div_policy)
+        self.factor = compile_factor_expression(score_expression)
+        self._tracked = list(dict.fromkeys(BASE_COLUMNS + list(self.factor.fields)))
+        self.reset()
+
+    def reset(self) -> None:
+        self._universe: Optional[pd.DataFrame] = None
+        self._scores: dict[str, float] = {}
+        self._ranked: list[tuple[float, str]] = []
+        self._loaded_date: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._ranked)
+
+    @property
+    def total(self) -> int:
+        return 0 if self._universe is None else len(self._universe)
+
+    def _eligible(self, df: pd.DataFrame) -> pd.Series:
+        caps = df["시가총액"]
+        mask = (df["PER"] > 0) & (df["PBR"] > 0) & caps.notna() & (caps >= self.cap_min) & (caps <= self.cap_max)
+        if self.per_max is not None:
+            mask &= df["PER"] <= self.per_max
+        if self.pbr_max is not None:
+            mask &= df["PBR"] <= self.pbr_max
+        if self.div_policy == "exclude":
+            mask &= df["DIV"].notna()
+        return mask
+
+    def _insert(self, rows: pd.DataFrame) -> None:
+        rows = rows[self._eligible(rows)]
+        if rows.empty:
+            return
+        scores = self.factor.apply(rows)[SCORE_COLUMN].to_numpy(dtype=float)
+        for ticker, score in zip(rows.index, scores):
+            self._scores[ticker] = float(score)
+            insort(self._ranked, (-float(score), ticker))
+
+    def _discard(self, tickers: Iterable[str]) -> None:
+        for ticker in tickers:
+            score = self._scores.pop(ticker, None)
+            if score is not None:
+                del self._ranked[bisect_left(self._ranked, (-score, ticker))]
+
+    def _rebuild(self, universe: pd.DataFrame) -> UniverseDiff:
+        self.reset()
+        rows = universe[self._eligible(universe)]
+        scores = self.factor.apply(rows)[SCORE_COLUMN].to_numpy(dtype=float)
+        self._scores = {ticker: float(score) for ticker, score in zip(rows.index, scores)}
+        self._ranked = sorted((-score, ticker) for ticker, score in self._scores.items())
+        self._universe = universe
+        return UniverseDiff(added=len(universe), rebuilt=True)
+
+    def update(self, market_cap_df: pd.DataFrame, fundamental_df: pd.DataFrame) -> UniverseDiff:
+        self._loaded_date = None
+        universe = market_cap_df.join(fundamental_df, how="inner")
+        previous = self._universe
+        if (
+            previous is None
+            or self.factor.cross_sectional
+            or not universe.index.is_unique
+            or list(previous.columns) != list(universe.columns)
+        ):
+            return self._rebuild(universe)
+
+        tracked = [column for column in universe.columns if column in self._tracked]
+        removed = previous.index.difference(universe.index)
+        added = universe.index.difference(previous.index)
+        common = universe.index.intersection(previous.index)
+        before = previous.loc[common, tracked]
+        after = universe.loc[common, tracked]
+        same = ((before == after) | (before.isna() & after.isna())).all(axis=1)
+        changed = common[~same.to_numpy()]
+
+        self._discard(removed)
+        self._discard(changed)
+        self._insert(universe.loc[added.append(changed)])
+        self._universe = universe
+        return UniverseDiff(
+            added=len(added),
+            removed=len(removed),
+            changed=len(changed),
+            unchanged=len(common) - len(changed),
+        )
+
+    def load(self, market: str, date: str) -> tuple[str, int]:
+        market_cap_df, fundamental_df, used_date = _load_market_data(market, normalize_date(date), [])
+        if used_date == self._loaded_date:
+            return used_date, 0
+        touched = self.update(market_cap_df, fundamental_df).touched
+        self._loaded_date = used_date
+        return used_date, touched
+
+    def top(self, top_n: int) -> pd.DataFrame:
+        if self._universe is None:
+            raise ValueError("update must be called before top")
+        tickers = [ticker for _, ticker in self._ranked[:top_n]]
+        scored_df = self.factor.apply(self._universe.loc[tickers])
+        return scored_df[(["시장"] if "시장" in scored_df.columns else []) + _factor_columns(self.factor)]
+
+    def result(self, top_n: int, used_date: str) -> ScreeningResult:
+        result_df = add_ticker_names(self.top(top_n))
+        result_df.insert(0, "종목명", result_df.pop("종목명"))
+        return ScreeningResult(
+            _frame=result_df,
+            used_date=used_date,
+            stats={"total": self.total, "filtered": len(self), "final": len(result_df), "cache_hit": 0},
+            contribution_columns=tuple(self.factor.contribution_columns),
+        )
+
+
+def iter_incremental_screen_results(
+    market: str,
+    dates: Iterable[str],
+    top_n: int = 10,
+    **screen_kwargs: Any,
+) -> Iterator[ScreenResult]:
+    normalized_market = normalize_market(market)
+    screener = IncrementalScreener(**screen_kwargs)
+    for date in sorted(dates):
+        try:
+            used_date, touched = screener.load(normalized_market, date)
+            result = screener.result(top_n, used_date)
+        except Exception as exc:
+            screener.reset()
+            yield ScreenResult(market=normalized_market, date=date, error=str(exc))
+            continue
+        yield ScreenResult(
+            market=normalized_market,
+            date=date,
+            used_date=used_date,
+            frame=result.to_frame(),
+            stats=dict(result.stats, touched=touched),
+        )
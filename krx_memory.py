@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import pandas as pd
+
+MEMORY_PROFILE_ENV_VAR = "TATSUROLIST_MEMORY_PROFILE"
+DEFAULT_TRACE_FRAMES = 1
+KB = 1024
+
+_logger = logging.getLogger(__name__)
+
+_ENABLED = os.environ.get(MEMORY_PROFILE_ENV_VAR, "") == "1"
+_LOCK = threading.Lock()
+_OPEN_FRAMES: dict[int, dict[str, float]] = {}
+_STAGES: dict[str, dict[str, float]] = {}
+_PEAK_BYTES = 0
+_STARTED_TRACING = False
+
+
+def configure_memory_profiling(enabled: bool, trace_frames: int = DEFAULT_TRACE_FRAMES) -> None:
+    global _ENABLED, _STARTED_TRACING
+    with _LOCK:
+        _ENABLED = enabled
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(trace_frames)
+            _STARTED_TRACING = True
+        elif not enabled and _STARTED_TRACING:
+            tracemalloc.stop()
+            _STARTED_TRACING = False
+
+
+def is_enabled() -> bool:
+    return _ENABLED
+
+
+def reset_memory_stats() -> None:
+    global _PEAK_BYTES
+    with _LOCK:
+        _STAGES.clear()
+        _PEAK_BYTES = 0
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+
+def _record_peak() -> None:
+    global _PEAK_BYTES
+    peak = tracemalloc.get_traced_memory()[1]
+    _PEAK_BYTES = max(_PEAK_BYTES, peak)
+    for frame in _OPEN_FRAMES.values():
+        frame["max_peak"] = max(frame["max_peak"], peak)
+    tracemalloc.reset_peak()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[dict[str, float]]:
+    usage: dict[str, float] = {}
+    if not _ENABLED:
+        yield usage
+        return
+    if not tracemalloc.is_tracing():
+        configure_memory_profiling(True)
+
+    with _LOCK:
+        _record_peak()
+        current = tracemalloc.get_traced_memory()[0]
+        frame = {"start": current, "max_peak": current}
+        _OPEN_FRAMES[id(frame)] = frame
+    try:
+        yield usage
+    finally:
+        with _LOCK:
+            _record_peak()
+            del _OPEN_FRAMES[id(frame)]
+            usage["peak_kb"] = round((frame["max_peak"] - frame["start"]) / KB, 1)
+            usage["retained_kb"] = round((tracemalloc.get_traced_memory()[0] - frame["start"]) / KB, 1)
+            entry = _STAGES.setdefault(name, {"calls": 0, "peak_kb": 0.0, "retained_kb": 0.0})
+            entry["calls"] += 1
+            entry["peak_kb"] = max(entry["peak_kb"], usage["peak_kb"])
+            entry["retained_kb"] += usage["retained_kb"]
+
+
+def max_rss_kb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / KB if sys.platform == "darwin" else float(rss)
+
+
+def object_nbytes(value: Any) -> int:
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(object_nbytes(k) + object_nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(object_nbytes(item) for item in value)
+    if hasattr(value, "__dataclass_fields__"):
+        return sys.getsizeof(value) + sum(object_nbytes(getattr(value, name)) for name in value.__dataclass_fields__)
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if isinstance(nbytes, int) else sys.getsizeof(value)
+
+
+def cache_usage(cache: dict) -> dict[str, float]:
+    snapshot = dict(cache)
+    return {"entries": len(snapshot), "size_kb": round(object_nbytes(snapshot) / KB, 1)}
+
+
+def top_allocations(limit: int = 10) -> list[dict[str, Any]]:
+    if not tracemalloc.is_tracing():
+        return []
+    statistics = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+    return [
+        {
+            "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kb": round(stat.size / KB, 1),
+            "count": stat.count,
+        }
+        for stat in statistics
+    ]
+
+
+def get_memory_stats(top: int = 10, caches: Optional[dict[str, dict]] = None) -> dict[str, Any]:
+    with _LOCK:
+        stages = {
+            name: dict(entry, peak_kb=round(entry["peak_kb"], 1), retained_kb=round(entry["retained_kb"], 1))
+            for name, entry in _STAGES.items()
+        }
+    current, peak = tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
+    return {
+        "enabled": _ENABLED,
+        "traced_current_kb": round(current / KB, 1),
+        "traced_peak_kb": round(max(peak, _PEAK_BYTES) / KB, 1),
+        "max_rss_kb": max_rss_kb(),
+        "stages": stages,
+        "caches": {name: cache_usage(cache) for name, cache in (caches or {}).items()},
+        "top_allocations": top_allocations(top) if _ENABLED else [],
+    }
+
+
+def log_memory_stats(stats: dict[str, Any], label: str) -> None:
+    _logger.info(
+        "메모리 사용 | %s | traced_peak=%.1fKB | max_rss=%sKB",
+        label,
+        stats["traced_peak_kb"],
+        stats["max_rss_kb"],
+        extra={
+            "event": "memory",
+            "label": label,
+            "traced_peak_kb": stats["traced_peak_kb"],
+            "max_rss_kb": stats["max_rss_kb"],
+        },
+    )
+    for name, entry in stats["stages"].items():
+        _logger.info(
+            "메모리 단계 | %s | calls=%d | peak=%.1fKB | retained=%.1fKB",
+            name,
+            entry["calls"],
+            entry["peak_kb"],
+            entry["retained_kb"],
+        )
+    for name, usage in stats["caches"].items():
+        _logger.info("메모리 캐시 | %s | entries=%d | size=%.1fKB", name, usage["entries"], usage["size_kb"])
+    for allocation in stats["top_allocations"]:
+        _logger.info(
+            "메모리 할당 위치 | %s | size=%.1fKB | count=%d",
+            allocation["site"],
+            allocation["size_kb"],
+            allocation["count"],
+        )
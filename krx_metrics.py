@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+PERIODS_PER_YEAR = {"D": 252.0, "W": 52.0, "2W": 26.0, "M": 12.0, "Q": 4.0}
+DEFAULT_PERIODS_PER_YEAR = PERIODS_PER_YEAR["M"]
+
+
+def infer_periods_per_year(start_dates: Iterable[str], end_dates: Iterable[str]) -> float:
+    gaps = [
+        (datetime.strptime(str(end), "%Y%m%d") - datetime.strptime(str(start), "%Y%m%d")).days
+        for start, end in zip(start_dates, end_dates)
+    ]
+    gaps = [gap for gap in gaps if gap > 0]
+    if not gaps:
+        return DEFAULT_PERIODS_PER_YEAR
+    estimate = 365.25 * len(gaps) / sum(gaps)
+    return min(PERIODS_PER_YEAR.values(), key=lambda value: abs(math.log(value / estimate)))
+
+
+@dataclass
+class OnlineMetrics:
+    periods: int = 0
+    nav: float = 1.0
+    peak: float = 1.0
+    max_drawdown: float = 0.0
+    mean: float = 0.0
+    m2: float = 0.0
+    hits: int = 0
+
+    def update(self, period_return: Optional[float]) -> "OnlineMetrics":
+        value = 0.0 if period_return is None or math.isnan(period_return) else float(period_return)
+        self.periods += 1
+        self.nav *= 1 + value
+        self.peak = self.nav if self.periods == 1 else max(self.peak, self.nav)
+        self.max_drawdown = min(self.max_drawdown, self.drawdown)
+        delta = value - self.mean
+        self.mean += delta / self.periods
+        self.m2 += delta * (value - self.mean)
+        if value > 0:
+            self.hits += 1
+        return self
+
+    def extend(self, period_returns: Iterable[Optional[float]]) -> "OnlineMetrics":
+        for period_return in period_returns:
+            self.update(period_return)
+        return self
+
+    @property
+    def total_return(self) -> float:
+        return self.nav - 1
+
+    @property
+    def drawdown(self) -> float:
+        return self.nav / self.peak - 1 if self.peak else 0.0
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.periods - 1) if self.periods > 1 else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.periods if self.periods else 0.0
+
+    def volatility(self, periods_per_year: float = DEFAULT_PERIODS_PER_YEAR) -> float:
+        return math.sqrt(self.variance * periods_per_year)
+
+    def sharpe(self, periods_per_year: float = DEFAULT_PERIODS_PER_YEAR) -> float:
+        std = math.sqrt(self.variance)
+        return self.mean / std * math.sqrt(periods_per_year) if std > 0 else 0.0
+
+
+@dataclass
+class BacktestMetrics:
+    periods_per_year: Optional[float] = None
+    portfolio: OnlineMetrics = field(default_factory=OnlineMetrics)
+    benchmark: OnlineMetrics = field(default_factory=OnlineMetrics)
+    excess: OnlineMetrics = field(default_factory=OnlineMetrics)
+    turnover_total: float = 0.0
+    transaction_cost_total: float = 0.0
+
+    @property
+    def periods(self) -> int:
+        return self.portfolio.periods
+
+    def update(self, row: dict) -> "BacktestMetrics":
+        portfolio_ret = float(row["portfolio_return"])
+        benchmark_ret = float(row["benchmark_return"])
+        self.portfolio.update(portfolio_ret)
+        self.benchmark.update(benchmark_ret)
+        self.excess.update(row.get("excess_return", portfolio_ret - benchmark_ret))
+        turnover = row.get("turnover", 0.0)
+        cost = row.get("transaction_cost", 0.0)
+        self.turnover_total += 0.0 if turnover is None or math.isnan(turnover) else float(turnover)
+        self.transaction_cost_total += 0.0 if cost is None or math.isnan(cost) else float(cost)
+        return self
+
+    def extend(self, rows: Iterable[dict]) -> "BacktestMetrics":
+        for row in rows:
+            self.update(row)
+        return self
+
+    def summary(self) -> dict[str, float]:
+        periods_per_year = self.periods_per_year or DEFAULT_PERIODS_PER_YEAR
+        return {
+            "periods": self.periods,
+            "portfolio_cumulative_return": self.portfolio.total_return,
+            "benchmark_cumulative_return": self.benchmark.total_return,
+            "portfolio_mdd": self.portfolio.max_drawdown,
+            "benchmark_mdd": self.benchmark.max_drawdown,
+            "average_turnover": self.turnover_total / self.periods if self.periods else 0.0,
+            "total_transaction_cost": self.transaction_cost_total,
+            "portfolio_volatility": self.portfolio.volatility(periods_per_year),
+            "portfolio_sharpe": self.portfolio.sharpe(periods_per_year),
+            "benchmark_sharpe": self.benchmark.sharpe(periods_per_year),
+            "portfolio_drawdown": self.portfolio.drawdown,
+            "hit_rate": self.excess.hit_rate,
+        }
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterable, Optional
+from uuid import uuid4
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from krx_backtest import compute_rolling_window_metrics, write_backtest_report
+from krx_bootstrap import create_significance_report
+
+PERIODS_TABLE = "periods"
+SUMMARY_TABLE = "summary"
+RUNS_TABLE = "runs"
+
+_MARKET_PARTITIONING = ds.partitioning(
+    pa.schema([("market", pa.string()), ("run_id", pa.string())]),
+    flavor="hive",
+)
+_RUN_PARTITIONING = ds.partitioning(pa.schema([("run_id", pa.string())]), flavor="hive")
+
+
+def new_run_id() -> str:
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid4().hex[:8]}"
+
+
+def _config_record(config: Any) -> dict[str, Any]:
+    raw = asdict(config) if is_dataclass(config) else dict(config or {})
+    record: dict[str, Any] = {}
+    for key, value in raw.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                if sub_value is None or isinstance(sub_value, (str, int, float, bool)):
+                    record[f"{key}_{sub_key}"] = sub_value
+        elif value is None or isinstance(value, (str, int, float, bool)):
+            record[key] = value
+    record["config_json"] = json.dumps(raw, ensure_ascii=False, default=str)
+    return record
+
+
+def _write_partition(df: pd.DataFrame, target_dir: Path) -> None:
+    target_dir.mkdir(parents=True, exist_ok=True)
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    pq.write_table(table, target_dir / "part-0.parquet")
+
+
+def append_backtest_run(
+    store_dir: str,
+    config: Any,
+    summary_df: pd.DataFrame,
+    market_results: dict[str, pd.DataFrame],
+    run_id: Optional[str] = None,
+) -> str:
+    root = Path(store_dir)
+    run_id = run_id or new_run_id()
+    if (root / RUNS_TABLE / f"run_id={run_id}").exists():
+        raise FileExistsError(f"run_id already exists in store: {run_id}")
+
+    staging = root / ".staging" / run_id
+    if staging.exists():
+        shutil.rmtree(staging)
+
+    run_record = _config_record(config)
+    run_record["created_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    run_record["markets"] = ",".join(market_results.keys())
+
+    for market, market_df in market_results.items():
+        if market_df.empty:
+            continue
+        periods_df = market_df.drop(columns=["market"], errors="ignore")
+        _write_partition(periods_df, staging / PERIODS_TABLE / f"market={market}" / f"run_id={run_id}")
+
+    for row in summary_df.to_dict(orient="records"):
+        market = str(row.pop("market"))
+        _write_partition(
+            pd.DataFrame([row]),
+            staging / SUMMARY_TABLE / f"market={market}" / f"run_id={run_id}",
+        )
+
+    _write_partition(pd.DataFrame([run_record]), staging / RUNS_TABLE / f"run_id={run_id}")
+
+    for table_dir in sorted(staging.rglob("run_id=*")):
+        destination = root / table_dir.relative_to(staging)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        table_dir.replace(destination)
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        staging.parent.rmdir()
+    except OSError:
+        pass
+
+    return run_id
+
+
+def _partition_expression(markets: Optional[Iterable[str]], run_ids: Optional[Iterable[str]]):
+    expression = None
+    if markets is not None:
+        expression = ds.field("market").isin([m.strip().upper() for m in markets])
+    if run_ids is not None:
+        run_expr = ds.field("run_id").isin(list(run_ids))
+        expression = run_expr if expression is None else expression & run_expr
+    return expression
+
+
+def _load_table(
+    store_dir: str,
+    table_name: str,
+    partitioning,
+    partition_expr=None,
+    filters: Optional[list] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    base_dir = Path(store_dir) / table_name
+    if not base_dir.exists():
+        return pd.DataFrame()
+
+    dataset = ds.dataset(base_dir, format="parquet", partitioning=partitioning)
+    fragments = list(dataset.get_fragments(filter=partition_expr))
+    if not fragments:
+        return pd.DataFrame()
+
+    schema = pa.unify_schemas(
+        [fragment.physical_schema for fragment in fragments] + [partitioning.schema],
+        promote_options="permissive",
+    )
+    selected = ds.dataset(
+        [fragment.path for fragment in fragments],
+        schema=schema,
+        format="parquet",
+        partitioning=partitioning,
+        partition_base_dir=str(base_dir),
+    )
+
+    expression = partition_expr
+    if filters:
+        filter_expr = pq.filters_to_expression(filters)
+        expression = filter_expr if expression is None else expression & filter_expr
+
+    table = selected.to_table(filter=expression, columns=columns)
+    return table.to_pandas()
+
+
+def load_backtest_periods(
+    store_dir: str,
+    markets: Optional[Iterable[str]] = None,
+    run_ids: Optional[Iterable[str]] = None,
+    filters: Optional[list] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    df = _load_table(
+        store_dir,
+        PERIODS_TABLE,
+        _MARKET_PARTITIONING,
+        partition_expr=_partition_expression(markets, run_ids),
+        filters=filters,
+        columns=columns,
+    )
+    sort_cols = [col for col in ("run_id", "market", "rebalance_date") if col in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols, kind="mergesort").reset_index(drop=True)
+    return df
+
+
+def load_backtest_summaries(
+    store_dir: str,
+    markets: Optional[Iterable[str]] = None,
+    run_ids: Optional[Iterable[str]] = None,
+    filters: Optional[list] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    df = _load_table(
+        store_dir,
+        SUMMARY_TABLE,
+        _MARKET_PARTITIONING,
+        partition_expr=_partition_expression(markets, run_ids),
+        filters=filters,
+        columns=columns,
+    )
+    sort_cols = [col for col in ("run_id", "market") if col in df.columns]
+    if sort_cols:
+        df = df.sort_values(sort_cols, kind="mergesort").reset_index(drop=True)
+    return df
+
+
+def load_backtest_runs(
+    store_dir: str,
+    run_ids: Optional[Iterable[str]] = None,
+    filters: Optional[list] = None,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    df = _load_table(
+        store_dir,
+        RUNS_TABLE,
+        _RUN_PARTITIONING,
+        partition_expr=_partition_expression(None, run_ids),
+        filters=filters,
+        columns=columns,
+    )
+    if "run_id" in df.columns:
+        df = df.sort_values("run_id", kind="mergesort").reset_index(drop=True)
+    return df
+
+
+def _market_first(df: pd.DataFrame) -> pd.DataFrame:
+    columns = ["market"] + [col for col in df.columns if col not in ("market", "run_id")]
+    return df[columns]
+
+
+def render_backtest_report(
+    store_dir: str,
+    run_id: str,
+    output_dir: str,
+    rolling_window: Optional[int] = None,
+    rolling_step: int = 1,
+    bootstrap_samples: int = 0,
+    block_size: int = 1,
+    seed: Optional[int] = None,
+) -> Path:
+    runs_df = load_backtest_runs(store_dir, run_ids=[run_id])
+    if runs_df.empty:
+        raise KeyError(f"run_id not found in store: {run_id}")
+
+    market_order = [m for m in str(runs_df.iloc[0]["markets"]).split(",") if m]
+    cost_model = json.loads(runs_df.iloc[0]["config_json"]).get("cost_model")
+    summary_df = load_backtest_summaries(store_dir, run_ids=[run_id])
+    periods_df = load_backtest_periods(store_dir, run_ids=[run_id])
+
+    summary_df = _market_first(summary_df)
+    summary_df = summary_df.set_index("market").loc[market_order].reset_index()
+
+    market_results: dict[str, pd.DataFrame] = {}
+    for market in market_order:
+        market_df = periods_df[periods_df["market"] == market] if not periods_df.empty else periods_df
+        market_results[market] = _market_first(market_df).reset_index(drop=True) if not market_df.empty else pd.DataFrame()
+        if cost_model is not None:
+            market_results[market].attrs["cost_model"] = cost_model
+
+    rolling_results = None
+    if rolling_window:
+        rolling_results = {
+            market: compute_rolling_window_metrics(market_df, rolling_window, rolling_step)
+            for market, market_df in market_results.items()
+            if not market_df.empty
+        }
+
+    significance_df = None
+    if bootstrap_samples:
+        significance_df = create_significance_report(
+            market_results, n_samples=bootstrap_samples, block_size=block_size, seed=seed
+        )
+
+    return write_backtest_report(
+        output_dir,
+        summary_df,
+        market_results,
+        rolling_results=rolling_results,
+        significance_df=significance_df,
+    )
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from krx_backtest import _to_yyyymmdd, get_trading_calendar
+from krx_value_service import (
+    VALID_EXPORT_FORMATS,
+    _write_ranking_chunk,
+    get_tatsuro_small_mid_value_top10,
+    normalize_market,
+)
+
+DEFAULT_SCREEN_WORKERS = 4
+
+
+@dataclass
+class ScreenResult:
+    market: str
+    date: str
+    used_date: str = ""
+    frame: pd.DataFrame = field(default_factory=pd.DataFrame)
+    stats: dict[str, int] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def resolve_screen_dates(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    dates: Optional[Iterable[str]] = None,
+) -> list[str]:
+    if dates:
+        resolved = [_to_yyyymmdd(date.strip()) for date in dates if date.strip()]
+        return sorted(dict.fromkeys(resolved))
+    if not start_date or not end_date:
+        raise ValueError("either dates or both start_date and end_date are required")
+    start = _to_yyyymmdd(start_date)
+    end = _to_yyyymmdd(end_date)
+    if start > end:
+        raise ValueError("start_date must not be later than end_date")
+    return [date for date in get_trading_calendar(start, end) if start <= date <= end]
+
+
+def _screen_one(market: str, date: str, screen_kwargs: dict[str, Any]) -> ScreenResult:
+    try:
+        frame, used_date, stats, _ = get_tatsuro_small_mid_value_top10(market=market, date=date, **screen_kwargs)
+    except Exception as exc:
+        return ScreenResult(market=market, date=date, error=str(exc))
+    return ScreenResult(market=market, date=date, used_date=used_date, frame=frame, stats=stats)
+
+
+def iter_screen_results(
+    markets: Iterable[str],
+    dates: Iterable[str],
+    workers: int = DEFAULT_SCREEN_WORKERS,
+    **screen_kwargs: Any,
+) -> Iterator[ScreenResult]:
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    jobs = iter([(normalize_market(market), date) for date in dates for market in markets])
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for market, date in jobs:
+            pending.add(executor.submit(_screen_one, market, date, screen_kwargs))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+                next_job = next(jobs, None)
+                if next_job is not None:
+                    pending.add(executor.submit(_screen_one, *next_job, screen_kwargs))
+
+
+def _result_rows(result: ScreenResult) -> pd.DataFrame:
+    rows = result.frame.copy()
+    rows.index.name = "티커"
+    rows = rows.reset_index()
+    rows.insert(0, "순위", range(1, len(rows) + 1))
+    rows.insert(0, "시장", rows.pop("시장") if "시장" in rows.columns else result.market)
+    rows.insert(0, "기준일", result.used_date)
+    rows.insert(0, "요청일", result.date)
+    return rows
+
+
+def write_screen_stream(
+    output_path: str,
+    results: Iterable[ScreenResult],
+    fmt: str = "csv",
+    on_result: Optional[Callable[[ScreenResult], None]] = None,
+) -> dict[str, Any]:
+    normalized_fmt = fmt.strip().lower()
+    if normalized_fmt not in VALID_EXPORT_FORMATS:
+        raise ValueError("fmt must be one of: csv, ndjson")
+
+    target_path = Path(output_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    encoding = "utf-8-sig" if normalized_fmt == "csv" else "utf-8"
+
+    summary: dict[str, Any] = {"jobs": 0, "rows": 0, "failed": []}
+    columns: Optional[list[str]] = None
+    with target_path.open("w", encoding=encoding, newline="") as handle:
+        for result in results:
+            summary["jobs"] += 1
+            if on_result is not None:
+                on_result(result)
+            if not result.ok:
+                summary["failed"].append(f"{result.market} {result.date}: {result.error}")
+                continue
+            if result.frame.empty:
+                continue
+            rows = _result_rows(result)
+            if columns is None:
+                columns = list(rows.columns)
+            _write_ranking_chunk(handle, rows.reindex(columns=columns), normalized_fmt, summary["rows"] == 0)
+            handle.flush()
+            summary["rows"] += len(rows)
+    return summary
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from krx_backtest import (
+    BacktestConfig,
+    _build_rebalance_pairs,
+    _markdown_table,
+    _period_gross_and_costs,
+    _ticker_period_returns,
+    generate_rebalance_dates,
+    get_trading_calendar,
+)
+from krx_factor import SCORE_COLUMN, compile_factor_expression
+from krx_value_service import _normalize_div_policy, get_snapshot_index
+
+EOK = 100_000_000
+
+SENSITIVITY_COLUMNS = [
+    "cap_band",
+    "cap_min",
+    "cap_max",
+    "top_n",
+    "periods",
+    "cumulative_return",
+    "gross_cumulative_return",
+    "mdd",
+    "average_holdings",
+    "average_turnover",
+]
+
+
+def parse_cap_bands(spec: str, unit: int = EOK) -> list[tuple[int, int]]:
+    bands: list[tuple[int, int]] = []
+    for raw in spec.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            low, high = (float(part) for part in raw.split("-"))
+        except ValueError as exc:
+            raise ValueError(f"cap band must look like MIN-MAX: {raw}") from exc
+        if low > high:
+            raise ValueError(f"cap band min must not exceed max: {raw}")
+        bands.append((int(low * unit), int(high * unit)))
+    if not bands:
+        raise ValueError("at least one cap band is required")
+    return bands
+
+
+def cap_band_label(cap_min: int, cap_max: int) -> str:
+    return f"{cap_min / EOK:,.0f}억~{cap_max / EOK:,.0f}억"
+
+
+def period_grid_returns(
+    caps: np.ndarray,
+    returns: np.ndarray,
+    cap_bands: Sequence[tuple[int, int]],
+    top_ns: Sequence[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    n_bands, n_tops = len(cap_bands), len(top_ns)
+    if len(caps) == 0:
+        return np.zeros((n_bands, n_tops)), np.zeros((n_bands, n_tops))
+
+    lows = np.array([band[0] for band in cap_bands], dtype=float)[:, None]
+    highs = np.array([band[1] for band in cap_bands], dtype=float)[:, None]
+    members = (caps[None, :] >= lows) & (caps[None, :] <= highs)
+    valid = members & ~np.isnan(returns)[None, :]
+
+    ranks = np.cumsum(members, axis=1)
+    return_sums = np.cumsum(np.where(valid, returns[None, :], 0.0), axis=1)
+    holding_counts = np.cumsum(valid, axis=1)
+
+    last = len(caps) - 1
+    rows = np.arange(n_bands)
+    period_returns = np.zeros((n_bands, n_tops))
+    holdings = np.zeros((n_bands, n_tops))
+    for j, top_n in enumerate(top_ns):
+        positions = np.minimum((ranks < top_n).sum(axis=1), last)
+        counts = holding_counts[rows, positions]
+        sums = return_sums[rows, positions]
+        period_returns[:, j] = np.divide(sums, counts, out=np.zeros(n_bands), where=counts > 0)
+        holdings[:, j] = counts
+    return period_returns, holdings
+
+
+def _cell_holdings(scored_df: pd.DataFrame, returns: pd.Series, cap_band: tuple[int, int], top_n: int) -> list[str]:
+    caps = scored_df["시가총액"].to_numpy(dtype=float)
+    members = scored_df.index[(caps >= cap_band[0]) & (caps <= cap_band[1])][:top_n]
+    held_returns = returns.reindex(members)
+    return list(held_returns.index[held_returns.notna()])
+
+
+def run_sensitivity_analysis(
+    market: str,
+    config: BacktestConfig,
+    cap_bands: Sequence[tuple[int, int]],
+    top_ns: Iterable[int],
+) -> pd.DataFrame:
+    cap_bands = list(dict.fromkeys(cap_bands))
+    top_ns = sorted({int(n) for n in top_ns})
+    if not top_ns or top_ns[0] < 1:
+        raise ValueError("top_n values must be positive")
+    factor = compile_factor_expression(config.score_expression)
+    div_policy = _normalize_div_policy(config.div_policy)
+    universe_min = min(band[0] for band in cap_bands)
+    universe_max = max(band[1] for band in cap_bands)
+
+    calendar = get_trading_calendar(config.start_date, config.end_date)
+    rebalance_dates = generate_rebalance_dates(
+        config.start_date,
+        config.end_date,
+        freq=config.rebalance_freq,
+        custom_dates=config.rebalance_dates,
+        calendar=calendar,
+    )
+
+    period_returns: list[np.ndarray] = []
+    period_gross: list[np.ndarray] = []
+    period_holdings: list[np.ndarray] = []
+    period_turnovers: list[np.ndarray] = []
+    previous: dict[tuple[int, int], tuple[list[str], pd.Series]] = {}
+    for buy_date, sell_date in _build_rebalance_pairs(rebalance_dates):
+        snapshot_index, used_date, _ = get_snapshot_index(market, buy_date)
+        if factor.cross_sectional:
+            scored_bands = [
+                (
+                    [band],
+                    factor.apply(snapshot_index.query(band[0], band[1], config.per_max, config.pbr_max, div_policy)),
+                )
+                for band in cap_bands
+            ]
+        else:
+            universe_df = snapshot_index.query(universe_min, universe_max, config.per_max, config.pbr_max, div_policy)
+            scored_bands = [(cap_bands, factor.apply(universe_df))]
+        scored_bands = [
+            (bands, scored_df.sort_index(kind="mergesort").sort_values(SCORE_COLUMN, ascending=False, kind="mergesort"))
+            for bands, scored_df in scored_bands
+        ]
+
+        tickers = list(dict.fromkeys(ticker for _, scored_df in scored_bands for ticker in scored_df.index))
+        ticker_returns = _ticker_period_returns(tickers, buy_date=used_date, sell_date=sell_date, market=market)
+        grids = [
+            period_grid_returns(
+                scored_df["시가총액"].to_numpy(dtype=float),
+                ticker_returns.reindex(scored_df.index).to_numpy(dtype=float),
+                bands,
+                top_ns,
+            )
+            for bands, scored_df in scored_bands
+        ]
+        gross = np.vstack([grid for grid, _ in grids])
+        band_frames = [scored_df for bands, scored_df in scored_bands for _ in bands]
+        turnovers = np.zeros_like(gross)
+        costs = np.zeros_like(gross)
+        for i, band in enumerate(cap_bands):
+            for j, top_n in enumerate(top_ns):
+                held = _cell_holdings(band_frames[i], ticker_returns, band, top_n)
+                held_returns = ticker_returns.reindex(held)
+                prev_held, prev_returns = previous.get((i, j), ([], pd.Series(dtype=float)))
+                _, turnovers[i, j], costs[i, j] = _period_gross_and_costs(
+                    prev_held, prev_returns, held, held_returns, config.cost_model
+                )
+                previous[(i, j)] = (held, held_returns)
+        period_gross.append(gross)
+        period_returns.append(gross - costs)
+        period_holdings.append(np.vstack([holdings for _, holdings in grids]))
+        period_turnovers.append(turnovers)
+
+    n_periods = len(period_returns)
+    if n_periods:
+        stacked = np.stack(period_returns)
+        wealth = np.cumprod(1 + stacked, axis=0)
+        cumulative = wealth[-1] - 1
+        gross_cumulative = np.prod(1 + np.stack(period_gross), axis=0) - 1
+        mdd = (wealth / np.maximum.accumulate(wealth, axis=0) - 1).min(axis=0)
+        average_holdings = np.stack(period_holdings).mean(axis=0)
+        average_turnover = np.stack(period_turnovers).mean(axis=0)
+    else:
+        cumulative = gross_cumulative = mdd = average_holdings = average_turnover = np.zeros(
+            (len(cap_bands), len(top_ns))
+        )
+
+    rows: list[dict] = []
+    for i, (cap_min, cap_max) in enumerate(cap_bands):
+        for j, top_n in enumerate(top_ns):
+            rows.append(
+                {
+                    "cap_band": cap_band_label(cap_min, cap_max),
+                    "cap_min": cap_min,
+                    "cap_max": cap_max,
+                    "top_n": top_n,
+                    "periods": n_periods,
+                    "cumulative_return": float(cumulative[i, j]),
+                    "gross_cumulative_return": float(gross_cumulative[i, j]),
+                    "mdd": float(mdd[i, j]),
+                    "average_holdings": float(average_holdings[i, j]),
+                    "average_turnover": float(average_turnover[i, j]),
+                }
+            )
+    grid_df = pd.DataFrame(rows, columns=SENSITIVITY_COLUMNS)
+    grid_df.attrs["cost_model"] = asdict(config.cost_model)
+    return grid_df
+
+
+def sensitivity_heatmap(grid_df: pd.DataFrame, value: str = "cumulative_return") -> pd.DataFrame:
+    band_order = list(dict.fromkeys(grid_df["cap_band"]))
+    heatmap = grid_df.pivot(index="cap_band", columns="top_n", values=value).reindex(band_order)
+    heatmap.columns = [f"top{n}" for n in heatmap.columns]
+    heatmap.index.name = "cap_band"
+    return heatmap
+
+
+def write_sensitivity_report(output_dir: str, market_grids: dict[str, pd.DataFrame]) -> Path:
+    target_dir = Path(output_dir)
+    target_dir.mkdir(parents=True, exist_ok=True)
+
+    lines = ["# Cap Band x Top-N Sensitivity", ""]
+    cost_model = next((grid_df.attrs["cost_model"] for grid_df in market_grids.values() if "cost_model" in grid_df.attrs), None)
+    if cost_model is not None:
+        lines.extend(["## Cost Model", "", "Cumulative return and MDD are net of transaction costs.", ""])
+        lines.extend(_markdown_table(pd.DataFrame([cost_model])))
+        lines.append("")
+    for market, grid_df in market_grids.items():
+        grid_df.to_csv(target_dir / f"sensitivity_{market.lower()}.csv", index=False, encoding="utf-8-sig")
+        periods = int(grid_df["periods"].iloc[0]) if not grid_df.empty else 0
+        lines.extend([f"## {market} ({periods} periods)", ""])
+        for value, title in (("cumulative_return", "Cumulative Return"), ("mdd", "MDD")):
+            heatmap = sensitivity_heatmap(grid_df, value)
+            heatmap.to_csv(target_dir / f"sensitivity_{market.lower()}_{value}.csv", encoding="utf-8-sig")
+            lines.extend([f"### {title}", ""])
+            lines.extend(_markdown_table(heatmap.round(4).reset_index()))
+            lines.append("")
+
+    report_path = target_dir / "sensitivity_report.md"
+    report_path.write_text("\n".join(lines), encoding="utf-8")
+    return report_path
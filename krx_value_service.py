@@ -1,22 +1,45 @@
 ﻿from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
-from typing import Optional
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
-from pykrx import stock
 
-VALID_MARKETS = {"KOSPI", "KOSDAQ"}
+import krx_cache
+import krx_fetch
+import krx_history
+import krx_memory
+from krx_factor import SCORE_COLUMN, FactorExpression, compile_factor_expression
+
+VALID_MARKETS = {"KOSPI", "KOSDAQ", "ALL"}
+COMBINED_MARKETS = ("KOSPI", "KOSDAQ")
 VALID_DIV_POLICIES = {"zero", "exclude"}
+VALID_EXPORT_FORMATS = {"csv", "ndjson"}
+
+BASE_COLUMNS = ["시가총액", "PER", "PBR", "DIV"]
 
 _TICKER_NAME_CACHE: dict[str, str] = {}
-_QUERY_CACHE: dict[tuple, tuple[pd.DataFrame, str, dict[str, int], list[str]]] = {}
+_QUERY_CACHE: dict[tuple, "ScreeningResult"] = {}
+SNAPSHOT_INDEX_CACHE_SIZE = 32
+_SNAPSHOT_INDEX_CACHE: OrderedDict[tuple[str, str], tuple["SnapshotIndex", str, list[str]]] = OrderedDict()
+_SNAPSHOT_LOCK = threading.Lock()
+_REFRESH_LOCK = threading.Lock()
+_PENDING_REFRESHES: dict[tuple[str, str], Future] = {}
+_PENDING_NAME_FILLS: dict[tuple[str, ...], Future] = {}
 
 
 def normalize_market(market: str) -> str:
     normalized = market.strip().upper()
     if normalized not in VALID_MARKETS:
-        raise ValueError("market must be one of: KOSPI, KOSDAQ")
+        raise ValueError("market must be one of: KOSPI, KOSDAQ, ALL")
     return normalized
 
 
@@ -40,11 +63,17 @@ def get_market_data_with_fallback(
     max_backtrack_days: int = 14,
     backtrack_logs: Optional[list[str]] = None,
 ):
+    negative_cache = krx_cache.get_negative_cache()
     for offset in range(max_backtrack_days + 1):
         target_date = (base_date - timedelta(days=offset)).strftime("%Y%m%d")
+        cached_miss = negative_cache.lookup("snapshot", market, target_date)
+        if cached_miss is not None:
+            if backtrack_logs is not None:
+                backtrack_logs.append(f"{target_date}: 데이터 없음(캐시: {cached_miss['reason']})")
+            continue
         try:
-            market_cap_df = stock.get_market_cap_by_ticker(target_date, market=market)
-            fundamental_df = stock.get_market_fundamental_by_ticker(target_date, market=market)
+            market_cap_df = krx_fetch.get_market_cap_by_ticker(target_date, market=market)
+            fundamental_df = krx_fetch.get_market_fundamental_by_ticker(target_date, market=market)
             if not market_cap_df.empty and not fundamental_df.empty:
                 if backtrack_logs is not None:
                     if offset == 0:
@@ -54,6 +83,14 @@ def get_market_data_with_fallback(
                             f"{target_date}: {offset}일 백트래킹 후 사용"
                         )
                 return market_cap_df, fundamental_df, target_date
+            negative_cache.record(
+                "snapshot",
+                market,
+                target_date,
+                reason="빈 결과",
+                as_of_date=target_date,
+                ttl=krx_cache.empty_result_ttl(target_date),
+            )
             if backtrack_logs is not None:
                 backtrack_logs.append(f"{target_date}: 데이터 없음(빈 결과)")
         except Exception:
@@ -64,40 +101,345 @@ def get_market_data_with_fallback(
     raise RuntimeError(f"No market data available for {market} in last {max_backtrack_days + 1} days")
 
 
+def get_combined_market_data_with_fallback(
+    base_date: datetime,
+    max_backtrack_days: int = 14,
+    backtrack_logs: Optional[list[str]] = None,
+):
+    market_logs: dict[str, list[str]] = {market: [] for market in COMBINED_MARKETS}
+    with ThreadPoolExecutor(max_workers=len(COMBINED_MARKETS)) as executor:
+        futures = {
+            market: executor.submit(
+                get_market_data_with_fallback,
+                market=market,
+                base_date=base_date,
+                max_backtrack_days=max_backtrack_days,
+                backtrack_logs=market_logs[market],
+            )
+            for market in COMBINED_MARKETS
+        }
+        results = {market: future.result() for market, future in futures.items()}
+
+    common_date = min(used_date for _, _, used_date in results.values())
+    while any(used_date != common_date for _, _, used_date in results.values()):
+        aligned_base = datetime.strptime(common_date, "%Y%m%d")
+        remaining_days = max_backtrack_days - (base_date - aligned_base).days
+        if remaining_days < 0:
+            raise RuntimeError(f"No common trading date for {', '.join(COMBINED_MARKETS)} near {common_date}")
+        for market, (_, _, used_date) in list(results.items()):
+            if used_date != common_date:
+                results[market] = get_market_data_with_fallback(
+                    market=market,
+                    base_date=aligned_base,
+                    max_backtrack_days=remaining_days,
+                    backtrack_logs=market_logs[market],
+                )
+        common_date = min(used_date for _, _, used_date in results.values())
+
+    if backtrack_logs is not None:
+        for market in COMBINED_MARKETS:
+            backtrack_logs.extend(f"[{market}] {line}" for line in market_logs[market])
+        backtrack_logs.append(f"{common_date}: {'/'.join(COMBINED_MARKETS)} 공통 기준일 사용")
+
+    market_cap_df = pd.concat(
+        [results[market][0].assign(시장=market) for market in COMBINED_MARKETS]
+    )
+    fundamental_df = pd.concat([results[market][1] for market in COMBINED_MARKETS])
+    return market_cap_df, fundamental_df, common_date
+
+
+def _load_market_data(market: str, base_date: datetime, backtrack_logs: list[str]):
+    if market == "ALL":
+        return get_combined_market_data_with_fallback(base_date=base_date, backtrack_logs=backtrack_logs)
+    return get_market_data_with_fallback(market=market, base_date=base_date, backtrack_logs=backtrack_logs)
+
+
+@dataclass
+class SnapshotIndex:
+    frame: pd.DataFrame
+    caps: np.ndarray
+    order: np.ndarray
+    total: int
+
+    @classmethod
+    def build(cls, market_cap_df: pd.DataFrame, fundamental_df: pd.DataFrame) -> "SnapshotIndex":
+        joined_df = market_cap_df.join(fundamental_df, how="inner")
+        frame = joined_df[(joined_df["PER"] > 0) & (joined_df["PBR"] > 0) & joined_df["시가총액"].notna()]
+        caps = frame["시가총액"].to_numpy(dtype=float)
+        order = np.argsort(caps, kind="mergesort")
+        return cls(frame=frame, caps=caps[order], order=order, total=len(joined_df))
+
+    def cap_positions(self, cap_min: float, cap_max: float) -> np.ndarray:
+        start = np.searchsorted(self.caps, cap_min, side="left")
+        stop = np.searchsorted(self.caps, cap_max, side="right")
+        return np.sort(self.order[start:max(start, stop)])
+
+    def query(
+        self,
+        cap_min: float,
+        cap_max: float,
+        per_max: Optional[float] = None,
+        pbr_max: Optional[float] = None,
+        div_policy: str = "zero",
+    ) -> pd.DataFrame:
+        result_df = self.frame.iloc[self.cap_positions(cap_min, cap_max)]
+        if per_max is not None:
+            result_df = result_df[result_df["PER"] <= per_max]
+        if pbr_max is not None:
+            result_df = result_df[result_df["PBR"] <= pbr_max]
+        if div_policy == "exclude":
+            result_df = result_df[result_df["DIV"].notna()]
+        return result_df
+
+
+def get_snapshot_index(market: str, date: Optional[str] = None) -> tuple[SnapshotIndex, str, list[str]]:
+    normalized_market = normalize_market(market)
+    base_date = normalize_date(date)
+    key = (normalized_market, base_date.strftime("%Y%m%d"))
+    with _SNAPSHOT_LOCK:
+        if key in _SNAPSHOT_INDEX_CACHE:
+            _SNAPSHOT_INDEX_CACHE.move_to_end(key)
+            index, used_date, logs = _SNAPSHOT_INDEX_CACHE[key]
+            return index, used_date, list(logs)
+
+    backtrack_logs: list[str] = []
+    market_cap_df, fundamental_df, used_date = _load_market_data(normalized_market, base_date, backtrack_logs)
+    index = SnapshotIndex.build(market_cap_df, fundamental_df)
+    with _SNAPSHOT_LOCK:
+        _SNAPSHOT_INDEX_CACHE[key] = (index, used_date, list(backtrack_logs))
+        while len(_SNAPSHOT_INDEX_CACHE) > SNAPSHOT_INDEX_CACHE_SIZE:
+            _SNAPSHOT_INDEX_CACHE.popitem(last=False)
+    return index, used_date, backtrack_logs
+
+
+def refresh_snapshot_index(market: str, date: str) -> Future:
+    key = (market, date)
+    with _REFRESH_LOCK:
+        pending = _PENDING_REFRESHES.get(key)
+        if pending is not None:
+            return pending
+        future: Future = Future()
+        _PENDING_REFRESHES[key] = future
+
+    def run() -> None:
+        try:
+            future.set_result(get_snapshot_index(market, date))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with _REFRESH_LOCK:
+                _PENDING_REFRESHES.pop(key, None)
+
+    threading.Thread(target=run, name=f"snapshot-refresh-{market}-{date}", daemon=True).start()
+    return future
+
+
+def _latest_memory_snapshot(market: str, date: str) -> Optional[tuple[SnapshotIndex, str]]:
+    with _SNAPSHOT_LOCK:
+        candidates = [
+            (used_date, index)
+            for (cached_market, _), (index, used_date, _) in _SNAPSHOT_INDEX_CACHE.items()
+            if cached_market == market and used_date <= date
+        ]
+    if not candidates:
+        return None
+    used_date, index = max(candidates, key=lambda item: item[0])
+    return index, used_date
+
+
+def _latest_disk_snapshot(market: str, date: str) -> Optional[tuple[SnapshotIndex, str]]:
+    disk_cache = krx_cache.get_disk_cache()
+    if disk_cache is None or market == "ALL":
+        return None
+    prefix = f"{market}_"
+    cap_dates = {part[len(prefix):] for part in disk_cache.list_parts("market_cap") if part.startswith(prefix)}
+    fundamental_dates = {
+        part[len(prefix):] for part in disk_cache.list_parts("market_fundamental") if part.startswith(prefix)
+    }
+    for candidate in sorted((d for d in cap_dates & fundamental_dates if d <= date), reverse=True):
+        market_cap_df = disk_cache.get_frame("market_cap", market, candidate)
+        fundamental_df = disk_cache.get_frame("market_fundamental", market, candidate)
+        if market_cap_df is None or fundamental_df is None or market_cap_df.empty or fundamental_df.empty:
+            continue
+        return SnapshotIndex.build(market_cap_df, fundamental_df), candidate
+    return None
+
+
+def load_snapshot_index(
+    market: str,
+    date: str,
+    deadline_sec: Optional[float] = None,
+) -> tuple[SnapshotIndex, str, list[str], bool]:
+    if deadline_sec is None:
+        return (*get_snapshot_index(market, date), False)
+    if deadline_sec < 0:
+        raise ValueError("deadline_sec must be non-negative")
+    with _SNAPSHOT_LOCK:
+        cached = (market, date) in _SNAPSHOT_INDEX_CACHE
+    if cached:
+        return (*get_snapshot_index(market, date), False)
+
+    future = refresh_snapshot_index(market, date)
+    failure: Optional[Exception] = None
+    try:
+        index, used_date, logs = future.result(timeout=deadline_sec)
+        return index, used_date, logs, False
+    except FutureTimeoutError:
+        reason = f"KRX 응답 지연({deadline_sec:g}초 초과) - 캐시된 {{used_date}} 스냅샷 사용(백그라운드 갱신 중)"
+    except Exception as exc:
+        failure = exc
+        reason = f"KRX 조회 실패({type(exc).__name__}: {exc}) - 캐시된 {{used_date}} 스냅샷 사용"
+
+    stale = _latest_memory_snapshot(market, date) or _latest_disk_snapshot(market, date)
+    if stale is None:
+        if failure is not None:
+            raise failure
+        raise TimeoutError(f"No snapshot for {market} {date} within {deadline_sec:g}s and no cached snapshot to serve")
+    index, used_date = stale
+    return index, used_date, [f"{date}: {reason.format(used_date=used_date)}"], True
+
+
+def service_caches() -> dict[str, dict]:
+    return {
+        "query_cache": _QUERY_CACHE,
+        "ticker_name_cache": _TICKER_NAME_CACHE,
+        "snapshot_index_cache": _SNAPSHOT_INDEX_CACHE,
+    }
+
+
+def clear_query_caches() -> None:
+    _QUERY_CACHE.clear()
+    _SNAPSHOT_INDEX_CACHE.clear()
+
+
 def add_ticker_names(df: pd.DataFrame) -> pd.DataFrame:
+    if krx_fetch.is_offline():
+        return add_cached_ticker_names(df)
     result = df.copy()
     names: list[str] = []
     for ticker in result.index:
         if ticker not in _TICKER_NAME_CACHE:
-            _TICKER_NAME_CACHE[ticker] = stock.get_market_ticker_name(ticker)
+            _TICKER_NAME_CACHE[ticker] = krx_fetch.get_market_ticker_name(ticker)
         names.append(_TICKER_NAME_CACHE[ticker])
     result["종목명"] = names
     return result
 
 
+def add_cached_ticker_names(df: pd.DataFrame) -> pd.DataFrame:
+    result = df.copy()
+    names: list[str] = []
+    for ticker in result.index:
+        if ticker not in _TICKER_NAME_CACHE:
+            cached = krx_fetch.get_cached_ticker_name(ticker)
+            if cached is None:
+                names.append(ticker)
+                continue
+            _TICKER_NAME_CACHE[ticker] = cached
+        names.append(_TICKER_NAME_CACHE[ticker])
+    result["종목명"] = names
+    return result
+
+
+def fill_ticker_names(df: pd.DataFrame) -> Future:
+    key = tuple(df.index)
+    with _REFRESH_LOCK:
+        pending = _PENDING_NAME_FILLS.get(key)
+        if pending is not None:
+            return pending
+        future: Future = Future()
+        _PENDING_NAME_FILLS[key] = future
+
+    def run() -> None:
+        try:
+            future.set_result(add_ticker_names(df))
+        except BaseException as exc:
+            future.set_exception(exc)
+        finally:
+            with _REFRESH_LOCK:
+                _PENDING_NAME_FILLS.pop(key, None)
+
+    threading.Thread(target=run, name="ticker-name-fill", daemon=True).start()
+    return future
+
+
+def add_ticker_names_within(df: pd.DataFrame, timeout_sec: float) -> tuple[pd.DataFrame, Optional[str]]:
+    if krx_fetch.is_offline() or all(ticker in _TICKER_NAME_CACHE for ticker in df.index):
+        return add_cached_ticker_names(df), None
+    try:
+        return fill_ticker_names(df).result(timeout=timeout_sec), None
+    except FutureTimeoutError:
+        reason = "종목명 조회 지연 - 티커 코드로 표시(백그라운드 조회 중)"
+    except Exception as exc:
+        reason = f"종목명 조회 실패({type(exc).__name__}: {exc}) - 티커 코드로 표시"
+    return add_cached_ticker_names(df), reason
+
+
 def get_tatsuro_score(row: pd.Series) -> float:
-    score = 0.0
+    return float(sum(get_tatsuro_contributions(row)))
 
-    if pd.notna(row["PER"]) and row["PER"] > 0:
-        score += 1 / row["PER"]
 
-    if pd.notna(row["PBR"]) and row["PBR"] > 0:
-        score += 1 / row["PBR"]
+def get_tatsuro_contributions(row: pd.Series) -> tuple[float, ...]:
+    contributions = compile_factor_expression().contributions(row.to_frame().T)
+    return tuple(float(value) for value in contributions.iloc[0])
 
-    if pd.notna(row["DIV"]):
-        score += row["DIV"] / 100
 
-    return score
+def _normalize_div_policy(div_policy: str) -> str:
+    normalized = div_policy.strip().lower()
+    if normalized not in VALID_DIV_POLICIES:
+        raise ValueError("div_policy must be one of: zero, exclude")
+    return normalized
 
 
-def get_tatsuro_contributions(row: pd.Series) -> tuple[float, float, float]:
-    per_contrib = 1 / row["PER"] if pd.notna(row["PER"]) and row["PER"] > 0 else 0.0
-    pbr_contrib = 1 / row["PBR"] if pd.notna(row["PBR"]) and row["PBR"] > 0 else 0.0
-    div_contrib = row["DIV"] / 100 if pd.notna(row["DIV"]) else 0.0
-    return per_contrib, pbr_contrib, div_contrib
+def _add_tatsuro_columns(df: pd.DataFrame, factor: Optional[FactorExpression] = None) -> pd.DataFrame:
+    return (factor or compile_factor_expression()).apply(df, score_column=SCORE_COLUMN)
 
 
-def get_tatsuro_small_mid_value_top10(
+def _factor_columns(factor: FactorExpression) -> list[str]:
+    extra_fields = [name for name in factor.fields if name not in BASE_COLUMNS]
+    return BASE_COLUMNS + extra_fields + factor.contribution_columns + [SCORE_COLUMN]
+
+
+@dataclass(frozen=True)
+class ScreeningResult:
+    _frame: pd.DataFrame = field(repr=False)
+    used_date: str
+    stats: dict[str, int]
+    logs: tuple[str, ...] = ()
+    contribution_columns: tuple[str, ...] = ()
+    formatted: bool = False
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._frame.copy()
+
+    @property
+    def tickers(self) -> list[str]:
+        return self._frame.index.tolist()
+
+    @property
+    def scores(self) -> np.ndarray:
+        values = self._frame[SCORE_COLUMN].to_numpy()
+        values.flags.writeable = False
+        return values
+
+    def contributions(self) -> pd.DataFrame:
+        return self._frame[list(self.contribution_columns)].copy()
+
+    def to_frame(self) -> pd.DataFrame:
+        display_df = self._frame.copy()
+        if self.formatted:
+            return display_df
+        display_df["시가총액(조)"] = (display_df["시가총액"] / 1_000_000_000_000).round(3)
+        display_df = display_df.drop(columns=["시가총액"])
+        for col in list(self.contribution_columns) + [SCORE_COLUMN]:
+            display_df[col] = display_df[col].round(4)
+        return display_df
+
+
+def get_screening_result(
     market: str = "KOSPI",
     date: Optional[str] = None,
     cap_min: int = 500_000_000_000,
@@ -106,12 +448,14 @@ def get_tatsuro_small_mid_value_top10(
     per_max: Optional[float] = None,
     pbr_max: Optional[float] = None,
     div_policy: str = "zero",
-):
+    score_expression: Optional[str] = None,
+    deadline_sec: Optional[float] = None,
+    use_history: bool = True,
+) -> ScreeningResult:
     normalized_market = normalize_market(market)
     base_date = normalize_date(date)
-    normalized_div_policy = div_policy.strip().lower()
-    if normalized_div_policy not in VALID_DIV_POLICIES:
-        raise ValueError("div_policy must be one of: zero, exclude")
+    normalized_div_policy = _normalize_div_policy(div_policy)
+    factor = compile_factor_expression(score_expression)
 
     cache_key = (
         normalized_market,
@@ -122,66 +466,220 @@ def get_tatsuro_small_mid_value_top10(
         per_max,
         pbr_max,
         normalized_div_policy,
+        factor.source,
     )
-    if cache_key in _QUERY_CACHE:
-        cached_df, cached_used_date, cached_stats, cached_logs = _QUERY_CACHE[cache_key]
-        stats = dict(cached_stats)
-        stats["cache_hit"] = 1
-        return cached_df.copy(), cached_used_date, stats, list(cached_logs)
+    cached = _QUERY_CACHE.get(cache_key)
+    if cached is not None and (use_history or not cached.stats.get("history_hit")):
+        return replace(cached, stats=dict(cached.stats, cache_hit=1))
+
+    history = None
+    if use_history:
+        history = krx_history.lookup_top_n(
+            normalized_market,
+            base_date.strftime("%Y%m%d"),
+            top_n,
+            cap_min,
+            cap_max,
+            per_max=per_max,
+            pbr_max=pbr_max,
+            div_policy=normalized_div_policy,
+            score_expression=factor.source,
+        )
+    if history is not None:
+        history_df, used_date, stats = history
+        result = ScreeningResult(
+            _frame=history_df,
+            used_date=used_date,
+            stats=dict(stats, cache_hit=0, history_hit=1),
+            contribution_columns=tuple(factor.contribution_columns),
+            formatted=True,
+        )
+        _QUERY_CACHE[cache_key] = result
+        return result
+
+    started_at = time.monotonic()
+    with krx_memory.stage("screen") as screen_memory:
+        with krx_memory.stage("screen.load_snapshot"):
+            snapshot_index, used_date, backtrack_logs, stale = load_snapshot_index(
+                normalized_market, base_date.strftime("%Y%m%d"), deadline_sec
+            )
+        with krx_memory.stage("screen.filter"):
+            filtered_df = snapshot_index.query(cap_min, cap_max, per_max, pbr_max, normalized_div_policy)
+
+        with krx_memory.stage("screen.score"):
+            scored_df = factor.top(filtered_df, top_n)
+
+        with krx_memory.stage("screen.ticker_names"):
+            columns = (["시장"] if "시장" in scored_df.columns else []) + _factor_columns(factor)
+            names_pending = None
+            if stale:
+                result_df = add_cached_ticker_names(scored_df[columns])
+            elif deadline_sec is None:
+                result_df = add_ticker_names(scored_df[columns])
+            else:
+                remaining_sec = max(0.0, deadline_sec - (time.monotonic() - started_at))
+                result_df, names_pending = add_ticker_names_within(scored_df[columns], remaining_sec)
+                if names_pending is not None:
+                    backtrack_logs = [*backtrack_logs, f"{used_date}: {names_pending}"]
+            result_df.insert(0, "종목명", result_df.pop("종목명"))
+
+        stats = {
+            "total": snapshot_index.total,
+            "filtered": len(filtered_df),
+            "final": len(result_df),
+            "cache_hit": 0,
+        }
+        if stale:
+            stats["stale"] = 1
+        if names_pending is not None:
+            stats["names_pending"] = 1
+        result = ScreeningResult(
+            _frame=result_df,
+            used_date=used_date,
+            stats=stats,
+            logs=tuple(backtrack_logs),
+            contribution_columns=tuple(factor.contribution_columns),
+        )
+        if not stale and names_pending is None:
+            _QUERY_CACHE[cache_key] = result
+
+    if krx_memory.is_enabled():
+        result = replace(
+            result,
+            stats=dict(
+                result.stats,
+                memory_peak_kb=screen_memory["peak_kb"],
+                memory_retained_kb=screen_memory["retained_kb"],
+            ),
+        )
+    return result
 
-    backtrack_logs: list[str] = []
 
-    market_cap_df, fundamental_df, used_date = get_market_data_with_fallback(
-        market=normalized_market,
-        base_date=base_date,
-        backtrack_logs=backtrack_logs,
+def get_tatsuro_small_mid_value_top10(
+    market: str = "KOSPI",
+    date: Optional[str] = None,
+    cap_min: int = 500_000_000_000,
+    cap_max: int = 1_000_000_000_000,
+    top_n: int = 10,
+    per_max: Optional[float] = None,
+    pbr_max: Optional[float] = None,
+    div_policy: str = "zero",
+    score_expression: Optional[str] = None,
+    deadline_sec: Optional[float] = None,
+    use_history: bool = True,
+):
+    result = get_screening_result(
+        market=market,
+        date=date,
+        cap_min=cap_min,
+        cap_max=cap_max,
+        top_n=top_n,
+        per_max=per_max,
+        pbr_max=pbr_max,
+        div_policy=div_policy,
+        score_expression=score_expression,
+        deadline_sec=deadline_sec,
+        use_history=use_history,
     )
+    return result.to_frame(), result.used_date, dict(result.stats), list(result.logs)
 
-    result_df = market_cap_df.join(fundamental_df, how="inner")
-    total_count = len(result_df)
-
-    result_df = result_df[
-        (result_df["PER"] > 0)
-        & (result_df["PBR"] > 0)
-        & (result_df["시가총액"] >= cap_min)
-        & (result_df["시가총액"] <= cap_max)
-    ]
-
-    if per_max is not None:
-        result_df = result_df[result_df["PER"] <= per_max]
-
-    if pbr_max is not None:
-        result_df = result_df[result_df["PBR"] <= pbr_max]
 
-    if normalized_div_policy == "exclude":
-        result_df = result_df[result_df["DIV"].notna()]
-
-    filtered_count = len(result_df)
-
-    result_df = add_ticker_names(result_df)
-    result_df["PER 기여"] = (1 / result_df["PER"]).where(result_df["PER"] > 0, 0.0)
-    result_df["PBR 기여"] = (1 / result_df["PBR"]).where(result_df["PBR"] > 0, 0.0)
-    result_df["DIV 기여"] = (result_df["DIV"] / 100).where(result_df["DIV"].notna(), 0.0)
-    result_df["TAT"] = result_df["PER 기여"] + result_df["PBR 기여"] + result_df["DIV 기여"]
-
-    result_df = result_df.sort_values("TAT", ascending=False).head(top_n)
-
-    display_df = result_df[
-        ["종목명", "시가총액", "PER", "PBR", "DIV", "PER 기여", "PBR 기여", "DIV 기여", "TAT"]
-    ].copy()
-    display_df["시가총액(조)"] = (display_df["시가총액"] / 1_000_000_000_000).round(3)
-    display_df = display_df.drop(columns=["시가총액"])
-    display_df["TAT"] = display_df["TAT"].round(4)
-    for col in ("PER 기여", "PBR 기여", "DIV 기여"):
-        display_df[col] = display_df[col].round(4)
+def get_tatsuro_full_ranking(
+    market: str = "KOSPI",
+    date: Optional[str] = None,
+    cap_min: int = 500_000_000_000,
+    cap_max: int = 1_000_000_000_000,
+    per_max: Optional[float] = None,
+    pbr_max: Optional[float] = None,
+    div_policy: str = "zero",
+    score_expression: Optional[str] = None,
+) -> tuple[pd.DataFrame, str, dict[str, int], list[str]]:
+    normalized_market = normalize_market(market)
+    base_date = normalize_date(date)
+    normalized_div_policy = _normalize_div_policy(div_policy)
+    factor = compile_factor_expression(score_expression)
+
+    snapshot_index, used_date, backtrack_logs = get_snapshot_index(normalized_market, base_date.strftime("%Y%m%d"))
+    result_df = snapshot_index.query(cap_min, cap_max, per_max, pbr_max, normalized_div_policy)
+    total_count = snapshot_index.total
+    result_df = _add_tatsuro_columns(result_df, factor)
+    result_df = result_df.sort_index(kind="mergesort").sort_values(SCORE_COLUMN, ascending=False, kind="mergesort")
+    result_df["순위"] = range(1, len(result_df) + 1)
+    result_df["백분위"] = result_df[SCORE_COLUMN].rank(pct=True, method="max") * 100
+    ranking_columns = _factor_columns(factor) + ["순위", "백분위"]
+    result_df = result_df[(["시장"] if "시장" in result_df.columns else []) + ranking_columns]
+    result_df.index.name = "티커"
 
     stats = {
         "total": total_count,
-        "filtered": filtered_count,
-        "final": len(display_df),
+        "filtered": len(result_df),
+        "final": len(result_df),
         "cache_hit": 0,
     }
+    return result_df, used_date, stats, backtrack_logs
+
+
+def iter_ranking_chunks(ranking_df: pd.DataFrame, chunk_size: int = 500) -> Iterator[pd.DataFrame]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    for start in range(0, len(ranking_df), chunk_size):
+        yield ranking_df.iloc[start : start + chunk_size]
 
-    _QUERY_CACHE[cache_key] = (display_df.copy(), used_date, dict(stats), list(backtrack_logs))
 
-    return display_df, used_date, stats, backtrack_logs
+def _write_ranking_chunk(handle, chunk: pd.DataFrame, fmt: str, write_header: bool) -> None:
+    if fmt == "csv":
+        chunk.to_csv(handle, header=write_header, index=False, lineterminator="\n")
+        return
+    payload = chunk.to_json(orient="records", lines=True, force_ascii=False)
+    handle.write(payload if payload.endswith("\n") else payload + "\n")
+
+
+def write_ranking_stream(
+    output_path: str,
+    markets: Iterable[str] = ("KOSPI", "KOSDAQ"),
+    date: Optional[str] = None,
+    fmt: str = "csv",
+    chunk_size: int = 500,
+    cap_min: int = 500_000_000_000,
+    cap_max: int = 1_000_000_000_000,
+    per_max: Optional[float] = None,
+    pbr_max: Optional[float] = None,
+    div_policy: str = "zero",
+    score_expression: Optional[str] = None,
+) -> dict[str, int]:
+    normalized_fmt = fmt.strip().lower()
+    if normalized_fmt not in VALID_EXPORT_FORMATS:
+        raise ValueError("fmt must be one of: csv, ndjson")
+
+    target_path = Path(output_path)
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    encoding = "utf-8-sig" if normalized_fmt == "csv" else "utf-8"
+
+    written: dict[str, int] = {}
+    write_header = True
+    with target_path.open("w", encoding=encoding, newline="") as handle:
+        for market in markets:
+            ranking_df, used_date, _, _ = get_tatsuro_full_ranking(
+                market=market,
+                date=date,
+                cap_min=cap_min,
+                cap_max=cap_max,
+                per_max=per_max,
+                pbr_max=pbr_max,
+                div_policy=div_policy,
+                score_expression=score_expression,
+            )
+            normalized_market = normalize_market(market)
+            for chunk in iter_ranking_chunks(ranking_df, chunk_size=chunk_size):
+                chunk = chunk.reset_index()
+                chunk.insert(0, "기준일", used_date)
+                if "시장" in chunk.columns:
+                    chunk.insert(0, "시장", chunk.pop("시장"))
+                else:
+                    chunk.insert(0, "시장", normalized_market)
+                _write_ranking_chunk(handle, chunk, normalized_fmt, write_header)
+                write_header = False
+            handle.flush()
+            written[normalized_market] = len(ranking_df)
+
+    return written
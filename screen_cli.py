@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="여러 날짜/시장 종목 조회를 병렬 실행해 CSV/NDJSON으로 스트리밍 저장")
+    parser.add_argument("--dates", default=None, help="조회일 목록(쉼표 구분, 지정 시 기간 무시)")
+    parser.add_argument("--start-date", default=None, help="시작일 (YYYYMMDD 또는 YYYY-MM-DD), 기간 내 모든 거래일 조회")
+    parser.add_argument("--end-date", default=None, help="종료일 (YYYYMMDD 또는 YYYY-MM-DD)")
+    parser.add_argument("--markets", default="KOSPI,KOSDAQ", help="시장 목록(쉼표 구분, KOSPI/KOSDAQ/ALL)")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--cap-min", type=int, default=500_000_000_000)
+    parser.add_argument("--cap-max", type=int, default=1_000_000_000_000)
+    parser.add_argument("--per-max", type=float, default=None)
+    parser.add_argument("--pbr-max", type=float, default=None)
+    parser.add_argument("--div-policy", choices=("zero", "exclude"), default="zero")
+    parser.add_argument("--score-expression", default=None, help="점수식(기본: inv(PER) + inv(PBR) + DIV / 100)")
+    parser.add_argument("--output", default="screens/screen.csv", help="결과 파일 경로")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--workers", type=int, default=4, help="동시 조회 스레드 수(캐시/요청 속도 제한 공유)")
+    parser.add_argument("--rate-limit", type=float, default=None, help="KRX 초당 요청 수 상한(프로세스 전체)")
+    parser.add_argument("--pool-size", type=int, default=None, help="KRX keep-alive 연결 풀 크기")
+    parser.add_argument("--cache-dir", default=None, help="데이터 캐시 디렉터리(기본: ~/.tatsurolist-krx/cache)")
+    parser.add_argument("--offline", action="store_true", help="KRX에 접속하지 않고 로컬 캐시만 사용")
+    parser.add_argument("--quiet", action="store_true", help="날짜별 진행 상황 출력 생략")
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if not args.dates and not (args.start_date and args.end_date):
+        parser.error("--dates or both --start-date and --end-date are required")
+
+    import krx_cache
+    import krx_fetch
+
+    if args.cache_dir:
+        krx_cache.configure_cache_dir(args.cache_dir)
+    krx_fetch.configure_fetch(rate_per_sec=args.rate_limit, pool_size=args.pool_size, offline=args.offline or None)
+
+    from krx_screening import iter_screen_results, resolve_screen_dates, write_screen_stream
+
+    dates = resolve_screen_dates(
+        start_date=args.start_date,
+        end_date=args.end_date,
+        dates=args.dates.split(",") if args.dates else None,
+    )
+    markets = [market.strip() for market in args.markets.split(",") if market.strip()]
+
+    def report_progress(result) -> None:
+        if args.quiet:
+            return
+        if result.ok:
+            print(f"[done] {result.market} {result.date} -> {result.used_date} ({len(result.frame)} rows)")
+        else:
+            print(f"[failed] {result.market} {result.date}: {result.error}")
+
+    started_at = perf_counter()
+    results = iter_screen_results(
+        markets,
+        dates,
+        workers=args.workers,
+        cap_min=args.cap_min,
+        cap_max=args.cap_max,
+        top_n=args.top_n,
+        per_max=args.per_max,
+        pbr_max=args.pbr_max,
+        div_policy=args.div_policy,
+        score_expression=args.score_expression,
+    )
+    summary = write_screen_stream(args.output, results, fmt=args.format, on_result=report_progress)
+
+    fetch_stats = krx_fetch.get_fetch_stats()
+    print("[완료] 다중 날짜 종목 조회")
+    print(f"- output: {Path(args.output)}")
+    print(f"- jobs: {summary['jobs']} ({len(dates)} dates x {len(markets)} markets) | rows: {summary['rows']}")
+    print(f"- failed: {len(summary['failed'])}")
+    for failure in summary["failed"]:
+        print(f"  - {failure}")
+    print(
+        f"- elapsed: {perf_counter() - started_at:.1f}s | upstream calls: {fetch_stats['calls']} | "
+        f"disk cache hits: {fetch_stats['cache_hits']}"
+    )
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
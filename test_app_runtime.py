@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 import json
+import logging
 import tempfile
 import unittest
+from logging.handlers import QueueHandler
 from pathlib import Path
 
-from app_runtime import DEFAULT_CONFIG, load_config, save_config, setup_file_logging
+from app_runtime import DEFAULT_CONFIG, load_config, save_config, setup_file_logging, shutdown_file_logging
 
 
 class AppRuntimeTests(unittest.TestCase):
@@ -39,10 +41,83 @@ class AppRuntimeTests(unittest.TestCase):
         with tempfile.TemporaryDirectory() as tmpdir:
             log_path = Path(tmpdir) / "app.log"
             out = setup_file_logging(log_path=log_path)
+            shutdown_file_logging(log_path)
 
             self.assertEqual(out, log_path)
             self.assertTrue(log_path.exists())
 
+    def test_setup_file_logging_writes_through_queue_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "app.log"
+            setup_file_logging(log_path=log_path, json_format=False)
+            setup_file_logging(log_path=log_path, json_format=False)
+            try:
+                queue_handlers = [h for h in logging.getLogger().handlers if isinstance(h, QueueHandler)]
+                self.assertEqual(len(queue_handlers), 1)
+                logging.getLogger("test").info("조회 완료 | final=%s", 3)
+            finally:
+                shutdown_file_logging(log_path)
+
+            lines = log_path.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(len(lines), 1)
+            self.assertIn("[INFO] 조회 완료 | final=3", lines[0])
+
+    def test_json_format_includes_extra_fields(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "app.jsonl"
+            setup_file_logging(log_path=log_path, json_format=True)
+            try:
+                logging.getLogger("test").info(
+                    "조회 완료",
+                    extra={"event": "screen_done", "elapsed_sec": 1.25, "cache_hit": 1, "upstream_calls": 4},
+                )
+            finally:
+                shutdown_file_logging(log_path)
+
+            record = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+            self.assertEqual(record["message"], "조회 완료")
+            self.assertEqual(record["level"], "INFO")
+            self.assertEqual(record["event"], "screen_done")
+            self.assertEqual(record["elapsed_sec"], 1.25)
+            self.assertEqual(record["upstream_calls"], 4)
+            self.assertNotIn("args", record)
+
+    def test_exception_traceback_keeps_its_own_field_through_the_queue(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "app.jsonl"
+            text_path = Path(tmpdir) / "app.log"
+            setup_file_logging(log_path=log_path, json_format=True)
+            setup_file_logging(log_path=text_path, json_format=False)
+            try:
+                try:
+                    raise RuntimeError("KRX 500")
+                except RuntimeError:
+                    logging.getLogger("test").exception("조회 실패 | market=%s", "KOSPI")
+            finally:
+                shutdown_file_logging(log_path)
+                shutdown_file_logging(text_path)
+
+            record = json.loads(log_path.read_text(encoding="utf-8").splitlines()[0])
+            text = text_path.read_text(encoding="utf-8")
+
+        self.assertEqual(record["message"], "조회 실패 | market=KOSPI")
+        self.assertIn("RuntimeError: KRX 500", record["exc_info"])
+        self.assertIn("[ERROR] 조회 실패 | market=KOSPI", text)
+        self.assertIn("RuntimeError: KRX 500", text)
+
+    def test_log_file_rotates_by_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            log_path = Path(tmpdir) / "app.log"
+            setup_file_logging(log_path=log_path, json_format=False, max_bytes=200, backup_count=2)
+            try:
+                for i in range(20):
+                    logging.getLogger("test").info("line %s %s", i, "x" * 40)
+            finally:
+                shutdown_file_logging(log_path)
+
+            self.assertTrue(Path(f"{log_path}.1").exists())
+            self.assertFalse(Path(f"{log_path}.3").exists())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+
+import bench_startup as bench
+
+SAMPLE_IMPORTTIME = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |       4284 | app_runtime
+import time:      5932 |     905470 |   pykrx
+import time:      4327 |    1486151 | krx_backtest
+"""
+
+
+class ParseImporttimeTests(unittest.TestCase):
+    def test_parse_importtime_reads_modules_and_depth(self):
+        entries = bench.parse_importtime(SAMPLE_IMPORTTIME)
+
+        self.assertEqual([entry["module"] for entry in entries], ["_io", "app_runtime", "pykrx", "krx_backtest"])
+        self.assertEqual(entries[2]["depth"], 1)
+        self.assertAlmostEqual(entries[3]["cumulative_ms"], 1486.151)
+
+    def test_format_import_breakdown_sorts_by_cumulative(self):
+        lines = bench.format_import_breakdown(bench.parse_importtime(SAMPLE_IMPORTTIME), top=2)
+
+        self.assertEqual(len(lines), 3)
+        self.assertIn("krx_backtest", lines[1])
+        self.assertIn("pykrx", lines[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
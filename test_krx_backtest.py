@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import json
 import tempfile
 import unittest
+from dataclasses import asdict
 from pathlib import Path
 from unittest.mock import patch
 
 import pandas as pd
 
 import krx_backtest as bt
+import krx_cache
+from krx_value_service import ScreeningResult
 
 
 class BacktestDateTests(unittest.TestCase):
@@ -19,6 +23,131 @@ class BacktestDateTests(unittest.TestCase):
         with self.assertRaisesRegex(ValueError, "start_date"):
             bt.generate_month_end_dates("2026-03-01", "2026-01-01")
 
+    def test_generate_rebalance_dates_snaps_to_trading_days(self):
+        calendar = ["20260105", "20260109", "20260112", "20260115", "20260123", "20260130"]
+
+        weekly = bt.generate_rebalance_dates("2026-01-05", "2026-01-31", freq="W", calendar=calendar)
+        monthly = bt.generate_rebalance_dates("2026-01-01", "2026-01-31", freq="M", calendar=calendar)
+
+        self.assertEqual(weekly, ["20260109", "20260115", "20260123", "20260130"])
+        self.assertEqual(monthly, ["20260130"])
+
+    def test_generate_rebalance_dates_custom_and_quarterly(self):
+        calendar = ["20260330", "20260630", "20260930"]
+
+        custom = bt.generate_rebalance_dates(
+            "2026-01-01", "2026-12-31", custom_dates=["2026-07-01", "20260331", "2026-06-30"], calendar=calendar
+        )
+        quarterly = bt.generate_rebalance_dates("2026-01-01", "2026-09-30", freq="Q")
+
+        self.assertEqual(custom, ["20260330", "20260630"])
+        self.assertEqual(quarterly, ["20260331", "20260630", "20260930"])
+        with self.assertRaisesRegex(ValueError, "freq must be one of"):
+            bt.generate_rebalance_dates("2026-01-01", "2026-03-31", freq="H")
+
+
+class PricePanelTests(unittest.TestCase):
+    def setUp(self):
+        bt._CLOSE_SNAPSHOT_CACHE.clear()
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+
+    def tearDown(self):
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        self._tmpdir.cleanup()
+
+    @patch("krx_backtest.CLOSE_SNAPSHOT_CACHE_SIZE", 2)
+    @patch("krx_backtest.krx_fetch.get_market_cap_by_ticker", return_value=pd.DataFrame({"상장주식수": [10]}, index=["A"]))
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_ticker")
+    def test_close_snapshot_cache_evicts_least_recently_used(self, mock_ohlcv, _mock_cap):
+        mock_ohlcv.side_effect = lambda date, market: pd.DataFrame({"종가": [100.0]}, index=["A"])
+
+        for date in ("20200102", "20200103", "20200102", "20200106"):
+            bt._close_snapshot("KOSPI", date)
+
+        self.assertEqual(list(bt._CLOSE_SNAPSHOT_CACHE), [("KOSPI", "20200102"), ("KOSPI", "20200106")])
+        self.assertEqual(mock_ohlcv.call_count, 3)
+
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_date")
+    def test_failed_ticker_range_is_not_requested_again_until_ttl(self, mock_range):
+        mock_range.side_effect = KeyError("종가")
+
+        first = bt._ticker_range_return("999999", "20200131", "20200228")
+        second = bt._ticker_range_return("999999", "20200131", "20200228")
+
+        self.assertIsNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(mock_range.call_count, 1)
+        entry = krx_cache.get_negative_cache().lookup("ticker_range", "999999", "20200131", "20200228")
+        self.assertIn("KeyError", entry["reason"])
+        self.assertIn("expires_at", entry)
+
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_date")
+    def test_confirmed_empty_ticker_range_is_cached_without_expiry(self, mock_range):
+        mock_range.return_value = pd.DataFrame()
+
+        self.assertIsNone(bt._ticker_range_return("999999", "20200131", "20200228", delisted=True))
+        self.assertIsNone(bt._ticker_range_return("888888", "20200131", "20200228"))
+
+        negative_cache = krx_cache.get_negative_cache()
+        entry = negative_cache.lookup("ticker_range", "999999", "20200131", "20200228")
+        self.assertEqual(entry["reason"], "빈 결과")
+        self.assertNotIn("expires_at", entry)
+        self.assertIn("expires_at", negative_cache.lookup("ticker_range", "888888", "20200131", "20200228"))
+
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_date")
+    def test_transient_ticker_errors_are_not_cached(self, mock_range):
+        mock_range.side_effect = ConnectionError("reset")
+
+        bt._ticker_range_return("000001", "20200131", "20200228")
+        bt._ticker_range_return("000001", "20200131", "20200228")
+
+        self.assertEqual(mock_range.call_count, 2)
+
+    @patch("krx_backtest.krx_fetch.get_market_cap_by_ticker")
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_date")
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_ticker")
+    def test_ticker_returns_use_date_snapshots_with_per_ticker_fallback(self, mock_snapshot, mock_range, mock_cap):
+        snapshots = {
+            "20260130": pd.DataFrame({"종가": [100.0, 50.0, 10.0]}, index=["A", "B", "C"]),
+            "20260227": pd.DataFrame({"종가": [110.0, 45.0]}, index=["A", "B"]),
+        }
+        mock_snapshot.side_effect = lambda date, market: snapshots[date]
+        mock_cap.side_effect = lambda date, market: pd.DataFrame({"상장주식수": 1000}, index=snapshots[date].index)
+        mock_range.return_value = pd.DataFrame({"종가": [10.0, 12.0]})
+
+        first = bt._ticker_period_returns(["A", "B", "C"], "20260130", "20260227", market="KOSPI")
+        second = bt._ticker_period_returns(["A"], "20260130", "20260227", market="KOSPI")
+
+        self.assertAlmostEqual(first["A"], 0.1)
+        self.assertAlmostEqual(first["B"], -0.1)
+        self.assertAlmostEqual(first["C"], 0.2)
+        self.assertEqual(list(first.index), ["A", "B", "C"])
+        self.assertAlmostEqual(second["A"], 0.1)
+        self.assertEqual(mock_snapshot.call_count, 2)
+        self.assertEqual(mock_range.call_count, 1)
+
+
+    @patch("krx_backtest.krx_fetch.get_market_cap_by_ticker")
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_date")
+    @patch("krx_backtest.krx_fetch.get_market_ohlcv_by_ticker")
+    def test_split_between_snapshots_uses_adjusted_range(self, mock_snapshot, mock_range, mock_cap):
+        snapshots = {
+            "20260130": pd.DataFrame({"종가": [100.0, 50.0]}, index=["A", "B"]),
+            "20260227": pd.DataFrame({"종가": [22.0, 55.0]}, index=["A", "B"]),
+        }
+        shares = {"20260130": [1000, 500], "20260227": [5000, 500]}
+        mock_snapshot.side_effect = lambda date, market: snapshots[date]
+        mock_cap.side_effect = lambda date, market: pd.DataFrame({"상장주식수": shares[date]}, index=["A", "B"])
+        mock_range.return_value = pd.DataFrame({"종가": [20.0, 22.0]})
+
+        returns = bt._ticker_period_returns(["A", "B"], "20260130", "20260227", market="KOSPI")
+
+        self.assertAlmostEqual(returns["A"], 0.1)
+        self.assertAlmostEqual(returns["B"], 0.1)
+        mock_range.assert_called_once_with("20260130", "20260227", "A")
+
 
 class BacktestSummaryTests(unittest.TestCase):
     def test_summarize_backtest_calculates_cumulative_and_mdd(self):
@@ -35,6 +164,254 @@ class BacktestSummaryTests(unittest.TestCase):
         self.assertAlmostEqual(summary["portfolio_cumulative_return"], -0.076, places=6)
         self.assertAlmostEqual(summary["benchmark_cumulative_return"], -0.000706, places=6)
         self.assertLess(summary["portfolio_mdd"], 0)
+        self.assertAlmostEqual(summary["portfolio_mdd"], -0.2)
+        self.assertAlmostEqual(summary["hit_rate"], 2 / 3)
+
+
+class BenchmarkReturnTests(unittest.TestCase):
+    @patch("krx_backtest._index_period_return")
+    def test_all_market_benchmark_averages_both_indices(self, mock_index_return):
+        mock_index_return.side_effect = lambda ticker, buy, sell: {"1001": 0.02, "2001": 0.04}[ticker]
+
+        self.assertAlmostEqual(bt._benchmark_monthly_return("ALL", "20260130", "20260227"), 0.03)
+        self.assertAlmostEqual(bt._benchmark_monthly_return("KOSPI", "20260130", "20260227"), 0.02)
+
+
+class WeightsEngineTests(unittest.TestCase):
+    def test_apply_weights_and_costs_tracks_turnover_and_drag(self):
+        weights_df = bt.build_weights_matrix([["A", "B"], ["A", "B"], ["C"]])
+        returns_df = pd.DataFrame({"A": [0.1, 0.0, None], "B": [-0.1, 0.0, None], "C": [None, None, 0.05]})
+        cost_model = bt.CostModel(commission_rate=0.001, tax_rate=0.002, slippage_rate=0.0)
+
+        out = bt.apply_weights_and_costs(weights_df, returns_df, cost_model)
+
+        self.assertEqual(list(weights_df.columns), ["A", "B", "C"])
+        self.assertAlmostEqual(out.loc[0, "gross_return"], 0.0)
+        self.assertAlmostEqual(out.loc[0, "turnover"], 0.5)
+        self.assertAlmostEqual(out.loc[0, "transaction_cost"], 0.001)
+        self.assertAlmostEqual(out.loc[1, "turnover"], 0.05)
+        self.assertAlmostEqual(out.loc[2, "turnover"], 1.0)
+        self.assertAlmostEqual(out.loc[2, "transaction_cost"], 0.001 + 0.003)
+        self.assertAlmostEqual(out.loc[2, "net_return"], 0.05 - 0.004)
+
+    @patch("krx_backtest._index_close_series")
+    @patch("krx_backtest.get_trading_calendar", return_value=["20260130", "20260227", "20260331"])
+    @patch("krx_backtest._benchmark_monthly_return", return_value=0.01)
+    @patch("krx_backtest._ticker_period_returns")
+    @patch("krx_backtest.get_screening_result")
+    def test_run_backtest_records_selection_history_and_costs(
+        self, mock_screen, mock_ticker_returns, _mock_benchmark, _mock_calendar, _mock_index
+    ):
+        mock_screen.side_effect = [
+            ScreeningResult(_frame=pd.DataFrame(index=["A", "B", "X"]), used_date="20260130", stats={}),
+            ScreeningResult(_frame=pd.DataFrame(index=["A", "C"]), used_date="20260227", stats={}),
+        ]
+        mock_ticker_returns.side_effect = [
+            pd.Series({"A": 0.1, "B": 0.3}),
+            pd.Series({"A": -0.1, "C": 0.1}),
+        ]
+        config = bt.BacktestConfig(
+            start_date="2026-01-01",
+            end_date="2026-03-31",
+            cost_model={"commission_rate": 0.001},
+        )
+
+        result_df = bt.run_monthly_rebalance_backtest("KOSPI", config)
+
+        self.assertEqual(list(result_df["selected_count"]), [3, 2])
+        self.assertEqual(list(result_df["selected_tickers"]), ["A,B,X", "A,C"])
+        self.assertEqual(list(result_df["held_tickers"]), ["A,B", "A,C"])
+        self.assertAlmostEqual(result_df.loc[0, "gross_return"], 0.2)
+        self.assertAlmostEqual(result_df.loc[0, "portfolio_return"], 0.2 - 0.001)
+        self.assertAlmostEqual(result_df.loc[1, "gross_return"], 0.0)
+        self.assertAlmostEqual(result_df.loc[0, "excess_return"], 0.2 - 0.001 - 0.01)
+        self.assertEqual(list(result_df.attrs["weights"].columns), ["A", "B", "C"])
+        self.assertEqual(result_df.attrs["cost_model"]["commission_rate"], 0.001)
+        self.assertEqual(list(bt.weights_from_results(result_df).columns), ["A", "B", "C"])
+
+
+class StreamingBacktestTests(unittest.TestCase):
+    calendar = ["20260130", "20260227", "20260331", "20260430"]
+    selections = {
+        "20260130": ["A", "B", "X"],
+        "20260227": ["A", "C"],
+        "20260331": ["C", "D"],
+    }
+    returns = {
+        "20260130": {"A": 0.1, "B": 0.3},
+        "20260227": {"A": -0.1, "C": 0.1},
+        "20260331": {"C": 0.05, "D": -0.02},
+    }
+
+    def setUp(self):
+        patchers = [
+            patch("krx_backtest._index_close_series"),
+            patch("krx_backtest.get_trading_calendar", return_value=self.calendar),
+            patch("krx_backtest._benchmark_monthly_return", return_value=0.01),
+            patch(
+                "krx_backtest._ticker_period_returns",
+                side_effect=lambda tickers, buy_date, sell_date, market: pd.Series(self.returns[buy_date]),
+            ),
+            patch(
+                "krx_backtest.get_screening_result",
+                side_effect=lambda market, date, **kwargs: ScreeningResult(
+                    _frame=pd.DataFrame(index=self.selections[date]), used_date=date, stats={}
+                ),
+            ),
+        ]
+        self.mocks = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+        self.mock_screen = self.mocks[-1]
+        self.config = bt.BacktestConfig(
+            start_date="2026-01-01",
+            end_date="2026-04-30",
+            cost_model={"commission_rate": 0.001, "tax_rate": 0.002},
+        )
+
+    def test_incremental_costs_match_weights_matrix_engine(self):
+        rows = list(bt.iter_monthly_rebalance_backtest("KOSPI", self.config))
+
+        held = [list(self.returns[date]) for date in self.calendar[:-1]]
+        expected = bt.apply_weights_and_costs(
+            bt.build_weights_matrix(held),
+            pd.DataFrame([self.returns[date] for date in self.calendar[:-1]]),
+            self.config.cost_model,
+        )
+        self.assertEqual(len(rows), 3)
+        for row, (_, matrix_row) in zip(rows, expected.iterrows()):
+            self.assertAlmostEqual(row["gross_return"], matrix_row["gross_return"])
+            self.assertAlmostEqual(row["turnover"], matrix_row["turnover"])
+            self.assertAlmostEqual(row["transaction_cost"], matrix_row["transaction_cost"])
+        self.assertAlmostEqual(
+            rows[-1]["portfolio_cumulative"], float((1 + expected["net_return"]).prod() - 1)
+        )
+
+    def test_streaming_run_resumes_after_interruption(self):
+        full_df = bt.run_monthly_rebalance_backtest("KOSPI", self.config)
+
+        def crash_after_second_row(row):
+            if row["rebalance_date"] == "20260227":
+                raise RuntimeError("killed")
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaises(RuntimeError):
+                bt.run_streaming_backtest(tmpdir, self.config, markets=("KOSPI",), on_row=crash_after_second_row)
+            partial_path = Path(tmpdir) / "backtest_kospi_monthly.csv"
+            with partial_path.open("a", encoding="utf-8") as handle:
+                handle.write("KOSPI,20260331,2026")
+            self.mock_screen.reset_mock()
+
+            seen: list[str] = []
+            summary_df, market_results = bt.run_streaming_backtest(
+                tmpdir, self.config, markets=("KOSPI",), on_row=lambda row: seen.append(row["rebalance_date"])
+            )
+
+        self.assertEqual(seen, ["20260331"])
+        self.assertEqual(self.mock_screen.call_count, 1)
+        resumed_df = market_results["KOSPI"]
+        self.assertEqual(list(resumed_df["selected_tickers"]), list(full_df["selected_tickers"]))
+        self.assertEqual(list(resumed_df["held_tickers"]), list(full_df["held_tickers"]))
+        for column in ("turnover", "transaction_cost", "portfolio_cumulative", "excess_cumulative"):
+            for resumed, expected in zip(resumed_df[column], full_df[column]):
+                self.assertAlmostEqual(resumed, expected)
+        self.assertEqual(int(summary_df.loc[0, "periods"]), 3)
+        self.assertEqual(list(resumed_df.attrs["weights"].columns), ["A", "B", "C", "D"])
+        expected_summary = bt.summarize_backtest(full_df)
+        for key in ("portfolio_cumulative_return", "portfolio_mdd", "portfolio_sharpe", "hit_rate"):
+            self.assertAlmostEqual(summary_df.loc[0, key], expected_summary[key])
+
+    def test_streaming_run_reports_running_metrics_per_period(self):
+        reported: list[dict] = []
+        with tempfile.TemporaryDirectory() as tmpdir:
+            summary_df, _ = bt.run_streaming_backtest(
+                tmpdir, self.config, markets=("KOSPI",), on_metrics=lambda row, metrics: reported.append(metrics)
+            )
+
+        self.assertEqual([metrics["periods"] for metrics in reported], [1, 2, 3])
+        self.assertAlmostEqual(reported[-1]["portfolio_sharpe"], summary_df.loc[0, "portfolio_sharpe"])
+        self.assertAlmostEqual(reported[-1]["portfolio_mdd"], summary_df.loc[0, "portfolio_mdd"])
+
+    def test_streaming_run_restarts_results_written_with_older_columns(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fingerprint = json.dumps(asdict(self.config), sort_keys=True, default=str)
+            (Path(tmpdir) / bt.STREAM_STATE_FILE).write_text(json.dumps({"config": fingerprint}), encoding="utf-8")
+            (Path(tmpdir) / "backtest_kospi_monthly.csv").write_text(
+                "market,rebalance_date,next_rebalance_date,selected_count,selected_tickers\nKOSPI,20260130,20260227,3,\"A,B\"\n",
+                encoding="utf-8-sig",
+            )
+
+            _, market_results = bt.run_streaming_backtest(tmpdir, self.config, markets=("KOSPI",))
+
+        self.assertEqual(self.mock_screen.call_count, 3)
+        self.assertEqual(list(market_results["KOSPI"]["held_tickers"]), ["A,B", "A,C", "C,D"])
+
+    def test_streaming_run_restarts_when_config_changes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bt.run_streaming_backtest(tmpdir, self.config, markets=("KOSPI",))
+            self.mock_screen.reset_mock()
+            changed = bt.BacktestConfig(start_date="2026-01-01", end_date="2026-04-30", top_n=5)
+
+            _, market_results = bt.run_streaming_backtest(tmpdir, changed, markets=("KOSPI",))
+
+        self.assertEqual(self.mock_screen.call_count, 3)
+        self.assertEqual(len(market_results["KOSPI"]), 3)
+
+
+    def test_weekly_schedule_screens_incrementally(self):
+        calendar = ["20260105", "20260109", "20260116", "20260123"]
+        universe = pd.DataFrame(
+            {"시가총액": [7e11] * 4, "PER": [4.0, 8.0, 4.0, 2.0], "PBR": [1.0] * 4, "DIV": [1.0] * 4},
+            index=["C", "B", "A", "D"],
+        )
+        loaded: list[str] = []
+
+        def load(market, base_date, backtrack_logs):
+            loaded.append(base_date.strftime("%Y%m%d"))
+            return universe[["시가총액"]], universe[["PER", "PBR", "DIV"]], "20260102"
+
+        config = bt.BacktestConfig(start_date="2026-01-05", end_date="2026-01-23", top_n=3, rebalance_freq="W")
+        with patch("krx_backtest.get_trading_calendar", return_value=calendar), patch(
+            "krx_incremental._load_market_data", side_effect=load
+        ), patch("krx_backtest._ticker_period_returns", return_value=pd.Series({"D": 0.01})) as mock_returns:
+            rows = list(bt.iter_monthly_rebalance_backtest("KOSPI", config))
+
+        self.mock_screen.assert_not_called()
+        self.assertEqual([row["rebalance_date"] for row in rows], ["20260102", "20260102"])
+        self.assertEqual(loaded, ["20260109", "20260116"])
+        self.assertEqual(mock_returns.call_args.kwargs["tickers"], ["D", "A", "C"])
+
+
+class RollingWindowTests(unittest.TestCase):
+    def _result_df(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "rebalance_date": ["20260130", "20260227", "20260331", "20260430"],
+                "next_rebalance_date": ["20260227", "20260331", "20260430", "20260529"],
+                "portfolio_return": [0.1, -0.2, 0.05, 0.1],
+                "benchmark_return": [0.01, -0.03, 0.02, 0.0],
+            }
+        )
+
+    def test_rolling_windows_match_per_window_summary(self):
+        result_df = self._result_df()
+
+        rolling_df = bt.compute_rolling_window_metrics(result_df, window_periods=3, step_periods=1)
+
+        self.assertEqual(list(rolling_df["window_start"]), ["20260130", "20260227"])
+        self.assertEqual(list(rolling_df["window_end"]), ["20260430", "20260529"])
+        for i, row in rolling_df.iterrows():
+            expected = bt.summarize_backtest(result_df.iloc[i : i + 3])
+            self.assertAlmostEqual(row["portfolio_cumulative_return"], expected["portfolio_cumulative_return"])
+            self.assertAlmostEqual(row["benchmark_cumulative_return"], expected["benchmark_cumulative_return"])
+            self.assertAlmostEqual(row["portfolio_mdd"], expected["portfolio_mdd"])
+            self.assertAlmostEqual(row["benchmark_mdd"], expected["benchmark_mdd"])
+
+    def test_rolling_windows_respect_step_and_short_history(self):
+        result_df = self._result_df()
+
+        self.assertEqual(len(bt.compute_rolling_window_metrics(result_df, window_periods=2, step_periods=2)), 2)
+        self.assertTrue(bt.compute_rolling_window_metrics(result_df, window_periods=5).empty)
 
 
 class BacktestReportTests(unittest.TestCase):
@@ -71,6 +448,37 @@ class BacktestReportTests(unittest.TestCase):
             self.assertTrue((Path(tmpdir) / "backtest_summary.csv").exists())
             self.assertTrue((Path(tmpdir) / "backtest_kospi_monthly.csv").exists())
 
+    def test_write_backtest_report_outputs_weights_and_cost_model(self):
+        summary_df = pd.DataFrame({"market": ["KOSPI"], "periods": [2]})
+        market_df = pd.DataFrame(
+            {"rebalance_date": ["20260130", "20260227"], "selected_tickers": ["A,B", "B"], "portfolio_return": [0.1, 0.0]}
+        )
+        market_df.attrs["cost_model"] = {"commission_rate": 0.001, "tax_rate": 0.002, "slippage_rate": 0.0}
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = bt.write_backtest_report(tmpdir, summary_df, {"KOSPI": market_df})
+            report_text = report_path.read_text(encoding="utf-8")
+            weights_df = pd.read_csv(Path(tmpdir) / "backtest_kospi_weights.csv", encoding="utf-8-sig", dtype={"rebalance_date": str})
+
+        self.assertIn("## Cost Model", report_text)
+        self.assertEqual(list(weights_df["B"]), [0.5, 1.0])
+
+    def test_write_backtest_report_includes_rolling_windows(self):
+        summary_df = pd.DataFrame({"market": ["KOSPI"], "periods": [2]})
+        rolling_df = pd.DataFrame(
+            {"excess_cumulative_return": [0.1, -0.05], "portfolio_mdd": [-0.1, -0.2]}
+        )
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = bt.write_backtest_report(
+                tmpdir, summary_df, {"KOSPI": pd.DataFrame({"a": [1]})}, rolling_results={"KOSPI": rolling_df}
+            )
+            report_text = report_path.read_text(encoding="utf-8")
+            self.assertTrue((Path(tmpdir) / "backtest_kospi_rolling.csv").exists())
+
+        self.assertIn("## Rolling Windows", report_text)
+        self.assertIn("| KOSPI | 2 | 0.5 |", report_text)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import krx_batch
+import krx_fetch
+
+
+def _write_manifest(tmpdir: str, payload: dict) -> str:
+    path = Path(tmpdir) / "manifest.json"
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return str(path)
+
+
+class LoadManifestTests(unittest.TestCase):
+    def test_fills_defaults_and_normalizes_markets(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = krx_batch.load_manifest(
+                _write_manifest(
+                    tmpdir,
+                    {
+                        "workers": 3,
+                        "rate_limit": 6,
+                        "jobs": [
+                            {"name": "base", "start_date": "20200101", "end_date": "20201231", "markets": ["kospi"]},
+                            {"start_date": "20200101", "end_date": "20201231", "config": {"top_n": 20}},
+                        ],
+                    },
+                )
+            )
+
+        self.assertEqual(manifest["workers"], 3)
+        self.assertEqual(manifest["jobs"][0]["markets"], ["KOSPI"])
+        self.assertEqual(manifest["jobs"][1]["name"], "job_001")
+        self.assertEqual(manifest["jobs"][1]["markets"], ["KOSPI", "KOSDAQ"])
+        self.assertEqual(Path(manifest["jobs"][1]["output_dir"]).name, "job_001")
+
+    def test_single_market_string_is_not_split_into_characters(self):
+        job = {"name": "one", "start_date": "20200101", "end_date": "20201231"}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = krx_batch.load_manifest(_write_manifest(tmpdir, {"jobs": [dict(job, markets="kospi")]}))
+            with self.assertRaisesRegex(ValueError, "markets"):
+                krx_batch.load_manifest(_write_manifest(tmpdir, {"jobs": [dict(job, markets=1)]}))
+
+        self.assertEqual(manifest["jobs"][0]["markets"], ["KOSPI"])
+
+    def test_rejects_duplicate_job_names(self):
+        job = {"name": "dup", "start_date": "20200101", "end_date": "20201231"}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with self.assertRaisesRegex(ValueError, "duplicate"):
+                krx_batch.load_manifest(_write_manifest(tmpdir, {"jobs": [job, job]}))
+
+
+class RunJobTests(unittest.TestCase):
+    @patch("krx_backtest.write_backtest_report")
+    @patch("krx_backtest.create_market_comparison_report")
+    def test_run_job_builds_config_and_reports_status(self, mock_report, mock_write):
+        mock_report.return_value = (pd.DataFrame([{"market": "KOSPI", "periods": 3}]), {})
+        mock_write.return_value = Path("out/report.md")
+        job = {
+            "name": "a",
+            "markets": ["KOSPI"],
+            "start_date": "20200101",
+            "end_date": "20200630",
+            "config": {"top_n": 5, "cost_model": {"commission_rate": 0.001}},
+            "output_dir": "out",
+        }
+
+        entry = krx_batch.run_job(job)
+
+        self.assertEqual(entry["status"], "done")
+        self.assertEqual(entry["summary"], [{"market": "KOSPI", "periods": 3}])
+        config = mock_report.call_args.kwargs["config"]
+        self.assertEqual(config.top_n, 5)
+        self.assertEqual(config.cost_model.commission_rate, 0.001)
+
+    def test_unknown_config_field_marks_job_failed(self):
+        job = {
+            "name": "bad",
+            "markets": ["KOSPI"],
+            "start_date": "20200101",
+            "end_date": "20200630",
+            "config": {"nope": 1},
+            "output_dir": "out",
+        }
+
+        entry = krx_batch.run_job(job)
+
+        self.assertEqual(entry["status"], "failed")
+        self.assertIn("nope", entry["error"])
+
+
+class RunBatchTests(unittest.TestCase):
+    def test_resume_skips_completed_jobs_and_writes_index(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manifest = krx_batch.load_manifest(
+                _write_manifest(
+                    tmpdir,
+                    {
+                        "jobs": [
+                            {"name": "a", "start_date": "20200101", "end_date": "20201231"},
+                            {"name": "b", "start_date": "20200101", "end_date": "20201231", "config": {"top_n": 5}},
+                        ]
+                    },
+                )
+            )
+            calls: list[str] = []
+
+            def fake_run_job(job):
+                calls.append(job["name"])
+                report = Path(job["output_dir"]) / "report.md"
+                report.parent.mkdir(parents=True, exist_ok=True)
+                report.write_text("ok", encoding="utf-8")
+                return {"status": "done", "fingerprint": krx_batch.job_fingerprint(job), "report": str(report)}
+
+            with patch("krx_batch.ProcessPoolExecutor", ThreadPoolExecutor), patch(
+                "krx_batch._init_worker"
+            ) as mock_init, patch("krx_batch.run_job", side_effect=fake_run_job):
+                krx_batch.run_batch(manifest, workers=2)
+                limiter = mock_init.call_args.args[1]
+                manifest["jobs"][1]["config"]["top_n"] = 7
+                index = krx_batch.run_batch(manifest)
+
+            saved = krx_batch.load_batch_index(manifest["output_root"])
+
+        self.assertEqual(sorted(calls), ["a", "b", "b"])
+        self.assertIsInstance(limiter, krx_fetch.SharedTokenBucket)
+        self.assertEqual(limiter.rate_per_sec, krx_fetch.DEFAULT_RATE_PER_SEC)
+        self.assertEqual(set(index), {"a", "b"})
+        self.assertEqual(saved["b"]["fingerprint"], krx_batch.job_fingerprint(manifest["jobs"][1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
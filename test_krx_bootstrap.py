@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+import krx_bootstrap as boot
+
+
+class BootstrapIndexTests(unittest.TestCase):
+    def test_block_indices_are_contiguous_and_wrap(self):
+        rng = np.random.default_rng(0)
+        indices = boot.bootstrap_indices(n_periods=5, n_samples=200, block_size=3, rng=rng)
+
+        self.assertEqual(indices.shape, (200, 5))
+        steps = (indices[:, 1:3] - indices[:, 0:2]) % 5
+        self.assertTrue(np.all(steps == 1))
+
+
+class BootstrapExcessReturnTests(unittest.TestCase):
+    def test_consistently_positive_excess_is_significant(self):
+        excess = pd.Series(np.full(60, 0.01) + np.random.default_rng(1).normal(0, 0.002, 60))
+
+        result = boot.bootstrap_excess_returns(excess, n_samples=2_000, seed=7)
+
+        self.assertLess(result["cumulative_excess_p_value"], 0.01)
+        self.assertGreater(result["cumulative_excess_ci_low"], 0)
+        self.assertLessEqual(result["cumulative_excess_ci_low"], result["observed_cumulative_excess"])
+        self.assertLessEqual(result["excess_mdd_ci_low"], result["excess_mdd_ci_high"])
+
+    def test_seed_makes_results_reproducible_and_chunking_is_transparent(self):
+        excess = pd.Series(np.random.default_rng(2).normal(0.0, 0.03, 24))
+
+        first = boot.bootstrap_excess_returns(excess, n_samples=500, block_size=4, seed=3)
+        second = boot.bootstrap_excess_returns(excess, n_samples=500, block_size=4, seed=3)
+        original_chunk = boot.MAX_CHUNK_ELEMENTS
+        boot.MAX_CHUNK_ELEMENTS = 24 * 7
+        try:
+            chunked = boot.bootstrap_excess_returns(excess, n_samples=500, block_size=4, seed=3)
+        finally:
+            boot.MAX_CHUNK_ELEMENTS = original_chunk
+
+        self.assertEqual(first, second)
+        self.assertAlmostEqual(first["observed_cumulative_excess"], chunked["observed_cumulative_excess"])
+        self.assertLess(abs(first["cumulative_excess_p_value"] - chunked["cumulative_excess_p_value"]), 0.1)
+
+    def test_create_significance_report_handles_empty_market(self):
+        report = boot.create_significance_report(
+            {"KOSPI": pd.DataFrame({"excess_return": [0.01, -0.02, 0.03]}), "KOSDAQ": pd.DataFrame()},
+            n_samples=100,
+            seed=0,
+        )
+
+        self.assertEqual(list(report["market"]), ["KOSPI", "KOSDAQ"])
+        self.assertEqual(report.iloc[1]["periods"], 0)
+        self.assertEqual(report.iloc[1]["cumulative_excess_p_value"], 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
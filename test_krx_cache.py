@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import krx_cache
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _fill_shared_snapshot(root: str) -> int:
+    def fetch() -> pd.DataFrame:
+        with open(Path(root) / "fetch_calls.log", "a", encoding="utf-8") as handle:
+            handle.write(f"{os.getpid()}\n")
+        time.sleep(0.3)
+        return pd.DataFrame({"시가총액": [1, 2]}, index=pd.Index(["000001", "000002"], name="티커"))
+
+    frame, _ = krx_cache.DiskCache(Path(root)).get_or_fill_frame("market_cap", "KOSPI", "20200131", fetch=fetch)
+    return len(frame)
+
+
+class FakeClock:
+    def __init__(self, now: datetime):
+        self.now = now
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+class NegativeCacheTests(unittest.TestCase):
+    def test_entries_persist_across_instances(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "negative.json"
+            clock = FakeClock(datetime(2026, 2, 20, 9, 0, 0))
+            krx_cache.NegativeCache(path, clock=clock).record(
+                "snapshot", "KOSPI", "20260215", reason="빈 결과", as_of_date="20260215"
+            )
+
+            reloaded = krx_cache.NegativeCache(path, clock=clock)
+            entry = reloaded.lookup("snapshot", "KOSPI", "20260215")
+
+        self.assertEqual(entry["reason"], "빈 결과")
+        self.assertFalse(entry["volatile"])
+        self.assertIsNone(reloaded.lookup("snapshot", "KOSDAQ", "20260215"))
+
+    def test_current_day_entries_expire_after_ttl(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            clock = FakeClock(datetime(2026, 2, 20, 9, 0, 0))
+            cache = krx_cache.NegativeCache(Path(tmpdir) / "negative.json", clock=clock)
+            cache.record("snapshot", "KOSPI", "20260220", reason="빈 결과", as_of_date="20260220")
+
+            self.assertIsNotNone(cache.lookup("snapshot", "KOSPI", "20260220"))
+            clock.now += krx_cache.VOLATILE_TTL + timedelta(seconds=1)
+            self.assertIsNone(cache.lookup("snapshot", "KOSPI", "20260220"))
+            self.assertEqual(len(cache), 0)
+
+    def test_entries_with_ttl_expire_even_for_past_dates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            clock = FakeClock(datetime(2026, 2, 20, 9, 0, 0))
+            cache = krx_cache.NegativeCache(Path(tmpdir) / "negative.json", clock=clock)
+            cache.record(
+                "ticker_range",
+                "000001",
+                "20200101",
+                "20200131",
+                reason="예외: KeyError",
+                as_of_date="20200131",
+                ttl=krx_cache.ERROR_TTL,
+            )
+            cache.record("snapshot", "KOSPI", "20200104", reason="빈 결과", as_of_date="20200104")
+
+            clock.now += krx_cache.ERROR_TTL + timedelta(seconds=1)
+
+            self.assertIsNone(cache.lookup("ticker_range", "000001", "20200101", "20200131"))
+            self.assertIsNotNone(cache.lookup("snapshot", "KOSPI", "20200104"))
+
+    def test_only_weekend_empty_snapshots_are_permanent(self):
+        self.assertIsNone(krx_cache.empty_result_ttl("20200104"))
+        self.assertEqual(krx_cache.empty_result_ttl("20200103"), krx_cache.ERROR_TTL)
+
+    def test_invalidate_by_kind(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = krx_cache.NegativeCache(Path(tmpdir) / "negative.json")
+            cache.record("snapshot", "KOSPI", "20200101", reason="빈 결과", as_of_date="20200101")
+            cache.record("ticker_range", "000001", "20200101", "20200131", reason="빈 결과", as_of_date="20200131")
+
+            removed = cache.invalidate("ticker_range")
+
+            self.assertEqual(removed, 1)
+            self.assertIsNotNone(cache.lookup("snapshot", "KOSPI", "20200101"))
+
+    def test_concurrent_instances_do_not_lose_updates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "negative_cache.json"
+            first = krx_cache.NegativeCache(path)
+            second = krx_cache.NegativeCache(path)
+            self.assertEqual(len(first), 0)
+            self.assertEqual(len(second), 0)
+
+            first.record("snapshot", "KOSPI", "20200101", reason="empty", as_of_date="20200101")
+            second.record("snapshot", "KOSPI", "20200102", reason="empty", as_of_date="20200102")
+
+            self.assertIsNotNone(first.lookup("snapshot", "KOSPI", "20200102"))
+            self.assertEqual(len(krx_cache.NegativeCache(path)), 2)
+            self.assertFalse(path.with_name("negative_cache.json.lock").exists())
+
+    def test_lock_held_by_live_process_is_broken_after_short_stale_threshold(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "negative_cache.json"
+            lock_path = path.with_name("negative_cache.json.lock")
+            krx_cache.try_create_marker(lock_path)
+
+            with self.assertRaises(TimeoutError):
+                with krx_cache.file_lock(lock_path, timeout=0.05):
+                    pass
+            old = time.time() - krx_cache.LOCK_STALE_SEC - 1
+            os.utime(lock_path, (old, old))
+            started_at = time.monotonic()
+            krx_cache.NegativeCache(path).record("snapshot", "KOSPI", "20200101", reason="empty", as_of_date="20200101")
+
+        self.assertLess(time.monotonic() - started_at, 1)
+        self.assertLess(krx_cache.LOCK_STALE_SEC, krx_cache.STALE_MARKER_SEC)
+
+    def test_lock_of_dead_process_is_taken_over_immediately(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "negative_cache.json"
+            lock_path = path.with_name("negative_cache.json.lock")
+            lock_path.write_text(json.dumps({"pid": _dead_pid(), "created_at": time.time()}), encoding="utf-8")
+
+            with krx_cache.file_lock(lock_path, timeout=0.05, stale_sec=60):
+                owner = json.loads(lock_path.read_text(encoding="utf-8"))["pid"]
+
+        self.assertEqual(owner, os.getpid())
+
+    def test_transient_errors_are_network_failures(self):
+        self.assertTrue(krx_cache.is_transient_error(ConnectionError("reset")))
+        self.assertTrue(krx_cache.is_transient_error(TimeoutError()))
+        self.assertFalse(krx_cache.is_transient_error(KeyError("종가")))
+
+
+class DiskCacheTests(unittest.TestCase):
+    def test_frames_and_values_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = krx_cache.DiskCache(Path(tmpdir))
+            frame = pd.DataFrame({"종가": [100, 200]}, index=pd.Index(["000001", "000002"], name="티커"))
+
+            self.assertIsNone(cache.get_frame("market_cap", "KOSPI", "20200131"))
+            cache.put_frame("market_cap", "KOSPI", "20200131", frame=frame)
+            cache.put_value("ticker_name", "000001", value="테스트")
+
+            pd.testing.assert_frame_equal(cache.get_frame("market_cap", "KOSPI", "20200131"), frame)
+            self.assertEqual(cache.get_value("ticker_name", "000001"), "테스트")
+            self.assertEqual(list(Path(tmpdir).rglob("*.tmp")), [])
+
+    @patch("krx_cache.MARKER_POLL_SEC", 0.01)
+    def test_waits_for_in_progress_marker_instead_of_fetching(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = krx_cache.DiskCache(Path(tmpdir))
+            frame = pd.DataFrame({"시가총액": [1]}, index=pd.Index(["000001"], name="티커"))
+            marker = cache.marker_path("market_cap", "KOSPI", "20200131")
+            self.assertTrue(krx_cache.try_create_marker(marker))
+
+            def finish_other_process():
+                time.sleep(0.1)
+                cache.put_frame("market_cap", "KOSPI", "20200131", frame=frame)
+                marker.unlink()
+
+            fetch_calls: list[int] = []
+            worker = threading.Thread(target=finish_other_process)
+            worker.start()
+            result, hit = cache.get_or_fill_frame(
+                "market_cap", "KOSPI", "20200131", fetch=lambda: fetch_calls.append(1) or frame
+            )
+            worker.join()
+
+            self.assertTrue(hit)
+            self.assertEqual(fetch_calls, [])
+            pd.testing.assert_frame_equal(result, frame)
+
+    def test_stale_marker_is_taken_over(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = krx_cache.DiskCache(Path(tmpdir))
+            frame = pd.DataFrame({"시가총액": [1]}, index=pd.Index(["000001"], name="티커"))
+            marker = cache.marker_path("market_cap", "KOSPI", "20200131")
+            krx_cache.try_create_marker(marker)
+            old = time.time() - 3600
+            os.utime(marker, (old, old))
+
+            result, hit = cache.get_or_fill_frame("market_cap", "KOSPI", "20200131", fetch=lambda: frame)
+
+            self.assertFalse(hit)
+            self.assertFalse(marker.exists())
+            pd.testing.assert_frame_equal(cache.get_frame("market_cap", "KOSPI", "20200131"), frame)
+
+    def test_parallel_processes_fetch_a_snapshot_once(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with ProcessPoolExecutor(max_workers=4) as executor:
+                sizes = list(executor.map(_fill_shared_snapshot, [tmpdir] * 4))
+
+            calls = (Path(tmpdir) / "fetch_calls.log").read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(sizes, [2, 2, 2, 2])
+        self.assertEqual(len(calls), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import json
+import tarfile
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+import krx_cache
+import krx_cache_bundle
+
+
+def _seed_cache(root: Path) -> None:
+    disk_cache = krx_cache.DiskCache(root / krx_cache.DATA_CACHE_DIR)
+    frame = pd.DataFrame({"종가": [100]}, index=pd.Index(["000001"], name="티커"))
+    disk_cache.put_frame("market_cap", "KOSPI", "20191231", frame=frame)
+    disk_cache.put_frame("market_cap", "KOSPI", "20200131", frame=frame)
+    disk_cache.put_frame("ohlcv_by_date", "000001", "20191201", "20200115", frame=frame)
+    disk_cache.put_value("ticker_name", "000001", value="테스트")
+    negative_cache = krx_cache.NegativeCache(root / krx_cache.NEGATIVE_CACHE_FILE)
+    negative_cache.record("snapshot", "KOSPI", "20200101", reason="빈 결과", as_of_date="20200101")
+    negative_cache.record("snapshot", "KOSPI", "20190101", reason="빈 결과", as_of_date="20190101")
+
+
+class CacheBundleTests(unittest.TestCase):
+    def test_export_filters_by_date_and_import_restores_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            target = Path(tmpdir) / "target"
+            _seed_cache(source)
+            bundle = Path(tmpdir) / "bundle.tar.gz"
+
+            exported = krx_cache_bundle.export_cache_bundle(
+                str(bundle), "2020-01-01", "2020-01-31", cache_dir=str(source)
+            )
+            imported = krx_cache_bundle.import_cache_bundle(str(bundle), cache_dir=str(target))
+            again = krx_cache_bundle.import_cache_bundle(str(bundle), cache_dir=str(target))
+
+            restored = sorted(path.relative_to(target).as_posix() for path in (target / "data").rglob("*.*"))
+            negative = krx_cache.NegativeCache(target / krx_cache.NEGATIVE_CACHE_FILE)
+            snapshot_entry = negative.lookup("snapshot", "KOSPI", "20200101")
+            old_entry = negative.lookup("snapshot", "KOSPI", "20190101")
+
+        self.assertEqual(exported["files"], 3)
+        self.assertEqual(exported["negative_entries"], 1)
+        self.assertEqual(
+            restored,
+            [
+                "data/market_cap/KOSPI_20200131.parquet",
+                "data/ohlcv_by_date/000001_20191201_20200115.parquet",
+                "data/ticker_name/000001.json",
+            ],
+        )
+        self.assertEqual(imported["imported"], 3)
+        self.assertEqual(again["skipped"], 3)
+        self.assertIsNotNone(snapshot_entry)
+        self.assertIsNone(old_entry)
+
+    def test_import_rejects_tampered_file(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            source = Path(tmpdir) / "source"
+            _seed_cache(source)
+            bundle = Path(tmpdir) / "bundle.tar.gz"
+            krx_cache_bundle.export_cache_bundle(str(bundle), cache_dir=str(source))
+
+            with tarfile.open(bundle, "r:gz") as tar:
+                members = {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+            members["data/ticker_name/000001.json"] = json.dumps({"value": "변조"}).encode("utf-8")
+            tampered = Path(tmpdir) / "tampered.tar.gz"
+            with tarfile.open(tampered, "w:gz") as tar:
+                for name, data in members.items():
+                    krx_cache_bundle._add_bytes(tar, name, data)
+
+            with self.assertRaisesRegex(ValueError, "checksum mismatch"):
+                krx_cache_bundle.import_cache_bundle(str(tampered), cache_dir=str(Path(tmpdir) / "target"))
+            self.assertFalse((Path(tmpdir) / "target").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from krx_factor import DEFAULT_EXPRESSION, compile_factor_expression
+
+
+class CompileFactorExpressionTests(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame(
+            {
+                "PER": [10.0, -1.0, 5.0, 20.0],
+                "PBR": [2.0, 0.5, 0.0, 1.0],
+                "DIV": [3.0, float("nan"), 1.0, 0.0],
+            },
+            index=["A", "B", "C", "D"],
+        )
+
+    def test_default_expression_matches_tatsuro_formula(self):
+        factor = compile_factor_expression(DEFAULT_EXPRESSION)
+        result = factor.apply(self.df)
+
+        per = np.where(self.df["PER"] > 0, 1 / self.df["PER"], 0.0)
+        pbr = np.where(self.df["PBR"] > 0, 1 / self.df["PBR"].where(self.df["PBR"] > 0, 1.0), 0.0)
+        div = (self.df["DIV"] / 100).fillna(0.0).to_numpy()
+
+        self.assertEqual(factor.contribution_columns, ["PER 기여", "PBR 기여", "DIV 기여"])
+        np.testing.assert_allclose(result["TAT"].to_numpy(), per + pbr + div)
+        self.assertEqual(result.loc["B", "DIV 기여"], 0.0)
+
+    def test_compiled_expression_is_reused(self):
+        self.assertIs(compile_factor_expression("inv(PER) + DIV"), compile_factor_expression("inv(PER) + DIV"))
+        self.assertIs(compile_factor_expression(None), compile_factor_expression(DEFAULT_EXPRESSION))
+
+    def test_cross_sectional_functions_and_weights(self):
+        factor = compile_factor_expression("0.5 * zscore(PBR) + clip(DIV, 0, 2) - rank(PER)")
+        contributions = factor.contributions(self.df)
+
+        pbr = self.df["PBR"]
+        np.testing.assert_allclose(contributions["PBR 기여"], 0.5 * (pbr - pbr.mean()) / pbr.std(ddof=0))
+        self.assertEqual(list(contributions["DIV 기여"]), [2.0, 0.0, 1.0, 0.0])
+        np.testing.assert_allclose(contributions["PER 기여"], -self.df["PER"].rank(pct=True))
+        self.assertTrue(factor.cross_sectional)
+        self.assertFalse(compile_factor_expression(None).cross_sectional)
+
+    def test_top_selects_the_same_rows_as_apply_then_sort(self):
+        factor = compile_factor_expression("inv(PER) + zscore(PBR) + DIV / 100")
+
+        expected = factor.apply(self.df).sort_values("TAT", ascending=False, kind="mergesort").head(2)
+
+        pd.testing.assert_frame_equal(factor.top(self.df, 2), expected)
+
+    def test_top_breaks_score_ties_by_ticker(self):
+        tied = pd.DataFrame({"PER": [5.0, 5.0, 5.0, 10.0]}, index=["C", "A", "B", "D"])
+
+        top = compile_factor_expression("inv(PER)").top(tied, 2)
+
+        self.assertEqual(top.index.tolist(), ["A", "B"])
+
+    def test_terms_sharing_a_field_are_labelled_by_source(self):
+        factor = compile_factor_expression("inv(PER) + rank(PER) * PBR")
+        self.assertEqual(factor.contribution_columns, ["inv(PER) 기여", "rank(PER) * PBR 기여"])
+
+    def test_rejects_unsafe_or_unknown_syntax(self):
+        for expression in ("__import__('os')", "PER.real", "PER if PBR else DIV", "inv(PER, PBR)", "PER +"):
+            with self.subTest(expression=expression), self.assertRaises(ValueError):
+                compile_factor_expression(expression)
+
+    def test_unknown_field_is_reported_on_evaluation(self):
+        with self.assertRaisesRegex(ValueError, "EPS"):
+            compile_factor_expression("inv(EPS)").contributions(self.df)
+
+
+if __name__ == "__main__":
+    unittest.main()
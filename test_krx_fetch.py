@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+import krx_cache
+import krx_fetch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_burst_is_free_then_requests_are_spaced_by_rate(self):
+        clock = FakeClock()
+        bucket = krx_fetch.TokenBucket(rate_per_sec=2.0, burst=2, clock=clock, sleep=clock.sleep)
+
+        waits = [bucket.acquire() for _ in range(4)]
+
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(waits[2], 0.5)
+        self.assertAlmostEqual(waits[3], 0.5)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_tokens_refill_while_idle(self):
+        clock = FakeClock()
+        bucket = krx_fetch.TokenBucket(rate_per_sec=1.0, burst=1, clock=clock, sleep=clock.sleep)
+        bucket.acquire()
+        clock.now += 5.0
+
+        self.assertEqual(bucket.acquire(), 0.0)
+
+    def test_shared_bucket_spends_one_budget_across_handles(self):
+        clock = FakeClock()
+        first = krx_fetch.SharedTokenBucket(rate_per_sec=2.0, burst=1, clock=clock, sleep=clock.sleep)
+        second = krx_fetch.SharedTokenBucket(rate_per_sec=2.0, burst=1, state=first.state, clock=clock, sleep=clock.sleep)
+
+        waits = [first.acquire(), second.acquire(), first.acquire()]
+
+        self.assertEqual(waits[0], 0.0)
+        self.assertAlmostEqual(waits[1], 0.5)
+        self.assertAlmostEqual(waits[2], 0.5)
+        self.assertAlmostEqual(clock.now, 1.0)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaisesRegex(ValueError, "rate_per_sec"):
+            krx_fetch.TokenBucket(rate_per_sec=0)
+
+
+class CallUpstreamTests(unittest.TestCase):
+    def setUp(self):
+        krx_fetch.reset_fetch_stats()
+
+    @patch("krx_fetch.get_http_session")
+    def test_call_upstream_records_calls_errors_and_queue_wait(self, _mock_session):
+        def fail():
+            raise RuntimeError("boom")
+
+        with patch.object(krx_fetch._LIMITER, "acquire", side_effect=[0.25, 0.0]):
+            self.assertEqual(krx_fetch.call_upstream("market_cap", lambda x: x * 2, 21), 42)
+            with self.assertRaises(RuntimeError):
+                krx_fetch.call_upstream("ticker_name", fail)
+
+        stats = krx_fetch.get_fetch_stats()
+        self.assertEqual(stats["calls"], 2)
+        self.assertEqual(stats["errors"], 1)
+        self.assertAlmostEqual(stats["queue_wait_sec"], 0.25)
+        self.assertAlmostEqual(stats["max_queue_wait_sec"], 0.25)
+        self.assertEqual(stats["by_endpoint"], {"market_cap": 1, "ticker_name": 1})
+
+
+class HttpSessionTests(unittest.TestCase):
+    def test_pool_adapter_is_mounted_on_the_krx_login_session(self):
+        from pykrx.website.comm import auth, webio
+
+        logged_in = MagicMock(session=MagicMock())
+        with patch.object(krx_fetch, "_SESSION", None), patch.object(auth, "_auth_session", logged_in), patch.object(
+            auth, "requests", auth.requests
+        ), patch.object(webio, "requests", webio.requests):
+            session = krx_fetch.get_http_session()
+            refreshed = auth.requests.Session()
+
+        mounted = [call.args[0] for call in logged_in.session.mount.call_args_list]
+        self.assertEqual(mounted, ["https://", "http://"])
+        self.assertIsNot(refreshed, session)
+        self.assertEqual(refreshed.get_adapter("https://data.krx.co.kr")._pool_maxsize, krx_fetch._POOL_SIZE)
+
+
+class DiskCacheReadThroughTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+        krx_fetch.reset_fetch_stats()
+
+    def tearDown(self):
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        self._tmpdir.cleanup()
+
+    @patch("krx_fetch.get_http_session")
+    @patch("krx_fetch._stock")
+    def test_historical_snapshot_is_fetched_once(self, mock_stock, _mock_session):
+        frame = pd.DataFrame({"시가총액": [1_000]}, index=pd.Index(["000001"], name="티커"))
+        mock_stock.return_value = MagicMock(get_market_cap_by_ticker=MagicMock(return_value=frame))
+
+        with patch.object(krx_fetch._LIMITER, "acquire", return_value=0.0):
+            first = krx_fetch.get_market_cap_by_ticker("20200131", "KOSPI")
+            second = krx_fetch.get_market_cap_by_ticker("20200131", "KOSPI")
+
+        pd.testing.assert_frame_equal(first, second)
+        mock_stock.return_value.get_market_cap_by_ticker.assert_called_once()
+        stats = krx_fetch.get_fetch_stats()
+        self.assertEqual(stats["calls"], 1)
+        self.assertEqual(stats["cache_hits"], 1)
+
+    @patch("krx_fetch.get_http_session")
+    @patch("krx_fetch._stock")
+    def test_empty_and_current_day_results_are_not_cached(self, mock_stock, _mock_session):
+        mock_stock.return_value = MagicMock(get_market_cap_by_ticker=MagicMock(return_value=pd.DataFrame()))
+
+        with patch.object(krx_fetch._LIMITER, "acquire", return_value=0.0):
+            krx_fetch.get_market_cap_by_ticker("20200131", "KOSPI")
+            krx_fetch.get_market_cap_by_ticker("20200131", "KOSPI")
+
+        self.assertEqual(mock_stock.return_value.get_market_cap_by_ticker.call_count, 2)
+        self.assertFalse(krx_cache.is_historical("99991231"))
+
+    @patch("krx_fetch._stock")
+    def test_offline_mode_serves_cache_and_fails_fast_on_miss(self, mock_stock):
+        frame = pd.DataFrame({"시가총액": [1_000]}, index=pd.Index(["000001"], name="티커"))
+        krx_cache.get_disk_cache().put_frame("market_cap", "KOSPI", "20200131", frame=frame)
+
+        krx_fetch.configure_fetch(offline=True)
+        try:
+            cached = krx_fetch.get_market_cap_by_ticker("20200131", "KOSPI")
+            with self.assertRaises(krx_fetch.OfflineError):
+                krx_fetch.get_market_cap_by_ticker("20200228", "KOSPI")
+        finally:
+            krx_fetch.configure_fetch(offline=False)
+
+        pd.testing.assert_frame_equal(cached, frame)
+        mock_stock.assert_not_called()
+        self.assertTrue(krx_cache.is_transient_error(krx_fetch.OfflineError()))
+
+    @patch("krx_fetch._stock")
+    def test_offline_range_is_sliced_from_a_cached_superset(self, mock_stock):
+        dates = pd.date_range("2020-01-02", "2020-12-30", freq="B")
+        frame = pd.DataFrame({"종가": range(len(dates))}, index=pd.Index(dates, name="날짜"), dtype=float)
+        krx_cache.get_disk_cache().put_frame("index_ohlcv_by_date", "1001", "20200101", "20201231", frame=frame)
+
+        krx_fetch.configure_fetch(offline=True)
+        try:
+            sliced = krx_fetch.get_index_ohlcv_by_date("20200301", "20200331", "1001")
+            with self.assertRaises(krx_fetch.OfflineError):
+                krx_fetch.get_index_ohlcv_by_date("20191201", "20200131", "1001")
+        finally:
+            krx_fetch.configure_fetch(offline=False)
+
+        pd.testing.assert_frame_equal(sliced, frame.loc["2020-03-01":"2020-03-31"], check_freq=False)
+        mock_stock.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
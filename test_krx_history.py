@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import krx_cache
+import krx_history
+import krx_value_service as svc
+
+
+def _ranked_frame(rows: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"종목명": [f"name-{i}" for i in range(rows)], "TAT": [1.0 - i / 100 for i in range(rows)]},
+        index=pd.Index([f"{i:06d}" for i in range(rows)]),
+    )
+
+
+class HistoryStoreTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmpdir.name)
+        self.profile = krx_history.ScreenProfile("default")
+
+    def tearDown(self):
+        self._tmpdir.cleanup()
+
+    def test_lookup_returns_stored_top_n(self):
+        krx_history.write_history_entry(
+            self.profile.key, "KOSPI", "20260219", _ranked_frame(5), "20260219", {"total": 900, "filtered": 40}, 5, self.root
+        )
+
+        frame, used_date, stats = krx_history.lookup_top_n(
+            "KOSPI", "20260219", 3, history_dir=self.root, **self.profile.screen_kwargs()
+        )
+
+        self.assertEqual(used_date, "20260219")
+        self.assertEqual(list(frame.index), ["000000", "000001", "000002"])
+        self.assertEqual(stats, {"total": 900, "filtered": 40, "final": 3})
+        self.assertEqual(frame.attrs, {})
+
+    def test_lookup_misses_for_other_params_dates_or_deeper_requests(self):
+        krx_history.write_history_entry(
+            self.profile.key, "KOSPI", "20260219", _ranked_frame(5), "20260219", {"total": 900, "filtered": 40}, 5, self.root
+        )
+        params = self.profile.screen_kwargs()
+
+        self.assertIsNone(krx_history.lookup_top_n("KOSPI", "20260219", 10, history_dir=self.root, **params))
+        self.assertIsNone(krx_history.lookup_top_n("KOSDAQ", "20260219", 3, history_dir=self.root, **params))
+        self.assertIsNone(krx_history.lookup_top_n("KOSPI", "20260218", 3, history_dir=self.root, **params))
+        self.assertIsNone(
+            krx_history.lookup_top_n("KOSPI", "20260219", 3, history_dir=self.root, **dict(params, per_max=10.0))
+        )
+
+    def test_profile_key_normalizes_default_expression(self):
+        self.assertEqual(
+            krx_history.profile_key(1, 2, None, None, "zero", None),
+            krx_history.profile_key(1, 2, None, None, " ZERO ", "inv(PER) + inv(PBR) + DIV / 100"),
+        )
+
+    @patch("krx_screening.get_tatsuro_small_mid_value_top10")
+    def test_precompute_writes_every_date_and_skips_existing(self, mock_top10):
+        mock_top10.side_effect = lambda market, date, **kwargs: (
+            _ranked_frame(kwargs["top_n"]),
+            date,
+            {"total": 10, "filtered": 8},
+            [],
+        )
+
+        summary = krx_history.precompute_history(
+            dates=["20260218", "20260219"], profiles=[self.profile], depth=4, workers=2, history_dir=self.root
+        )
+        rerun = krx_history.precompute_history(
+            dates=["20260218", "20260219"], profiles=[self.profile], depth=4, workers=2, history_dir=self.root
+        )
+
+        self.assertEqual(summary["written"], 4)
+        self.assertEqual(rerun["written"], 0)
+        self.assertEqual(rerun["skipped"], 4)
+        self.assertEqual(mock_top10.call_count, 4)
+        self.assertTrue((self.root / self.profile.key / "profile.json").exists())
+        frame, _, _ = krx_history.lookup_top_n(
+            "KOSDAQ", "20260218", 4, history_dir=self.root, **self.profile.screen_kwargs()
+        )
+        self.assertEqual(len(frame), 4)
+
+    @patch("krx_incremental.add_ticker_names", side_effect=lambda df: df.assign(종목명="name"))
+    @patch("krx_incremental._load_market_data")
+    def test_incremental_precompute_writes_entries_in_date_order(self, mock_load, _mock_names):
+        market_cap_df = pd.DataFrame({"시가총액": [600_000_000_000, 700_000_000_000]}, index=["A", "B"])
+        fundamental_df = pd.DataFrame({"PER": [10.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 2.0]}, index=["A", "B"])
+        mock_load.side_effect = lambda market, base_date, logs: (
+            market_cap_df,
+            fundamental_df,
+            base_date.strftime("%Y%m%d"),
+        )
+
+        summary = krx_history.precompute_history(
+            dates=["20260219", "20260218"],
+            markets=["KOSPI"],
+            profiles=[self.profile],
+            depth=4,
+            history_dir=self.root,
+            incremental=True,
+        )
+
+        self.assertEqual(summary["written"], 2)
+        self.assertEqual([call.args[1].strftime("%Y%m%d") for call in mock_load.call_args_list], ["20260218", "20260219"])
+        frame, used_date, stats = krx_history.lookup_top_n(
+            "KOSPI", "20260219", 2, history_dir=self.root, **self.profile.screen_kwargs()
+        )
+        self.assertEqual(list(frame.index), ["B", "A"])
+        self.assertEqual(stats["filtered"], 2)
+
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명="name"))
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_overwrite_recomputes_from_upstream_instead_of_store(self, mock_get_market_data, _mock_names):
+        market_cap_df = pd.DataFrame({"시가총액": [600_000_000_000, 700_000_000_000]}, index=["A", "B"])
+        old_fundamental = pd.DataFrame({"PER": [10.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 2.0]}, index=["A", "B"])
+        new_fundamental = pd.DataFrame({"PER": [2.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 2.0]}, index=["A", "B"])
+        mock_get_market_data.side_effect = lambda market, base_date, **kwargs: (
+            market_cap_df,
+            current[0],
+            base_date.strftime("%Y%m%d"),
+        )
+        current = [old_fundamental]
+        params = dict(dates=["20260219"], markets=["KOSPI"], profiles=[self.profile], depth=2, history_dir=self.root)
+        svc.clear_query_caches()
+
+        krx_history.precompute_history(**params)
+        current[0] = new_fundamental
+        with patch("krx_value_service.krx_history.get_history_dir", return_value=self.root):
+            summary = krx_history.precompute_history(overwrite=True, **params)
+
+        self.assertEqual(summary["written"], 1)
+        self.assertEqual(mock_get_market_data.call_count, 2)
+        frame, _, _ = krx_history.lookup_top_n("KOSPI", "20260219", 2, history_dir=self.root, **self.profile.screen_kwargs())
+        self.assertEqual(list(frame.index), ["A", "B"])
+        self.assertEqual(frame.loc["A", "PER"], 2.0)
+        svc.clear_query_caches()
+
+
+class ServiceHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+        svc.clear_query_caches()
+
+    def tearDown(self):
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        svc.clear_query_caches()
+        self._tmpdir.cleanup()
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_service_answers_from_history_before_live_computation(self, mock_get_market_data):
+        profile = krx_history.ScreenProfile("default")
+        krx_history.write_history_entry(
+            profile.key, "KOSPI", "20260219", _ranked_frame(20), "20260219", {"total": 900, "filtered": 40}, 20
+        )
+
+        result_df, used_date, stats, logs = svc.get_tatsuro_small_mid_value_top10(market="KOSPI", date="2026-02-19")
+
+        mock_get_market_data.assert_not_called()
+        self.assertEqual(len(result_df), 10)
+        self.assertEqual(used_date, "20260219")
+        self.assertEqual(stats["history_hit"], 1)
+        self.assertEqual(stats["cache_hit"], 0)
+        self.assertEqual(logs, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import krx_value_service as svc
+from krx_incremental import IncrementalScreener, iter_incremental_screen_results
+
+
+def _universe(seed: int, size: int = 200):
+    rng = np.random.default_rng(seed)
+    index = [f"{i:06d}" for i in range(size)]
+    market_cap_df = pd.DataFrame({"시가총액": rng.uniform(3e11, 1.2e12, size)}, index=index)
+    fundamental_df = pd.DataFrame(
+        {
+            "PER": rng.uniform(-5.0, 40.0, size),
+            "PBR": rng.uniform(0.2, 4.0, size),
+            "DIV": np.where(rng.random(size) < 0.1, np.nan, rng.uniform(0.0, 6.0, size)),
+        },
+        index=index,
+    )
+    return market_cap_df, fundamental_df
+
+
+def _next_day(market_cap_df, fundamental_df, seed: int):
+    rng = np.random.default_rng(seed)
+    market_cap_df = market_cap_df.copy()
+    fundamental_df = fundamental_df.copy()
+    changed = rng.choice(market_cap_df.index, size=15, replace=False)
+    market_cap_df.loc[changed, "시가총액"] *= rng.uniform(0.9, 1.1, len(changed))
+    fundamental_df.loc[changed, "PER"] *= rng.uniform(0.8, 1.2, len(changed))
+    delisted = [ticker for ticker in market_cap_df.index[:3] if ticker not in changed]
+    market_cap_df = market_cap_df.drop(index=delisted)
+    listed = pd.Index([f"9{seed:02d}{i:03d}" for i in range(4)])
+    market_cap_df = pd.concat([market_cap_df, pd.DataFrame({"시가총액": [7e11] * 4}, index=listed)])
+    listed_df = pd.DataFrame(
+        {"PER": [2.0 + seed / 10, 3.0 + seed / 10, -1.0, 4.0 + seed / 10], "PBR": [0.5] * 4, "DIV": [1.0] * 4},
+        index=listed,
+    )
+    fundamental_df = pd.concat([fundamental_df, listed_df])
+    return market_cap_df, fundamental_df, len(changed), len(delisted)
+
+
+def _full_top(market_cap_df, fundamental_df, top_n: int, **params) -> list[str]:
+    index = svc.SnapshotIndex.build(market_cap_df, fundamental_df)
+    filtered_df = index.query(params.get("cap_min", 500_000_000_000), params.get("cap_max", 1_000_000_000_000))
+    scored_df = svc._add_tatsuro_columns(filtered_df, svc.compile_factor_expression(params.get("score_expression")))
+    return scored_df.sort_values("TAT", ascending=False).head(top_n).index.tolist()
+
+
+class IncrementalScreenerTests(unittest.TestCase):
+    def test_updates_match_full_recomputation_and_touch_only_diffs(self):
+        screener = IncrementalScreener()
+        market_cap_df, fundamental_df = _universe(1)
+        first = screener.update(market_cap_df, fundamental_df)
+        self.assertTrue(first.rebuilt)
+
+        for seed in range(2, 6):
+            market_cap_df, fundamental_df, changed, delisted = _next_day(market_cap_df, fundamental_df, seed)
+            diff = screener.update(market_cap_df, fundamental_df)
+
+            self.assertFalse(diff.rebuilt)
+            self.assertEqual((diff.added, diff.removed, diff.changed), (4, delisted, changed))
+            self.assertEqual(screener.top(20).index.tolist(), _full_top(market_cap_df, fundamental_df, 20))
+
+    def test_unchanged_snapshot_touches_nothing(self):
+        screener = IncrementalScreener(per_max=20.0)
+        market_cap_df, fundamental_df = _universe(7)
+        screener.update(market_cap_df, fundamental_df)
+        ranked = screener.top(10).index.tolist()
+
+        diff = screener.update(market_cap_df.copy(), fundamental_df.copy())
+
+        self.assertEqual(diff.touched, 0)
+        self.assertEqual(diff.unchanged, len(market_cap_df))
+        self.assertEqual(screener.top(10).index.tolist(), ranked)
+
+    def test_cross_sectional_expression_always_rebuilds(self):
+        screener = IncrementalScreener(score_expression="rank(PER) + inv(PBR)")
+        market_cap_df, fundamental_df = _universe(3)
+        screener.update(market_cap_df, fundamental_df)
+        market_cap_df, fundamental_df, _, _ = _next_day(market_cap_df, fundamental_df, 4)
+
+        diff = screener.update(market_cap_df, fundamental_df)
+
+        self.assertTrue(diff.rebuilt)
+        self.assertEqual(
+            screener.top(10).index.tolist(),
+            _full_top(market_cap_df, fundamental_df, 10, score_expression="rank(PER) + inv(PBR)"),
+        )
+
+    def test_score_ties_match_factor_top(self):
+        index = ["000030", "000010", "000040", "000020"]
+        market_cap_df = pd.DataFrame({"시가총액": [7e11] * 4}, index=index)
+        fundamental_df = pd.DataFrame({"PER": [5.0] * 4, "PBR": [1.0] * 4, "DIV": [1.0] * 4}, index=index)
+        screener = IncrementalScreener()
+        screener.update(market_cap_df, fundamental_df)
+
+        expected = screener.factor.top(market_cap_df.join(fundamental_df), 2)
+
+        self.assertEqual(screener.top(2).index.tolist(), expected.index.tolist())
+        self.assertEqual(expected.index.tolist(), ["000010", "000020"])
+
+    def test_top_requires_an_update(self):
+        with self.assertRaises(ValueError):
+            IncrementalScreener().top(10)
+
+
+class IncrementalScreenResultsTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+        day1 = _universe(11)
+        day2 = _next_day(*day1, 12)[:2]
+        self.snapshots = {"20260218": day1, "20260219": day2, "20260220": day2}
+
+    def tearDown(self):
+        svc.clear_query_caches()
+
+    def _load(self, market, base_date, backtrack_logs=None, max_backtrack_days=14):
+        date = base_date.strftime("%Y%m%d")
+        used_date = "20260219" if date == "20260220" else date
+        market_cap_df, fundamental_df = self.snapshots[date]
+        return market_cap_df, fundamental_df, used_date
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명=[f"name-{t}" for t in df.index]))
+    @patch("krx_incremental.add_ticker_names", side_effect=lambda df: df.assign(종목명=[f"name-{t}" for t in df.index]))
+    def test_results_match_service_output_per_date(self, _mock_names, _mock_service_names):
+        with patch("krx_incremental._load_market_data", side_effect=lambda m, d, logs: self._load(m, d, logs)):
+            results = list(iter_incremental_screen_results("kospi", ["20260219", "20260218", "20260220"], top_n=5))
+
+        self.assertEqual([result.date for result in results], ["20260218", "20260219", "20260220"])
+        self.assertEqual(results[2].used_date, "20260219")
+        self.assertEqual(results[2].stats["touched"], 0)
+        with patch("krx_value_service.get_market_data_with_fallback", side_effect=self._load):
+            for result in results:
+                expected, used_date, stats, _ = svc.get_tatsuro_small_mid_value_top10(date=result.date, top_n=5)
+                self.assertEqual(result.used_date, used_date)
+                self.assertEqual(result.stats["filtered"], stats["filtered"])
+                pd.testing.assert_frame_equal(result.frame, expected)
+
+    def test_failed_date_is_reported_and_later_dates_continue(self):
+        def load(market, base_date, logs):
+            if base_date.strftime("%Y%m%d") == "20260218":
+                raise RuntimeError("no data")
+            return self._load(market, base_date, logs)
+
+        with patch("krx_incremental._load_market_data", side_effect=load), patch(
+            "krx_incremental.add_ticker_names", side_effect=lambda df: df.assign(종목명="name")
+        ):
+            results = list(iter_incremental_screen_results("KOSPI", ["20260218", "20260219"], top_n=3))
+
+        self.assertFalse(results[0].ok)
+        self.assertIn("no data", results[0].error)
+        self.assertTrue(results[1].ok)
+        self.assertEqual(len(results[1].frame), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
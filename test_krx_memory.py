@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import krx_memory
+import krx_value_service as svc
+
+
+class MemoryStageTests(unittest.TestCase):
+    def setUp(self):
+        krx_memory.configure_memory_profiling(True)
+        krx_memory.reset_memory_stats()
+
+    def tearDown(self):
+        krx_memory.configure_memory_profiling(False)
+        krx_memory.reset_memory_stats()
+
+    def test_stage_records_peak_of_allocation(self):
+        with krx_memory.stage("alloc") as usage:
+            buffer = np.ones(1_000_000)
+            del buffer
+
+        self.assertGreaterEqual(usage["peak_kb"], 7_000)
+        self.assertLess(usage["retained_kb"], 1_000)
+        stats = krx_memory.get_memory_stats()
+        self.assertEqual(stats["stages"]["alloc"]["calls"], 1)
+        self.assertGreaterEqual(stats["traced_peak_kb"], 7_000)
+
+    def test_nested_stage_peak_is_included_in_outer_stage(self):
+        with krx_memory.stage("outer") as outer:
+            with krx_memory.stage("inner") as inner:
+                buffer = np.ones(500_000)
+                del buffer
+            small = np.ones(1_000)
+
+        self.assertGreaterEqual(inner["peak_kb"], 3_500)
+        self.assertGreaterEqual(outer["peak_kb"], inner["peak_kb"])
+        self.assertEqual(len(small), 1_000)
+
+    def test_peak_in_another_thread_is_folded_into_open_stages(self):
+        opened = threading.Event()
+        finished = threading.Event()
+        outer: dict[str, float] = {}
+
+        def hold_stage():
+            with krx_memory.stage("outer") as usage:
+                opened.set()
+                finished.wait(5)
+            outer.update(usage)
+
+        worker = threading.Thread(target=hold_stage)
+        worker.start()
+        opened.wait(5)
+        with krx_memory.stage("inner") as inner:
+            buffer = np.ones(500_000)
+            del buffer
+        finished.set()
+        worker.join()
+
+        self.assertGreaterEqual(inner["peak_kb"], 3_500)
+        self.assertGreaterEqual(outer["peak_kb"], 3_500)
+
+    def test_disabled_stage_is_a_no_op(self):
+        krx_memory.configure_memory_profiling(False)
+
+        with krx_memory.stage("off") as usage:
+            np.ones(10)
+
+        self.assertEqual(usage, {})
+        self.assertEqual(krx_memory.get_memory_stats()["stages"], {})
+
+    def test_cache_usage_counts_dataframe_bytes(self):
+        frame = pd.DataFrame({"x": np.arange(10_000, dtype=float)})
+        usage = krx_memory.cache_usage({("KOSPI", "20260219"): (frame, "20260219")})
+
+        self.assertEqual(usage["entries"], 1)
+        self.assertGreaterEqual(usage["size_kb"], 78)
+
+
+class ServiceMemoryStatsTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+        krx_memory.configure_memory_profiling(True)
+        krx_memory.reset_memory_stats()
+
+    def tearDown(self):
+        krx_memory.configure_memory_profiling(False)
+        krx_memory.reset_memory_stats()
+        svc.clear_query_caches()
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명="x"))
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_screen_stats_include_memory_peak_and_stages(self, mock_get_market_data, _mock_names):
+        idx = ["A", "B"]
+        market_cap_df = pd.DataFrame({"시가총액": [600_000_000_000, 700_000_000_000]}, index=idx)
+        fundamental_df = pd.DataFrame({"PER": [10.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 1.0]}, index=idx)
+        mock_get_market_data.return_value = (market_cap_df, fundamental_df, "20260219")
+
+        _, _, stats, _ = svc.get_tatsuro_small_mid_value_top10(market="KOSPI", date="2026-02-19")
+
+        self.assertIn("memory_peak_kb", stats)
+        stages = krx_memory.get_memory_stats()["stages"]
+        for name in ("screen", "screen.load_snapshot", "screen.filter", "screen.score"):
+            self.assertIn(name, stages)
+        caches = krx_memory.get_memory_stats(caches=svc.service_caches())["caches"]
+        self.assertEqual(caches["query_cache"]["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import math
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from krx_metrics import BacktestMetrics, OnlineMetrics, infer_periods_per_year
+
+
+class OnlineMetricsTests(unittest.TestCase):
+    def test_running_values_match_full_recomputation(self):
+        returns = np.random.default_rng(5).normal(0.01, 0.05, 60)
+        metrics = OnlineMetrics()
+
+        for i, value in enumerate(returns, start=1):
+            metrics.update(value)
+            history = pd.Series(returns[:i])
+            cumulative = (1 + history).cumprod()
+            self.assertAlmostEqual(metrics.total_return, cumulative.iloc[-1] - 1)
+            self.assertAlmostEqual(metrics.max_drawdown, float((cumulative / cumulative.cummax() - 1).min()))
+            self.assertAlmostEqual(metrics.mean, history.mean())
+            if i > 1:
+                self.assertAlmostEqual(metrics.variance, history.var(ddof=1))
+
+        self.assertAlmostEqual(metrics.sharpe(12), returns.mean() / returns.std(ddof=1) * math.sqrt(12))
+        self.assertAlmostEqual(metrics.hit_rate, float((returns > 0).mean()))
+
+    def test_missing_returns_count_as_flat_periods(self):
+        metrics = OnlineMetrics().extend([0.1, float("nan"), None, -0.1])
+
+        self.assertEqual(metrics.periods, 4)
+        self.assertAlmostEqual(metrics.total_return, 1.1 * 0.9 - 1)
+        self.assertAlmostEqual(metrics.drawdown, -0.1)
+        self.assertEqual(metrics.hit_rate, 0.25)
+
+    def test_constant_returns_have_zero_sharpe(self):
+        metrics = OnlineMetrics().extend([0.01] * 5)
+
+        self.assertEqual(metrics.volatility(), 0.0)
+        self.assertEqual(metrics.sharpe(), 0.0)
+
+
+class BacktestMetricsTests(unittest.TestCase):
+    def test_summary_tracks_excess_hit_rate_turnover_and_costs(self):
+        metrics = BacktestMetrics(periods_per_year=12)
+        metrics.extend(
+            [
+                {"portfolio_return": 0.05, "benchmark_return": 0.02, "turnover": 1.0, "transaction_cost": 0.002},
+                {"portfolio_return": -0.02, "benchmark_return": 0.01, "turnover": 0.5, "transaction_cost": 0.001},
+            ]
+        )
+
+        summary = metrics.summary()
+
+        self.assertEqual(summary["periods"], 2)
+        self.assertAlmostEqual(summary["portfolio_cumulative_return"], 1.05 * 0.98 - 1)
+        self.assertAlmostEqual(summary["portfolio_mdd"], -0.02)
+        self.assertAlmostEqual(summary["average_turnover"], 0.75)
+        self.assertAlmostEqual(summary["total_transaction_cost"], 0.003)
+        self.assertEqual(summary["hit_rate"], 0.5)
+
+    def test_empty_summary_is_all_zero(self):
+        summary = BacktestMetrics().summary()
+
+        self.assertEqual(summary["periods"], 0)
+        self.assertTrue(all(value == 0 for value in summary.values()))
+
+    def test_periods_per_year_is_inferred_from_rebalance_dates(self):
+        self.assertEqual(infer_periods_per_year(["20260130", "20260227"], ["20260227", "20260331"]), 12.0)
+        self.assertEqual(infer_periods_per_year(["20260102", "20260109"], ["20260109", "20260116"]), 52.0)
+        self.assertEqual(infer_periods_per_year(["20260331"], ["20260630"]), 4.0)
+        self.assertEqual(infer_periods_per_year([], []), 12.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
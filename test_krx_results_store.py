@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+import krx_results_store as store
+from krx_backtest import BacktestConfig
+
+
+def _market_df(market: str, returns: list[float]) -> pd.DataFrame:
+    dates = [f"202601{day:02d}" for day in range(1, len(returns) + 1)]
+    return pd.DataFrame(
+        {
+            "market": [market] * len(returns),
+            "rebalance_date": dates,
+            "portfolio_return": returns,
+            "benchmark_return": [0.0] * len(returns),
+        }
+    )
+
+
+def _summary_df(markets: list[str], cumulative: float) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "market": markets,
+            "periods": [2] * len(markets),
+            "portfolio_cumulative_return": [cumulative] * len(markets),
+            "benchmark_cumulative_return": [0.0] * len(markets),
+            "portfolio_mdd": [-0.01] * len(markets),
+            "benchmark_mdd": [0.0] * len(markets),
+        }
+    )
+
+
+class ResultsStoreTests(unittest.TestCase):
+    def test_append_and_query_runs_with_filters(self):
+        config = BacktestConfig(start_date="2026-01-01", end_date="2026-03-31")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            run_a = store.append_backtest_run(
+                tmpdir,
+                config,
+                _summary_df(["KOSPI", "KOSDAQ"], 0.1),
+                {"KOSPI": _market_df("KOSPI", [0.1, 0.0]), "KOSDAQ": _market_df("KOSDAQ", [0.2, -0.1])},
+                run_id="run-a",
+            )
+            store.append_backtest_run(
+                tmpdir,
+                config,
+                _summary_df(["KOSPI"], 0.3),
+                {"KOSPI": _market_df("KOSPI", [0.3, 0.05])},
+                run_id="run-b",
+            )
+
+            kospi_df = store.load_backtest_periods(tmpdir, markets=["kospi"])
+            filtered_df = store.load_backtest_periods(tmpdir, filters=[("portfolio_return", ">", 0.15)])
+            summaries = store.load_backtest_summaries(tmpdir, filters=[("portfolio_cumulative_return", ">=", 0.2)])
+            runs = store.load_backtest_runs(tmpdir)
+
+            with self.assertRaises(FileExistsError):
+                store.append_backtest_run(tmpdir, config, _summary_df(["KOSPI"], 0.0), {}, run_id=run_a)
+
+        self.assertEqual(len(kospi_df), 4)
+        self.assertEqual(sorted(kospi_df["run_id"].unique()), ["run-a", "run-b"])
+        self.assertEqual(list(filtered_df["market"]), ["KOSDAQ", "KOSPI"])
+        self.assertEqual(list(summaries["run_id"]), ["run-b"])
+        self.assertEqual(list(runs["run_id"]), ["run-a", "run-b"])
+        self.assertEqual(runs.iloc[0]["start_date"], "2026-01-01")
+
+    def test_append_keeps_other_runs_staging(self):
+        config = BacktestConfig(start_date="2026-01-01", end_date="2026-03-31")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            other_staging = Path(tmpdir) / ".staging" / "run-other" / store.RUNS_TABLE
+            other_staging.mkdir(parents=True)
+
+            store.append_backtest_run(
+                tmpdir, config, _summary_df(["KOSPI"], 0.1), {"KOSPI": _market_df("KOSPI", [0.1])}, run_id="run-a"
+            )
+
+            self.assertTrue(other_staging.exists())
+            self.assertFalse((Path(tmpdir) / ".staging" / "run-a").exists())
+
+    def test_render_backtest_report_from_store(self):
+        config = BacktestConfig(start_date="2026-01-01", end_date="2026-03-31")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            store_dir = str(Path(tmpdir) / "store")
+            run_id = store.append_backtest_run(
+                store_dir,
+                config,
+                _summary_df(["KOSPI"], 0.1),
+                {"KOSPI": _market_df("KOSPI", [0.1, 0.0])},
+            )
+            output_dir = Path(tmpdir) / "report"
+            report_path = store.render_backtest_report(store_dir, run_id, str(output_dir))
+
+            summary_csv = pd.read_csv(output_dir / "backtest_summary.csv", encoding="utf-8-sig")
+            monthly_csv = pd.read_csv(output_dir / "backtest_kospi_monthly.csv", encoding="utf-8-sig")
+            self.assertTrue(report_path.exists())
+
+        self.assertEqual(list(summary_csv.columns)[0], "market")
+        self.assertEqual(list(monthly_csv["market"]), ["KOSPI", "KOSPI"])
+        self.assertNotIn("run_id", monthly_csv.columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
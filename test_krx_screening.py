@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import krx_screening as screening
+
+
+def _fake_top10(market: str, date: str, **kwargs):
+    if date == "20260105":
+        raise ConnectionError("upstream down")
+    frame = pd.DataFrame(
+        {"종목명": [f"{market}-1", f"{market}-2"], "TAT": [0.9, 0.5], "시가총액(조)": [0.6, 0.7]},
+        index=pd.Index(["000001", "000002"]),
+    )
+    return frame.head(kwargs.get("top_n", 10)), date, {"total": 5, "filtered": 2, "final": 2, "cache_hit": 0}, []
+
+
+class ResolveScreenDatesTests(unittest.TestCase):
+    def test_explicit_dates_are_normalized_and_deduplicated(self):
+        dates = screening.resolve_screen_dates(dates=["2026-02-20", "20260219", " 20260220 "])
+        self.assertEqual(dates, ["20260219", "20260220"])
+
+    @patch("krx_screening.get_trading_calendar", return_value=["20260102", "20260105", "20260106"])
+    def test_range_uses_trading_calendar(self, mock_calendar):
+        dates = screening.resolve_screen_dates(start_date="2026-01-01", end_date="2026-01-06")
+
+        self.assertEqual(dates, ["20260102", "20260105", "20260106"])
+        mock_calendar.assert_called_once_with("20260101", "20260106")
+
+    def test_missing_range_is_rejected(self):
+        with self.assertRaisesRegex(ValueError, "either dates or both"):
+            screening.resolve_screen_dates(start_date="2026-01-01")
+
+
+class ScreenStreamTests(unittest.TestCase):
+    @patch("krx_screening.get_tatsuro_small_mid_value_top10", side_effect=_fake_top10)
+    def test_every_market_and_date_is_screened_and_failures_are_reported(self, _mock_top10):
+        dates = ["20260102", "20260105", "20260106"]
+        results = list(screening.iter_screen_results(["kospi", "KOSDAQ"], dates, workers=2, top_n=1))
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual({(r.market, r.date) for r in results}, {(m, d) for m in ("KOSPI", "KOSDAQ") for d in dates})
+        failed = [r for r in results if not r.ok]
+        self.assertEqual({r.date for r in failed}, {"20260105"})
+        self.assertTrue(all(len(r.frame) == 1 for r in results if r.ok))
+
+    def test_in_flight_jobs_are_bounded(self):
+        lock = threading.Lock()
+        state = {"running": 0, "max_running": 0, "started": 0}
+        release = threading.Event()
+
+        def slow_top10(market, date, **kwargs):
+            with lock:
+                state["running"] += 1
+                state["started"] += 1
+                state["max_running"] = max(state["max_running"], state["running"])
+            release.wait(0.3)
+            with lock:
+                state["running"] -= 1
+            return _fake_top10(market, date)
+
+        with patch("krx_screening.get_tatsuro_small_mid_value_top10", side_effect=slow_top10):
+            results = screening.iter_screen_results(["KOSPI"], [f"202602{day:02d}" for day in range(1, 21)], workers=2)
+            first = next(results)
+            self.assertLessEqual(state["started"], 4)
+            release.set()
+            remaining = list(results)
+
+        self.assertTrue(first.ok)
+        self.assertEqual(len(remaining), 19)
+        self.assertLessEqual(state["max_running"], 2)
+
+    @patch("krx_screening.get_tatsuro_small_mid_value_top10", side_effect=_fake_top10)
+    def test_write_screen_stream_writes_csv_and_ndjson(self, _mock_top10):
+        dates = ["20260102", "20260105"]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = Path(tmpdir) / "out" / "screen.csv"
+            summary = screening.write_screen_stream(
+                str(csv_path), screening.iter_screen_results(["KOSPI", "KOSDAQ"], dates, workers=2)
+            )
+            csv_df = pd.read_csv(csv_path, dtype={"티커": str, "요청일": str, "기준일": str}, encoding="utf-8-sig")
+
+            ndjson_path = Path(tmpdir) / "screen.ndjson"
+            seen: list[str] = []
+            screening.write_screen_stream(
+                str(ndjson_path),
+                screening.iter_screen_results(["KOSPI"], ["20260102"], workers=1),
+                fmt="ndjson",
+                on_result=lambda result: seen.append(result.date),
+            )
+            records = [json.loads(line) for line in ndjson_path.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(summary["jobs"], 4)
+        self.assertEqual(summary["rows"], 4)
+        self.assertEqual(len(summary["failed"]), 2)
+        self.assertEqual(list(csv_df.columns[:5]), ["요청일", "기준일", "시장", "순위", "티커"])
+        self.assertEqual(sorted(csv_df["시장"].unique()), ["KOSDAQ", "KOSPI"])
+        self.assertEqual(set(csv_df["티커"]), {"000001", "000002"})
+        self.assertEqual(seen, ["20260102"])
+        self.assertEqual([record["순위"] for record in records], [1, 2])
+
+    def test_write_screen_stream_rejects_unknown_format(self):
+        with self.assertRaisesRegex(ValueError, "fmt must be one of"):
+            screening.write_screen_stream("unused.parquet", [], fmt="parquet")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+import krx_sensitivity as sens
+import krx_value_service as svc
+import krx_backtest as bt
+from krx_backtest import BacktestConfig
+
+
+def _naive_period_return(caps, returns, cap_min, cap_max, top_n):
+    selected = [i for i in range(len(caps)) if cap_min <= caps[i] <= cap_max][:top_n]
+    held = [returns[i] for i in selected if not np.isnan(returns[i])]
+    return (sum(held) / len(held) if held else 0.0), len(held)
+
+
+class PeriodGridTests(unittest.TestCase):
+    def test_grid_matches_per_combination_selection(self):
+        rng = np.random.default_rng(1)
+        caps = rng.integers(1, 100, size=200).astype(float) * 10 * sens.EOK
+        returns = rng.normal(0, 0.1, size=200)
+        returns[rng.random(200) < 0.1] = np.nan
+        bands = [(100 * sens.EOK, 300 * sens.EOK), (300 * sens.EOK, 800 * sens.EOK), (0, 10_000 * sens.EOK)]
+        top_ns = [1, 5, 20, 500]
+
+        grid, holdings = sens.period_grid_returns(caps, returns, bands, top_ns)
+
+        for i, (cap_min, cap_max) in enumerate(bands):
+            for j, top_n in enumerate(top_ns):
+                expected, count = _naive_period_return(caps, returns, cap_min, cap_max, top_n)
+                self.assertAlmostEqual(grid[i, j], expected)
+                self.assertEqual(holdings[i, j], count)
+
+    def test_parse_cap_bands_uses_eok_units(self):
+        self.assertEqual(sens.parse_cap_bands("1000-3000, 3000-5000"), [(10**11, 3 * 10**11), (3 * 10**11, 5 * 10**11)])
+        with self.assertRaisesRegex(ValueError, "MIN-MAX"):
+            sens.parse_cap_bands("1000")
+
+
+class SensitivityAnalysisTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+
+    @patch("krx_sensitivity._ticker_period_returns")
+    @patch("krx_sensitivity.get_snapshot_index")
+    @patch("krx_sensitivity.generate_rebalance_dates", return_value=["20240131", "20240229", "20240329"])
+    @patch("krx_sensitivity.get_trading_calendar", return_value=[])
+    def test_grid_compounds_periods_and_writes_heatmaps(self, _mock_calendar, _mock_dates, mock_index, mock_returns):
+        idx = pd.Index(["A", "B", "C"], name="티커")
+        market_cap_df = pd.DataFrame({"시가총액": [2 * 10**11, 6 * 10**11, 4 * 10**11]}, index=idx)
+        fundamental_df = pd.DataFrame({"PER": [5.0, 4.0, 10.0], "PBR": [1.0, 1.0, 1.0], "DIV": [0.0, 0.0, 0.0]}, index=idx)
+        snapshot_index = svc.SnapshotIndex.build(market_cap_df, fundamental_df)
+        mock_index.side_effect = lambda market, date: (snapshot_index, date, [])
+        period_returns = iter([pd.Series({"A": 0.10, "B": -0.20, "C": 0.05}), pd.Series({"A": -0.10, "B": 0.30, "C": 0.0})])
+        mock_returns.side_effect = lambda tickers, **kwargs: next(period_returns).reindex(tickers)
+
+        config = BacktestConfig(start_date="20240101", end_date="20240331")
+        grid_df = sens.run_sensitivity_analysis("KOSPI", config, [(10**11, 5 * 10**11), (0, 10**12)], [1, 2])
+
+        low_band_top1 = grid_df[(grid_df["cap_max"] == 5 * 10**11) & (grid_df["top_n"] == 1)].iloc[0]
+        wide_band_top1 = grid_df[(grid_df["cap_max"] == 10**12) & (grid_df["top_n"] == 1)].iloc[0]
+        self.assertEqual(low_band_top1["periods"], 2)
+        self.assertAlmostEqual(low_band_top1["cumulative_return"], 1.10 * 0.90 - 1)
+        self.assertAlmostEqual(wide_band_top1["cumulative_return"], 0.80 * 1.30 - 1)
+        self.assertAlmostEqual(low_band_top1["mdd"], 0.90 - 1)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_path = sens.write_sensitivity_report(tmpdir, {"KOSPI": grid_df})
+            heatmap = pd.read_csv(Path(tmpdir) / "sensitivity_kospi_cumulative_return.csv", encoding="utf-8-sig")
+            report_text = report_path.read_text(encoding="utf-8")
+
+        self.assertEqual(list(heatmap.columns), ["cap_band", "top1", "top2"])
+        self.assertEqual(list(heatmap["cap_band"]), ["1,000억~5,000억", "0억~10,000억"])
+        self.assertIn("### MDD", report_text)
+
+    @patch("krx_sensitivity._ticker_period_returns")
+    @patch("krx_sensitivity.get_snapshot_index")
+    @patch("krx_sensitivity.generate_rebalance_dates", return_value=["20240131", "20240229", "20240329", "20240430"])
+    @patch("krx_sensitivity.get_trading_calendar", return_value=[])
+    def test_cells_are_net_of_turnover_costs(self, _mock_calendar, _mock_dates, mock_index, mock_returns):
+        idx = pd.Index(["A", "B", "C"], name="티커")
+        market_cap_df = pd.DataFrame({"시가총액": [2 * 10**11, 6 * 10**11, 4 * 10**11]}, index=idx)
+        fundamentals = iter(
+            [
+                pd.DataFrame({"PER": [5.0, 4.0, 10.0], "PBR": [1.0] * 3, "DIV": [0.0] * 3}, index=idx),
+                pd.DataFrame({"PER": [5.0, 4.0, 10.0], "PBR": [1.0] * 3, "DIV": [0.0] * 3}, index=idx),
+                pd.DataFrame({"PER": [9.0, 4.0, 3.0], "PBR": [1.0] * 3, "DIV": [0.0] * 3}, index=idx),
+            ]
+        )
+        mock_index.side_effect = lambda market, date: (svc.SnapshotIndex.build(market_cap_df, next(fundamentals)), date, [])
+        period_returns = [
+            pd.Series({"A": 0.10, "B": -0.20, "C": 0.05}),
+            pd.Series({"A": -0.10, "B": 0.30, "C": 0.0}),
+            pd.Series({"A": 0.02, "B": 0.01, "C": 0.04}),
+        ]
+        returns_iter = iter(period_returns)
+        mock_returns.side_effect = lambda tickers, **kwargs: next(returns_iter).reindex(tickers)
+        cost_model = {"commission_rate": 0.001, "tax_rate": 0.002}
+
+        config = BacktestConfig(start_date="20240101", end_date="20240430", cost_model=cost_model)
+        grid_df = sens.run_sensitivity_analysis("KOSPI", config, [(10**11, 5 * 10**11)], [1])
+
+        held = [["A"], ["A"], ["C"]]
+        expected = bt.apply_weights_and_costs(
+            bt.build_weights_matrix(held),
+            pd.DataFrame([returns[tickers] for returns, tickers in zip(period_returns, held)]),
+            config.cost_model,
+        )
+        row = grid_df.iloc[0]
+        self.assertAlmostEqual(row["cumulative_return"], float((1 + expected["net_return"]).prod() - 1))
+        self.assertAlmostEqual(row["gross_cumulative_return"], float((1 + expected["gross_return"]).prod() - 1))
+        self.assertAlmostEqual(row["average_turnover"], float(expected["turnover"].mean()))
+        with tempfile.TemporaryDirectory() as tmpdir:
+            report_text = sens.write_sensitivity_report(tmpdir, {"KOSPI": grid_df}).read_text(encoding="utf-8")
+        self.assertIn("## Cost Model", report_text)
+
+    @patch("krx_sensitivity._ticker_period_returns")
+    @patch("krx_sensitivity.get_snapshot_index")
+    @patch("krx_sensitivity.generate_rebalance_dates", return_value=["20240131", "20240229"])
+    @patch("krx_sensitivity.get_trading_calendar", return_value=[])
+    def test_cross_sectional_expression_is_rescored_per_band(self, _mock_calendar, _mock_dates, mock_index, mock_returns):
+        rng = np.random.default_rng(0)
+        idx = pd.Index([f"{i:06d}" for i in range(40)], name="티커")
+        market_cap_df = pd.DataFrame({"시가총액": rng.uniform(1, 10, 40) * 10**11}, index=idx)
+        fundamental_df = pd.DataFrame(
+            {"PER": rng.uniform(2, 30, 40), "PBR": rng.uniform(0.3, 3, 40), "DIV": np.zeros(40)}, index=idx
+        )
+        snapshot_index = svc.SnapshotIndex.build(market_cap_df, fundamental_df)
+        mock_index.side_effect = lambda market, date: (snapshot_index, date, [])
+        ticker_returns = pd.Series(rng.normal(0, 0.1, 40), index=idx)
+        mock_returns.side_effect = lambda tickers, **kwargs: ticker_returns.reindex(tickers)
+        expression = "-rank(PER) - zscore(PBR)"
+        bands = [(10**11, 4 * 10**11), (4 * 10**11, 10**12)]
+
+        config = BacktestConfig(start_date="20240101", end_date="20240229", score_expression=expression)
+        grid_df = sens.run_sensitivity_analysis("KOSPI", config, bands, [4])
+
+        factor = svc.compile_factor_expression(expression)
+        for cap_min, cap_max in bands:
+            band_df = factor.apply(snapshot_index.query(cap_min, cap_max))
+            top = band_df.sort_values("TAT", ascending=False, kind="mergesort").head(4).index
+            row = grid_df[grid_df["cap_min"] == cap_min].iloc[0]
+            self.assertAlmostEqual(row["cumulative_return"], ticker_returns[top].mean())
+
+
+if __name__ == "__main__":
+    unittest.main()
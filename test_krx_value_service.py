@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import json
+import tempfile
+import threading
 import unittest
+from concurrent.futures import wait
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 
+import krx_cache
+import krx_fetch
 import krx_value_service as svc
 
 
@@ -13,6 +21,9 @@ class NormalizeMarketTests(unittest.TestCase):
     def test_normalize_market_accepts_lowercase_and_spaces(self):
         self.assertEqual(svc.normalize_market(" kospi "), "KOSPI")
 
+    def test_normalize_market_accepts_all(self):
+        self.assertEqual(svc.normalize_market("all"), "ALL")
+
     def test_normalize_market_rejects_invalid_market(self):
         with self.assertRaisesRegex(ValueError, "market must be one of"):
             svc.normalize_market("NASDAQ")
@@ -44,9 +55,40 @@ class TatsuroScoreTests(unittest.TestCase):
         self.assertEqual(score, 0.0)
 
 
+class MarketDataFallbackTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+
+    def tearDown(self):
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        self._tmpdir.cleanup()
+
+    @patch("krx_value_service.krx_fetch.get_market_fundamental_by_ticker")
+    @patch("krx_value_service.krx_fetch.get_market_cap_by_ticker")
+    def test_known_holidays_are_skipped_on_repeat_calls(self, mock_cap, mock_fundamental):
+        def cap_for(date, market):
+            if date == "20200103":
+                return pd.DataFrame({"시가총액": [1]}, index=["A"])
+            return pd.DataFrame()
+
+        mock_cap.side_effect = cap_for
+        mock_fundamental.return_value = pd.DataFrame({"PER": [1.0], "PBR": [1.0], "DIV": [1.0]}, index=["A"])
+
+        first_logs: list[str] = []
+        svc.get_market_data_with_fallback("KOSPI", datetime(2020, 1, 5), backtrack_logs=first_logs)
+        second_logs: list[str] = []
+        _, _, used_date = svc.get_market_data_with_fallback("KOSPI", datetime(2020, 1, 5), backtrack_logs=second_logs)
+
+        self.assertEqual(used_date, "20200103")
+        self.assertEqual(mock_cap.call_count, 4)
+        self.assertIn("캐시", second_logs[0])
+
+
 class FilterConditionTests(unittest.TestCase):
     def setUp(self):
-        svc._QUERY_CACHE.clear()
+        svc.clear_query_caches()
         svc._TICKER_NAME_CACHE.clear()
 
     @patch("krx_value_service.add_ticker_names")
@@ -143,5 +185,380 @@ class FilterConditionTests(unittest.TestCase):
         self.assertEqual(mock_get_market_data.call_count, 1)
 
 
+class ScreeningResultTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+
+    def _market_data(self):
+        idx = [f"{i:06d}" for i in range(30)]
+        market_cap_df = pd.DataFrame({"시가총액": [600_000_000_000 + i * 1_000_000_000 for i in range(30)]}, index=idx)
+        fundamental_df = pd.DataFrame(
+            {"PER": [5.0 + i for i in range(30)], "PBR": [1.0] * 30, "DIV": [2.0] * 30},
+            index=idx,
+        )
+        return market_cap_df, fundamental_df, "20260219"
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_ticker_names_are_fetched_for_top_n_rows_only(self, mock_get_market_data, mock_add_ticker_names):
+        mock_get_market_data.return_value = self._market_data()
+        mock_add_ticker_names.side_effect = lambda df: df.assign(종목명=[f"name-{ticker}" for ticker in df.index])
+
+        result = svc.get_screening_result(date="2026-02-19", top_n=5)
+
+        self.assertEqual(len(mock_add_ticker_names.call_args.args[0]), 5)
+        self.assertEqual(result.tickers, ["000000", "000001", "000002", "000003", "000004"])
+        self.assertEqual(result.frame.columns[0], "종목명")
+        self.assertEqual(result.stats["filtered"], 30)
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_cache_hit_cannot_be_mutated_through_frame_or_scores(self, mock_get_market_data, mock_add_ticker_names):
+        mock_get_market_data.return_value = self._market_data()
+        mock_add_ticker_names.side_effect = lambda df: df.assign(종목명="name")
+
+        first = svc.get_screening_result(date="2026-02-19")
+        leaked = first.frame
+        leaked["TAT"] = -1.0
+        second = svc.get_screening_result(date="2026-02-19")
+
+        self.assertEqual(mock_get_market_data.call_count, 1)
+        self.assertGreater(second.scores[0], 0.0)
+        self.assertEqual(second.tickers, first.tickers)
+        self.assertEqual(second.stats["cache_hit"], 1)
+        self.assertEqual(first.stats["cache_hit"], 0)
+        with self.assertRaises(ValueError):
+            second.scores[0] = 0.0
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_to_frame_formats_a_copy_for_display(self, mock_get_market_data, mock_add_ticker_names):
+        mock_get_market_data.return_value = self._market_data()
+        mock_add_ticker_names.side_effect = lambda df: df.assign(종목명="name")
+
+        result = svc.get_screening_result(date="2026-02-19", top_n=3)
+        display_df = result.to_frame()
+        legacy_df, _, _, _ = svc.get_tatsuro_small_mid_value_top10(date="2026-02-19", top_n=3)
+
+        self.assertIn("시가총액", result.frame.columns)
+        self.assertNotIn("시가총액", display_df.columns)
+        self.assertEqual(display_df.iloc[0]["시가총액(조)"], 0.6)
+        pd.testing.assert_frame_equal(display_df, legacy_df)
+        display_df.iloc[0, display_df.columns.get_loc("TAT")] = -1.0
+        self.assertNotEqual(result.frame.iloc[0]["TAT"], -1.0)
+
+
+class DeadlineTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+        svc.clear_query_caches()
+        self.release = threading.Event()
+        self.market_cap_df = pd.DataFrame({"시가총액": [600_000_000_000, 700_000_000_000]}, index=["A", "B"])
+        self.fundamental_df = pd.DataFrame({"PER": [10.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 2.0]}, index=["A", "B"])
+
+    def tearDown(self):
+        self.release.set()
+        wait([*svc._PENDING_REFRESHES.values(), *svc._PENDING_NAME_FILLS.values()], timeout=5)
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        svc.clear_query_caches()
+        self._tmpdir.cleanup()
+
+    def _slow_for(self, slow_date: str):
+        def load(market, base_date, max_backtrack_days=14, backtrack_logs=None):
+            date = base_date.strftime("%Y%m%d")
+            if date == slow_date:
+                self.release.wait(5)
+            return self.market_cap_df, self.fundamental_df, date
+
+        return load
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명="name"))
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_deadline_serves_stale_snapshot_and_refreshes_in_background(self, mock_get_market_data, _mock_names):
+        mock_get_market_data.side_effect = self._slow_for("20260219")
+        svc.get_screening_result(date="2026-02-18")
+
+        stale = svc.get_screening_result(date="2026-02-19", deadline_sec=0.05)
+
+        self.assertEqual(stale.used_date, "20260218")
+        self.assertEqual(stale.stats["stale"], 1)
+        self.assertIn("지연", stale.logs[-1])
+        self.release.set()
+        svc.refresh_snapshot_index("KOSPI", "20260219").result(timeout=5)
+        fresh = svc.get_screening_result(date="2026-02-19", deadline_sec=0.05)
+        self.assertEqual(fresh.used_date, "20260219")
+        self.assertNotIn("stale", fresh.stats)
+        self.assertEqual(mock_get_market_data.call_count, 2)
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명="name"))
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_deadline_falls_back_to_disk_cached_snapshot(self, mock_get_market_data, _mock_names):
+        mock_get_market_data.side_effect = self._slow_for("20260219")
+        disk_cache = krx_cache.get_disk_cache()
+        disk_cache.put_frame("market_cap", "KOSPI", "20260217", frame=self.market_cap_df)
+        disk_cache.put_frame("market_fundamental", "KOSPI", "20260217", frame=self.fundamental_df)
+        disk_cache.put_frame("market_cap", "KOSDAQ", "20260218", frame=self.market_cap_df)
+
+        result = svc.get_screening_result(date="2026-02-19", deadline_sec=0.05)
+
+        self.assertEqual(result.used_date, "20260217")
+        self.assertEqual(result.tickers, ["B", "A"])
+        self.assertEqual(result.stats["stale"], 1)
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_slow_name_lookup_serves_ticker_codes_within_deadline(self, mock_get_market_data, mock_names):
+        mock_get_market_data.side_effect = self._slow_for("")
+
+        def slow_names(df):
+            self.release.wait(5)
+            return df.assign(종목명="name")
+
+        mock_names.side_effect = slow_names
+
+        result = svc.get_screening_result(date="2026-02-19", deadline_sec=0.05)
+
+        self.assertEqual(result.frame["종목명"].tolist(), ["B", "A"])
+        self.assertEqual(result.stats["names_pending"], 1)
+        self.assertIn("종목명 조회 지연", result.logs[-1])
+        self.release.set()
+        wait(list(svc._PENDING_NAME_FILLS.values()), timeout=5)
+        fresh = svc.get_screening_result(date="2026-02-19", deadline_sec=1.0)
+        self.assertEqual(fresh.frame["종목명"].tolist(), ["name", "name"])
+        self.assertNotIn("names_pending", fresh.stats)
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_failed_refresh_serves_stale_snapshot_with_cached_names(self, mock_get_market_data, mock_names):
+        def load(market, base_date, max_backtrack_days=14, backtrack_logs=None):
+            date = base_date.strftime("%Y%m%d")
+            if date == "20260219":
+                raise RuntimeError("KRX 500")
+            return self.market_cap_df, self.fundamental_df, date
+
+        mock_get_market_data.side_effect = load
+        mock_names.side_effect = lambda df: df.assign(종목명="name")
+        svc.get_screening_result(date="2026-02-18")
+        svc.service_caches()["ticker_name_cache"]["B"] = "비상장"
+        self.addCleanup(svc.service_caches()["ticker_name_cache"].pop, "B", None)
+        mock_names.reset_mock()
+
+        result = svc.get_screening_result(date="2026-02-19", deadline_sec=1.0)
+
+        self.assertEqual(result.used_date, "20260218")
+        self.assertEqual(result.stats["stale"], 1)
+        self.assertIn("RuntimeError", result.logs[-1])
+        mock_names.assert_not_called()
+        self.assertEqual(list(result.frame["종목명"]), ["비상장", "A"])
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_failed_refresh_without_cached_snapshot_raises_original_error(self, mock_get_market_data):
+        mock_get_market_data.side_effect = RuntimeError("KRX 500")
+
+        with self.assertRaisesRegex(RuntimeError, "KRX 500"):
+            svc.get_screening_result(date="2026-02-19", deadline_sec=1.0)
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_deadline_without_cached_snapshot_raises_timeout(self, mock_get_market_data):
+        mock_get_market_data.side_effect = self._slow_for("20260219")
+
+        with self.assertRaises(TimeoutError):
+            svc.get_screening_result(date="2026-02-19", deadline_sec=0.05)
+
+
+class OfflineScreeningTests(unittest.TestCase):
+    def setUp(self):
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self._previous_cache_dir = krx_cache.get_cache_dir()
+        krx_cache.configure_cache_dir(self._tmpdir.name)
+        svc.clear_query_caches()
+        krx_fetch.configure_fetch(offline=True)
+
+    def tearDown(self):
+        krx_fetch.configure_fetch(offline=False)
+        krx_cache.configure_cache_dir(self._previous_cache_dir)
+        svc.clear_query_caches()
+        self._tmpdir.cleanup()
+
+    def test_missing_ticker_name_in_bundle_falls_back_to_ticker_code(self):
+        disk_cache = krx_cache.get_disk_cache()
+        disk_cache.put_frame(
+            "market_cap", "KOSPI", "20240105", frame=pd.DataFrame({"시가총액": [6 * 10**11, 7 * 10**11]}, index=["A", "B"])
+        )
+        disk_cache.put_frame(
+            "market_fundamental",
+            "KOSPI",
+            "20240105",
+            frame=pd.DataFrame({"PER": [10.0, 5.0], "PBR": [1.0, 1.0], "DIV": [2.0, 2.0]}, index=["A", "B"]),
+        )
+        disk_cache.put_value("ticker_name", "A", value="에이")
+        self.addCleanup(svc.service_caches()["ticker_name_cache"].pop, "A", None)
+
+        result = svc.get_screening_result("KOSPI", "20240105")
+
+        self.assertEqual(dict(zip(result.tickers, result.frame["종목명"])), {"A": "에이", "B": "B"})
+
+
+class SnapshotIndexTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+
+    def _market_data(self):
+        rng = np.random.default_rng(0)
+        idx = pd.Index([f"{i:06d}" for i in range(300)], name="티커")
+        market_cap_df = pd.DataFrame({"시가총액": rng.integers(1, 50, size=300) * 10_000_000_000}, index=idx)
+        fundamental_df = pd.DataFrame(
+            {
+                "PER": rng.normal(10, 8, size=300),
+                "PBR": rng.normal(1, 0.8, size=300),
+                "DIV": np.where(rng.random(300) < 0.2, np.nan, rng.random(300) * 5),
+            },
+            index=idx,
+        )
+        return market_cap_df, fundamental_df, "20260219"
+
+    def test_cap_band_slices_match_boolean_masks(self):
+        market_cap_df, fundamental_df, _ = self._market_data()
+        index = svc.SnapshotIndex.build(market_cap_df, fundamental_df)
+        joined = market_cap_df.join(fundamental_df, how="inner")
+
+        for cap_min, cap_max, per_max in [(0, 10**13, None), (100_000_000_000, 200_000_000_000, 12.0), (3 * 10**11, 10**11, None)]:
+            expected = joined[
+                (joined["PER"] > 0)
+                & (joined["PBR"] > 0)
+                & (joined["시가총액"] >= cap_min)
+                & (joined["시가총액"] <= cap_max)
+            ]
+            if per_max is not None:
+                expected = expected[expected["PER"] <= per_max]
+            pd.testing.assert_frame_equal(index.query(cap_min, cap_max, per_max=per_max), expected)
+
+        self.assertEqual(index.total, 300)
+
+    @patch("krx_value_service.add_ticker_names", side_effect=lambda df: df.assign(종목명="x"))
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_different_cap_bands_reuse_one_snapshot_load(self, mock_get_market_data, _mock_names):
+        mock_get_market_data.return_value = self._market_data()
+
+        for cap_min in (0, 100_000_000_000, 200_000_000_000):
+            svc.get_tatsuro_small_mid_value_top10(market="KOSPI", date="2026-02-19", cap_min=cap_min, cap_max=10**13)
+
+        self.assertEqual(mock_get_market_data.call_count, 1)
+
+
+class FullRankingTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+
+    def _market_data(self):
+        idx = ["A", "B", "C", "D"]
+        market_cap_df = pd.DataFrame(
+            {"시가총액": [600_000_000_000, 700_000_000_000, 800_000_000_000, 2_000_000_000_000]},
+            index=idx,
+        )
+        fundamental_df = pd.DataFrame(
+            {
+                "PER": [10.0, 5.0, 20.0, 4.0],
+                "PBR": [1.0, 1.0, 2.0, 0.5],
+                "DIV": [2.0, float("nan"), 1.0, 3.0],
+            },
+            index=idx,
+        )
+        return market_cap_df, fundamental_df, "20260219"
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_full_ranking_returns_every_filtered_ticker_with_rank(self, mock_get_market_data):
+        mock_get_market_data.return_value = self._market_data()
+
+        ranking_df, used_date, stats, _ = svc.get_tatsuro_full_ranking(market="KOSPI", date="2026-02-19")
+
+        self.assertEqual(used_date, "20260219")
+        self.assertEqual(list(ranking_df.index), ["B", "A", "C"])
+        self.assertEqual(list(ranking_df["순위"]), [1, 2, 3])
+        self.assertAlmostEqual(ranking_df.loc["B", "백분위"], 100.0)
+        self.assertAlmostEqual(ranking_df.loc["B", "DIV 기여"], 0.0)
+        self.assertEqual(stats["total"], 4)
+        self.assertEqual(stats["final"], 3)
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_full_ranking_uses_custom_score_expression_terms(self, mock_get_market_data):
+        mock_get_market_data.return_value = self._market_data()
+
+        ranking_df, _, _, _ = svc.get_tatsuro_full_ranking(
+            market="KOSPI", date="2026-02-19", score_expression="2 * inv(PBR) - rank(PER)"
+        )
+
+        self.assertIn("PBR 기여", ranking_df.columns)
+        self.assertIn("PER 기여", ranking_df.columns)
+        self.assertNotIn("DIV 기여", ranking_df.columns)
+        row = ranking_df.iloc[0]
+        self.assertAlmostEqual(row["TAT"], row["PBR 기여"] + row["PER 기여"])
+        self.assertLessEqual(ranking_df["PER 기여"].max(), 0.0)
+
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_write_ranking_stream_writes_csv_and_ndjson_in_chunks(self, mock_get_market_data):
+        mock_get_market_data.return_value = self._market_data()
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = Path(tmpdir) / "ranking.csv"
+            written = svc.write_ranking_stream(str(csv_path), date="2026-02-19", chunk_size=2)
+            csv_df = pd.read_csv(csv_path, encoding="utf-8-sig", dtype={"티커": str})
+
+            ndjson_path = Path(tmpdir) / "ranking.ndjson"
+            svc.write_ranking_stream(str(ndjson_path), markets=("KOSDAQ",), fmt="ndjson", chunk_size=1)
+            records = [json.loads(line) for line in ndjson_path.read_text(encoding="utf-8").splitlines()]
+
+        self.assertEqual(written, {"KOSPI": 3, "KOSDAQ": 3})
+        self.assertEqual(len(csv_df), 6)
+        self.assertEqual(list(csv_df["시장"].unique()), ["KOSPI", "KOSDAQ"])
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0]["티커"], "B")
+        self.assertEqual(records[0]["순위"], 1)
+
+    def test_write_ranking_stream_rejects_unknown_format(self):
+        with self.assertRaisesRegex(ValueError, "fmt must be one of"):
+            svc.write_ranking_stream("unused.parquet", fmt="parquet")
+
+
+class CombinedMarketTests(unittest.TestCase):
+    def setUp(self):
+        svc.clear_query_caches()
+        svc._TICKER_NAME_CACHE.clear()
+
+    @patch("krx_value_service.add_ticker_names")
+    @patch("krx_value_service.get_market_data_with_fallback")
+    def test_all_market_aligns_dates_and_ranks_in_one_pass(self, mock_get_market_data, mock_add_ticker_names):
+        frames = {
+            "KOSPI": (
+                pd.DataFrame({"시가총액": [600_000_000_000, 700_000_000_000]}, index=["K1", "K2"]),
+                pd.DataFrame({"PER": [10.0, 4.0], "PBR": [1.0, 1.0], "DIV": [1.0, 1.0]}, index=["K1", "K2"]),
+            ),
+            "KOSDAQ": (
+                pd.DataFrame({"시가총액": [650_000_000_000]}, index=["Q1"]),
+                pd.DataFrame({"PER": [5.0], "PBR": [1.0], "DIV": [2.0]}, index=["Q1"]),
+            ),
+        }
+
+        def fake_fetch(market, base_date, max_backtrack_days=14, backtrack_logs=None):
+            used_date = "20260220" if market == "KOSDAQ" and base_date.day == 20 else "20260219"
+            backtrack_logs.append(f"{used_date}: 사용")
+            cap_df, fund_df = frames[market]
+            return cap_df, fund_df, used_date
+
+        mock_get_market_data.side_effect = fake_fetch
+        mock_add_ticker_names.side_effect = lambda df: df.assign(종목명=[f"name-{t}" for t in df.index])
+
+        result_df, used_date, stats, logs = svc.get_tatsuro_small_mid_value_top10(market="ALL", date="2026-02-20")
+
+        self.assertEqual(used_date, "20260219")
+        self.assertEqual(mock_get_market_data.call_count, 3)
+        self.assertEqual(stats["total"], 3)
+        self.assertEqual(list(result_df.index), ["K2", "Q1", "K1"])
+        self.assertEqual(list(result_df["시장"]), ["KOSPI", "KOSDAQ", "KOSPI"])
+        self.assertIn("공통 기준일", logs[-1])
+
+
 if __name__ == "__main__":
     unittest.main()